@@ -81,7 +81,8 @@ def _init_static_cache_busting(app):
 def _init_request_logging(app):
     @app.before_request
     def start_request_timer():
-        g.request_started_at = time.perf_counter()
+        # 비동기 서버는 upstream 조회를 Flask보다 먼저 시작하므로 그 시각을 environ으로 넘긴다.
+        g.request_started_at = request.environ.get("mirror.request_started_at") or time.perf_counter()
 
     @app.after_request
     def log_request(response):
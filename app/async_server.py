@@ -0,0 +1,186 @@
+"""Flask 앱을 aiohttp 이벤트 루프 위에서 서빙하는 비동기 진입점.
+
+/board, /board/times, /read, /read/related는 요청 해석만 하고 upstream 조회는 루프에서 직접
+기다린 뒤, 템플릿 렌더링과 본문 정리만 스레드에서 Flask 화면으로 마친다. 조회하는 동안 스레드를
+붙잡지 않으므로 워커당 MIRROR_THREADS개로 묶이지 않는다. 나머지 경로(미디어 프록시, 임베드,
+정적 파일 등)는 Flask WSGI 앱을 스레드에서 그대로 부른다.
+
+    gunicorn -c gunicorn.conf.py -k aiohttp.GunicornWebWorker async_app:app
+"""
+import asyncio
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote_to_bytes
+
+from aiohttp import web
+from werkzeug.exceptions import HTTPException
+
+from app.services import async_bridge
+from app.services.admission import AdmissionRejected, async_admission, run_cache_only
+from app.services.cache_utils import env_int
+
+from .routes import ASYNC_RESULT_ENVIRON_KEY, ASYNC_VIEWS, overloaded_error
+
+# 렌더링과 WSGI 경로를 돌리는 스레드 수. upstream을 기다리는 동안에는 쓰지 않는다.
+ASYNC_SERVER_THREADS = max(env_int("MIRROR_ASYNC_SERVER_THREADS", 8), 1)
+# 응답 본문을 한 번에 이만큼까지 스레드에서 모아 보낸다. 넘으면 나눠서 흘려보낸다.
+BODY_BATCH_BYTES = 64 * 1024
+HOP_BY_HOP_HEADERS = frozenset({"connection", "keep-alive", "transfer-encoding", "upgrade"})
+
+FLASK_APP_KEY = web.AppKey("flask_app", object)
+EXECUTOR_KEY = web.AppKey("executor", ThreadPoolExecutor)
+
+
+def _wsgi_environ(request, body):
+    environ = {
+        "REQUEST_METHOD": request.method,
+        "SCRIPT_NAME": "",
+        "PATH_INFO": unquote_to_bytes(request.rel_url.raw_path).decode("latin-1"),
+        "QUERY_STRING": request.rel_url.raw_query_string,
+        "SERVER_NAME": request.url.host or "localhost",
+        "SERVER_PORT": str(request.url.port or (443 if request.secure else 80)),
+        "SERVER_PROTOCOL": "HTTP/%d.%d" % request.version,
+        "REMOTE_ADDR": request.remote or "",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": request.scheme,
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in request.headers.items():
+        key = name.upper().replace("-", "_")
+        if key == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif key == "CONTENT_LENGTH":
+            environ["CONTENT_LENGTH"] = value
+        else:
+            key = "HTTP_" + key
+            environ[key] = "%s,%s" % (environ[key], value) if key in environ else value
+    return environ
+
+
+def _match_endpoint(flask_app, environ):
+    try:
+        endpoint, _args = flask_app.url_map.bind_to_environ(environ).match()
+    except HTTPException:
+        return None
+    return endpoint
+
+
+def _prepare_view(flask_app, environ, prepare):
+    """화면의 요청 해석 단계만 돌린다. 잘못된 요청(abort 등)이면 None을 돌려 오류 응답을 WSGI 경로에 맡긴다."""
+    with flask_app.request_context(dict(environ)):
+        try:
+            return prepare()
+        except Exception:
+            return None
+
+
+def _next_batch(iterator):
+    chunks = []
+    size = 0
+    for chunk in iterator:
+        if chunk:
+            chunks.append(chunk)
+            size += len(chunk)
+        if size >= BODY_BATCH_BYTES:
+            return b"".join(chunks), False
+    return b"".join(chunks), True
+
+
+def _start_wsgi(flask_app, environ):
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = status
+        started["headers"] = headers
+        return lambda data: None
+
+    body = flask_app(environ, start_response)
+    iterator = iter(body)
+    # start_response는 첫 본문 조각을 꺼낼 때까지 미뤄질 수 있다.
+    first, done = _next_batch(iterator)
+    return started, body, iterator, first, done
+
+
+def _close_body(body):
+    close = getattr(body, "close", None)
+    if callable(close):
+        close()
+
+
+async def _call_wsgi(request, flask_app, executor, environ):
+    loop = asyncio.get_running_loop()
+    started, body, iterator, chunk, done = await loop.run_in_executor(executor, _start_wsgi, flask_app, environ)
+    try:
+        status, _, reason = started["status"].partition(" ")
+        response = web.StreamResponse(status=int(status), reason=reason or None)
+        for name, value in started["headers"]:
+            if name.lower() not in HOP_BY_HOP_HEADERS:
+                response.headers.add(name, value)
+        if done and "Content-Length" not in response.headers and request.method != "HEAD":
+            response.content_length = len(chunk)
+        await response.prepare(request)
+        while True:
+            if chunk:
+                await response.write(chunk)
+            if done:
+                break
+            chunk, done = await loop.run_in_executor(executor, _next_batch, iterator)
+        await response.write_eof()
+        return response
+    finally:
+        await loop.run_in_executor(executor, _close_body, body)
+
+
+async def handle(request):
+    flask_app = request.app[FLASK_APP_KEY]
+    executor = request.app[EXECUTOR_KEY]
+    started_at = time.perf_counter()
+    environ = _wsgi_environ(request, await request.read())
+    environ["mirror.request_started_at"] = started_at
+
+    view = ASYNC_VIEWS.get(_match_endpoint(flask_app, environ))
+    if view is not None:
+        route_class, prepare, fetch, _respond = view
+        # 요청 해석은 가벼우므로 루프에서 바로 돌린다.
+        state = _prepare_view(flask_app, environ, prepare)
+        if state is not None:
+            async with async_admission.admit_async(route_class) as admitted:
+                try:
+                    coro = fetch(state) if admitted else run_cache_only(fetch(state))
+                    result, error = await async_bridge.run_on_loop(coro), None
+                except AdmissionRejected:
+                    result, error = None, overloaded_error()
+                except Exception as exc:
+                    result, error = None, exc
+            environ = dict(environ, **{ASYNC_RESULT_ENVIRON_KEY: (state, result, error)})
+            environ["wsgi.input"] = io.BytesIO(b"")
+    return await _call_wsgi(request, flask_app, executor, environ)
+
+
+async def _on_startup(app):
+    async_bridge.adopt_loop(asyncio.get_running_loop())
+
+
+async def _on_cleanup(app):
+    await async_bridge.release_loop()
+    app[EXECUTOR_KEY].shutdown(wait=False)
+
+
+def create_async_app(flask_app=None):
+    if flask_app is None:
+        from . import create_app
+
+        flask_app = create_app()
+    app = web.Application()
+    app[FLASK_APP_KEY] = flask_app
+    app[EXECUTOR_KEY] = ThreadPoolExecutor(max_workers=ASYNC_SERVER_THREADS, thread_name_prefix="mirror-async-render")
+    app.router.add_route("*", "/{tail:.*}", handle)
+    app.on_startup.append(_on_startup)
+    app.on_cleanup.append(_on_cleanup)
+    return app
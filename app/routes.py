@@ -6,18 +6,31 @@ import time
 from datetime import datetime, timedelta, timezone
 from urllib.parse import urljoin, urlparse
 from flask import Blueprint, abort, current_app, jsonify, make_response, redirect, render_template, request, url_for
-
-from .services.async_bridge import run_async
+from werkzeug.exceptions import ServiceUnavailable
+
+from .services.admission import (
+    ADMISSION_RETRY_AFTER,
+    AdmissionRejected,
+    admission_stats,
+    route_admission,
+    run_cache_only,
+)
+from .services.async_bridge import loop_stats, run_async
+from .services.cache_utils import cache_stats
 from .services.core import (
     async_board_precise_times,
     async_index_with_head_categories,
+    async_prefetch_board_page,
     async_read,
     async_related_after_position,
     format_display_time,
 )
 from .services.heung import get_heung_galleries, search_galleries
 from .services.html_sanitizer import prepare_read_html
+from .services.media_cache import media_cache_stats
 from .services.media_proxy import build_media_response, build_movie_response, normalize_media_url_shape
+from .services.dc.limiter import limiter_stats
+from .services.prefetch import prefetch_stats, record_prefetch_use, schedule_prefetch
 from .services import link_preview, youtube_meta
 from .services.recent import (
     RECENT_MAX_ITEMS,
@@ -29,6 +42,8 @@ from .services.recent import (
 )
 
 bp = Blueprint("main", __name__)
+# 비동기 서버가 미리 끝낸 upstream 조회 결과를 Flask 화면에 넘기는 environ 키
+ASYNC_RESULT_ENVIRON_KEY = "mirror.async_result"
 
 BOARD_ID_RE = re.compile(r"^[A-Za-z0-9_]{1,80}$")
 ALLOWED_GALLERY_KINDS = {"normal", "minor", "mini", "person"}
@@ -279,8 +294,11 @@ def _serialize_related_posts(posts):
 def _format_read_payload_times(data, comments):
     if data is not None:
         data["time"] = format_display_time(data.get("time"))
-    for comment in comments or []:
-        comment["time"] = format_display_time(comment.get("time"))
+    # 댓글 행은 캐시와 공유하는 읽기 전용 행이라 바뀌는 것만 새 dict로 바꾼다.
+    for index, comment in enumerate(comments or []):
+        display_time = format_display_time(comment.get("time"))
+        if display_time != comment.get("time"):
+            comments[index] = {**comment, "time": display_time}
 
 
 def _format_cache_time(ts):
@@ -473,6 +491,81 @@ async def _load_board_payload(
     return await async_index_with_head_categories(page, board, recommend, **kwargs)
 
 
+def _prefetch_key(label, page, board, recommend, kind=None, search_type=None, search_keyword=None, head_id=None):
+    search_type = (search_type or "") if search_keyword else ""
+    return (label, board, kind or "", _safe_int(recommend, 0), search_type, search_keyword or "", head_id or "", page)
+
+
+def _board_prefetch_key(page, board, recommend, kind=None, search_type=None, search_keyword=None, head_id=None):
+    return _prefetch_key("board", page, board, recommend, kind, search_type, search_keyword, head_id)
+
+
+def _related_prefetch_key(page, board, recommend, kind=None, search_type=None, search_keyword=None, head_id=None):
+    return _prefetch_key("related", page, board, recommend, kind, search_type, search_keyword, head_id)
+
+
+def _schedule_board_prefetch(page, board, recommend, kind=None, search_type=None, search_keyword=None, head_id=None):
+    schedule_prefetch(
+        _board_prefetch_key(page, board, recommend, kind, search_type, search_keyword, head_id),
+        lambda: _load_board_payload(
+            page,
+            board,
+            recommend,
+            kind=kind,
+            search_type=search_type,
+            search_keyword=search_keyword,
+            head_id=head_id,
+        ),
+    )
+
+
+def _schedule_related_prefetch(page, board, recommend, kind=None, search_type=None, search_keyword=None, head_id=None):
+    schedule_prefetch(
+        _related_prefetch_key(page, board, recommend, kind, search_type, search_keyword, head_id),
+        lambda: async_prefetch_board_page(
+            page,
+            board,
+            recommend,
+            kind=kind,
+            search_type=search_type,
+            search_keyword=search_keyword,
+            head_id=head_id,
+        ),
+    )
+
+
+def overloaded_error():
+    return ServiceUnavailable("upstream busy", retry_after=ADMISSION_RETRY_AFTER)
+
+
+def _overloaded_json(payload):
+    response = jsonify(payload)
+    response.status_code = 503
+    response.headers["Retry-After"] = str(ADMISSION_RETRY_AFTER)
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def _split_view(route_class, prepare, fetch, respond):
+    """요청 해석 → upstream 조회 → 응답 만들기로 나눈 화면을 돌린다.
+
+    비동기 서버가 조회를 먼저 끝내 environ에 (state, 결과, 예외)를 넣어 두면 그것으로 응답만 만든다.
+    route_class 자리가 넘치면 캐시로만 답하고, 캐시에도 없으면 overloaded_error()를 respond에 넘긴다.
+    """
+    prefetched = request.environ.get(ASYNC_RESULT_ENVIRON_KEY)
+    if prefetched is not None:
+        return respond(*prefetched)
+    state = prepare()
+    with route_admission.admit(route_class) as admitted:
+        try:
+            result = run_async(fetch(state) if admitted else run_cache_only(fetch(state)))
+        except AdmissionRejected:
+            return respond(state, None, overloaded_error())
+        except Exception as exc:
+            return respond(state, None, exc)
+    return respond(state, result, None)
+
+
 def _nav_tab_for_gallery(board, recommend=0, nav_mode=None):
     if nav_mode == "ai":
         return "ai"
@@ -667,6 +760,20 @@ def healthz():
     return jsonify({"ok": True})
 
 
+@bp.route("/healthz/loop")
+def healthz_loop():
+    if not _is_loopback_addr(request.remote_addr):
+        abort(404)
+    return jsonify({
+        "loop": loop_stats(),
+        "caches": cache_stats(),
+        "prefetch": prefetch_stats(),
+        "limiter": limiter_stats(),
+        "admission": admission_stats(),
+        "media_cache": media_cache_stats(),
+    })
+
+
 def _is_loopback_addr(raw):
     try:
         addr = ipaddress.ip_address((raw or "").strip())
@@ -685,31 +792,61 @@ def favicon():
 # 야갤 baseball_new10
 # 싱벙갤 singlebungle1472
 # 그림갤 drawing
-@bp.route("/board")
-def board():
+def _board_request():
     page = _positive_int_arg("page", 1)
     board = _normalize_board_id(request.args.get("board", "airforce"))
     recommend = _normalize_recommend()
     kind = _normalize_gallery_kind(request.args.get("kind"))
     gallery_name = _clean_gallery_name(request.args.get("gallery_name"))
-    gallery_display_name = _gallery_display_name(board, gallery_name)
     nav_mode = _normalize_nav_mode(request.args.get("nav"))
     head_id = _normalize_head_id(request.args.get("headid"))
     search_type, search_keyword = _current_search_context()
     force_refresh = _safe_bool(request.args.get("refresh"))
-    pagination = {}
-    board_payload_kwargs = {
+    record_prefetch_use(_board_prefetch_key(page, board, recommend, kind, search_type, search_keyword, head_id))
+    return {
+        "page": page,
+        "board": board,
+        "recommend": recommend,
         "kind": kind,
+        "gallery_name": gallery_name,
+        "nav_mode": nav_mode,
+        "head_id": head_id,
         "search_type": search_type,
         "search_keyword": search_keyword,
-        "head_id": head_id,
-        "pagination_collector": pagination,
+        "force_refresh": force_refresh,
+        "pagination": {},
     }
-    if force_refresh:
+
+
+def _board_fetch(state):
+    board_payload_kwargs = {
+        "kind": state["kind"],
+        "search_type": state["search_type"],
+        "search_keyword": state["search_keyword"],
+        "head_id": state["head_id"],
+        "pagination_collector": state["pagination"],
+    }
+    if state["force_refresh"]:
         board_payload_kwargs["force_refresh"] = True
-    ret, head_categories = run_async(
-        _load_board_payload(page, board, recommend, **board_payload_kwargs)
-    )
+    return _load_board_payload(state["page"], state["board"], state["recommend"], **board_payload_kwargs)
+
+
+def _board_response(state, result, error):
+    if error is not None:
+        raise error
+    ret, head_categories = result
+    page = state["page"]
+    board = state["board"]
+    recommend = state["recommend"]
+    kind = state["kind"]
+    gallery_name = state["gallery_name"]
+    nav_mode = state["nav_mode"]
+    head_id = state["head_id"]
+    search_type = state["search_type"]
+    search_keyword = state["search_keyword"]
+    force_refresh = state["force_refresh"]
+    pagination = state["pagination"]
+    gallery_display_name = _gallery_display_name(board, gallery_name)
 
     current_page = _safe_int(pagination.get("current_page"), 0)
     if current_page > 0 and current_page < page and pagination.get("has_next") is False:
@@ -749,46 +886,66 @@ def board():
             board_has_next=pagination.get("has_next"),
         )
     )
+    if pagination.get("cache_age") is not None:
+        response.headers["X-Mirror-Cache-Age"] = str(_safe_int(pagination.get("cache_age"), 0))
+    if ret and pagination.get("has_next") is not False:
+        _schedule_board_prefetch(page + 1, board, recommend, kind, search_type, search_keyword, head_id)
     touch_recent_gallery(response, board, kind, recommend=recommend, name=gallery_name)
     return response
 
 
+@bp.route("/board")
+def board():
+    return _split_view("board", _board_request, _board_fetch, _board_response)
+
+
 @bp.route("/v2/board")
 @bp.route("/legacy/board")
 def board_compat_redirect():
     return _redirect_compat("main.board")
 
 
-@bp.route("/board/times")
-def board_times():
-    page = _positive_int_arg("page", 1)
-    board = _normalize_board_id(request.args.get("board", "airforce"))
-    recommend = _normalize_recommend()
-    kind = _normalize_gallery_kind(request.args.get("kind"))
-    head_id = _normalize_head_id(request.args.get("headid"))
-    search_type, search_keyword = _current_search_context()
-    target_ids = _target_post_ids_arg()
+def _board_times_request():
+    return {
+        "page": _positive_int_arg("page", 1),
+        "board": _normalize_board_id(request.args.get("board", "airforce")),
+        "recommend": _normalize_recommend(),
+        "kind": _normalize_gallery_kind(request.args.get("kind")),
+        "head_id": _normalize_head_id(request.args.get("headid")),
+        "search_context": _current_search_context(),
+        "target_ids": _target_post_ids_arg(),
+    }
 
-    try:
-        times = run_async(
-            async_board_precise_times(
-                page,
-                board,
-                recommend,
-                kind=kind,
-                search_type=search_type,
-                search_keyword=search_keyword,
-                head_id=head_id,
-                target_ids=target_ids,
-            )
-        )
-    except Exception:
-        current_app.logger.exception("Failed to fetch board precise times")
+
+def _board_times_fetch(state):
+    search_type, search_keyword = state["search_context"]
+    return async_board_precise_times(
+        state["page"],
+        state["board"],
+        state["recommend"],
+        kind=state["kind"],
+        search_type=search_type,
+        search_keyword=search_keyword,
+        head_id=state["head_id"],
+        target_ids=state["target_ids"],
+    )
+
+
+def _board_times_response(state, times, error):
+    if isinstance(error, ServiceUnavailable):
+        return _overloaded_json({"ok": False, "times": {}, "error": "overloaded"})
+    if error is not None:
+        current_app.logger.error("Failed to fetch board precise times", exc_info=error)
         return jsonify({"ok": False, "times": {}, "error": "board_time_fetch_failed"}), 502
 
     return jsonify({"ok": True, "times": {str(key): format_display_time(value) for key, value in (times or {}).items()}})
 
 
+@bp.route("/board/times")
+def board_times():
+    return _split_view("times", _board_times_request, _board_times_fetch, _board_times_response)
+
+
 @bp.route("/media")
 def media():
     src = (request.args.get("src") or "").strip()
@@ -818,13 +975,15 @@ def movie():
 @bp.route("/embed/youtube-size")
 def youtube_size():
     raw_ids = (request.args.get("ids") or "").split(",")
-    sizes = youtube_meta.sizes_for_ids(raw_ids)
+    with route_admission.admit("embeds") as admitted:
+        sizes = youtube_meta.sizes_for_ids(raw_ids)
     if not sizes:
         abort(400)
     response = jsonify(sizes)
     # 실패(null)가 섞인 응답이 브라우저에 하루 동안 남으면 짧은 unknown TTL이 무의미해진다.
     max_age = 86400 if all(sizes.values()) else 300
-    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    # 자리가 없어 캐시로만 답했으면 빠진 크기를 곧 다시 물어볼 수 있게 한다.
+    response.headers["Cache-Control"] = f"public, max-age={max_age}" if admitted or max_age == 86400 else "no-store"
     return response
 
 
@@ -833,7 +992,8 @@ def embed_link_preview():
     url = (request.args.get("url") or "").strip()
     if not link_preview.is_valid_preview_url(url):
         abort(400)
-    preview = link_preview.fetch_preview(url)
+    with route_admission.admit("embeds"):
+        preview = link_preview.fetch_preview(url)
     if preview is link_preview.RATE_LIMITED:
         response = jsonify({"ok": False})
         response.status_code = 503
@@ -849,35 +1009,56 @@ def embed_link_preview():
     return response
 
 
-@bp.route("/read")
-def read():
+def _read_request():
     pid = _safe_int(request.args.get("pid", 0), 0)
     if pid <= 0:
         abort(404)
-    board = _normalize_board_id(request.args.get("board", "airforce"))
-    kind = _normalize_gallery_kind(request.args.get("kind"))
-    gallery_name = _clean_gallery_name(request.args.get("gallery_name"))
-    gallery_display_name = _gallery_display_name(board, gallery_name)
-    recommend = _normalize_recommend()
-    source_page = max(_safe_int(request.args.get("source_page", 0), 0), 0)
-    head_id = _normalize_head_id(request.args.get("headid"))
-    search_type, search_keyword = _current_search_context()
-    data, comments, images = run_async(
-        async_read(
-            pid,
-            board,
-            kind=kind,
-            recommend=recommend,
-            head_id=head_id,
-            **_search_call_kwargs(search_type, search_keyword),
-        )
+    return {
+        "pid": pid,
+        "board": _normalize_board_id(request.args.get("board", "airforce")),
+        "kind": _normalize_gallery_kind(request.args.get("kind")),
+        "gallery_name": _clean_gallery_name(request.args.get("gallery_name")),
+        "recommend": _normalize_recommend(),
+        "source_page": max(_safe_int(request.args.get("source_page", 0), 0), 0),
+        "head_id": _normalize_head_id(request.args.get("headid")),
+        "search_context": _current_search_context(),
+    }
+
+
+def _read_fetch(state):
+    search_type, search_keyword = state["search_context"]
+    return async_read(
+        state["pid"],
+        state["board"],
+        kind=state["kind"],
+        recommend=state["recommend"],
+        head_id=state["head_id"],
+        **_search_call_kwargs(search_type, search_keyword),
     )
+
+
+def _read_response(state, payload, error):
+    if error is not None:
+        raise error
+    data, comments, images = payload
+    pid = state["pid"]
+    board = state["board"]
+    kind = state["kind"]
+    gallery_name = state["gallery_name"]
+    gallery_display_name = _gallery_display_name(board, gallery_name)
+    recommend = state["recommend"]
+    source_page = state["source_page"]
+    head_id = state["head_id"]
+    search_type, search_keyword = state["search_context"]
     _format_read_payload_times(data, comments)
     embedded_related_posts = _serialize_related_posts(data.pop("related_posts", []))
 
-    for comment in comments:
+    for index, comment in enumerate(comments):
         if comment.get("dccon"):
-            comment["dccon"] = url_for("main.media", src=comment["dccon"], board=board, pid=pid, kind=kind)
+            comments[index] = {
+                **comment,
+                "dccon": url_for("main.media", src=comment["dccon"], board=board, pid=pid, kind=kind),
+            }
 
     data["html"] = prepare_read_html(data.get("html"), images, board, pid, kind, search_keyword=search_keyword)
     response = make_response(
@@ -913,50 +1094,78 @@ def read():
             nav_tab=_nav_tab_for_gallery(board, recommend),
         )
     )
+    if source_page > 0:
+        # read_related_loader.js가 곧 /read/related를 부르므로 첫 탐색 페이지를 데워 둔다.
+        search_kwargs = _search_call_kwargs(search_type, search_keyword)
+        _schedule_related_prefetch(source_page, board, recommend, kind, head_id=head_id, **search_kwargs)
     touch_recent_gallery(response, board, kind, recommend=recommend, name=gallery_name)
     return response
 
 
+@bp.route("/read")
+def read():
+    return _split_view("read", _read_request, _read_fetch, _read_response)
+
+
 @bp.route("/v2/read")
 @bp.route("/legacy/read")
 def read_compat_redirect():
     return _redirect_compat("main.read")
 
 
-@bp.route("/read/related")
-def read_related():
+def _read_related_request():
     pid = _safe_int(request.args.get("pid", 0), 0)
     board = _normalize_board_id(request.args.get("board", "airforce"))
     kind = _normalize_gallery_kind(request.args.get("kind"))
     recommend = _normalize_recommend()
     limit = _safe_int(request.args.get("limit", 12), 12)
-    limit = max(1, min(limit, 30))
     source_page = max(_safe_int(request.args.get("source_page", 0), 0), 0)
     after_pid = max(_safe_int(request.args.get("after_pid", 0), 0), 0)
     head_id = _normalize_head_id(request.args.get("headid"))
     search_type, search_keyword = _current_search_context()
+    search_kwargs = _search_call_kwargs(search_type, search_keyword)
+    if pid > 0 and source_page > 0 and not after_pid:
+        record_prefetch_use(_related_prefetch_key(source_page, board, recommend, kind, head_id=head_id, **search_kwargs))
+    return {
+        "pid": pid,
+        "after_pid": after_pid,
+        "board": board,
+        "kind": kind,
+        "limit": max(1, min(limit, 30)),
+        "source_page": source_page,
+        "recommend": recommend,
+        "head_id": head_id,
+        "search_kwargs": search_kwargs,
+    }
 
-    posts = []
-    has_more = False
-    if pid > 0:
-        try:
-            posts, has_more = run_async(
-                async_related_after_position(
-                    pid,
-                    after_pid,
-                    board,
-                    kind=kind,
-                    limit=limit,
-                    source_page=source_page,
-                    recommend=recommend,
-                    head_id=head_id,
-                    **_search_call_kwargs(search_type, search_keyword),
-                )
-            )
-        except Exception:
-            current_app.logger.exception("Failed to fetch related posts")
-            return jsonify({"ok": False, "items": [], "error": "related_fetch_failed"}), 502
 
+async def _no_related_posts():
+    return [], False
+
+
+def _read_related_fetch(state):
+    if state["pid"] <= 0:
+        return _no_related_posts()
+    return async_related_after_position(
+        state["pid"],
+        state["after_pid"],
+        state["board"],
+        kind=state["kind"],
+        limit=state["limit"],
+        source_page=state["source_page"],
+        recommend=state["recommend"],
+        head_id=state["head_id"],
+        **state["search_kwargs"],
+    )
+
+
+def _read_related_response(state, result, error):
+    if isinstance(error, ServiceUnavailable):
+        return _overloaded_json({"ok": False, "items": [], "error": "overloaded"})
+    if error is not None:
+        current_app.logger.error("Failed to fetch related posts", exc_info=error)
+        return jsonify({"ok": False, "items": [], "error": "related_fetch_failed"}), 502
+    posts, has_more = result
     return jsonify(
         {
             "ok": True,
@@ -966,6 +1175,21 @@ def read_related():
     )
 
 
+@bp.route("/read/related")
+def read_related():
+    return _split_view("related", _read_related_request, _read_related_fetch, _read_related_response)
+
+
+# 비동기 서버(app/async_server.py)가 upstream 조회를 루프에서 직접 기다리도록 나눠 둔 화면:
+# endpoint -> (admission 경로 종류, 요청 해석, 조회 코루틴 만들기, 응답 만들기)
+ASYNC_VIEWS = {
+    "main.board": ("board", _board_request, _board_fetch, _board_response),
+    "main.board_times": ("times", _board_times_request, _board_times_fetch, _board_times_response),
+    "main.read": ("read", _read_request, _read_fetch, _read_response),
+    "main.read_related": ("related", _read_related_request, _read_related_fetch, _read_related_response),
+}
+
+
 def register_routes(app):
     app.add_template_global(board_url, "board_url")
     app.add_template_global(read_url, "read_url")
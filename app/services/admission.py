@@ -0,0 +1,217 @@
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from .cache_utils import env_int
+
+# upstream을 기다리는 경로 종류. 종류마다 동시 처리 수와 대기열을 따로 센다.
+ROUTE_CLASSES = ("read", "board", "related", "times", "embeds")
+
+# 기본값은 워커 스레드 수에서 정한다. 대기 중인 요청도 스레드를 붙잡으므로, 모든 종류를 합쳐
+# 스레드 하나는 /healthz·정적 파일 같은 가벼운 경로에 남겨 둔다.
+_THREADS = max(env_int("MIRROR_THREADS", 4), 1)
+# 경로 종류 하나가 동시에 upstream을 기다릴 수 있는 요청 수. 0이면 admission control을 끈다.
+ADMISSION_LIMIT = max(env_int("MIRROR_ADMISSION_LIMIT", max(_THREADS - 2, 1)), 0)
+# 자리가 날 때까지 기다릴 수 있는 요청 수(경로 종류별)와 최대 대기 시간(ms).
+ADMISSION_QUEUE = max(env_int("MIRROR_ADMISSION_QUEUE", 1), 0)
+ADMISSION_WAIT_MS = max(env_int("MIRROR_ADMISSION_WAIT_MS", 1000), 0)
+# 모든 종류를 합친 처리 중 + 대기 요청 상한. 0이면 종류별 한도만 본다.
+ADMISSION_TOTAL = max(env_int("MIRROR_ADMISSION_TOTAL", max(_THREADS - 1, 1)), 0)
+# 비동기 서버(async_app)는 기다리는 동안 스레드를 붙잡지 않으므로 따로, 더 크게 잡는다.
+ASYNC_ADMISSION_LIMIT = max(env_int("MIRROR_ASYNC_ADMISSION_LIMIT", 64), 0)
+ASYNC_ADMISSION_QUEUE = max(env_int("MIRROR_ASYNC_ADMISSION_QUEUE", 64), 0)
+# 받지 못한 요청에 돌려주는 Retry-After(초).
+ADMISSION_RETRY_AFTER = max(env_int("MIRROR_ADMISSION_RETRY_AFTER", 5), 1)
+WAIT_POLL_INTERVAL = 0.05
+
+_CACHE_ONLY = contextvars.ContextVar("mirror_admission_cache_only", default=False)
+
+
+class AdmissionRejected(RuntimeError):
+    """자리가 없어 캐시로만 답하려 했는데 캐시에도 없어 upstream을 부르지 않은 경우."""
+
+
+class AdmissionController:
+    """경로 종류별 동시 처리 수와 대기열 한도.
+
+    상태는 스레드 lock으로 보호한다. 동기 대기는 Condition으로, 비동기 대기는 asyncio.sleep으로
+    짧게 나눠 돌기 때문에 Flask 스레드와 이벤트 루프 어디에서 불러도 된다.
+    """
+
+    def __init__(self, limit=None, queue=None, total=None, wait_ms=None, classes=ROUTE_CLASSES):
+        self.limit = ADMISSION_LIMIT if limit is None else max(int(limit), 0)
+        self.queue = ADMISSION_QUEUE if queue is None else max(int(queue), 0)
+        self.total = ADMISSION_TOTAL if total is None else max(int(total), 0)
+        self.wait_ms = ADMISSION_WAIT_MS if wait_ms is None else max(int(wait_ms), 0)
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._used = 0
+        self._gates = {
+            name: {
+                "inflight": 0,
+                "waiting": 0,
+                "admitted": 0,
+                "queued": 0,
+                "shed": 0,
+                "timed_out": 0,
+            }
+            for name in classes
+        }
+
+    @property
+    def enabled(self):
+        return self.limit > 0
+
+    def _enter(self, gate):
+        """lock을 쥔 채 부른다. 바로 들어가면 "admitted", 줄을 서면 "waiting", 넘치면 "shed"."""
+        if self.total and self._used >= self.total:
+            gate["shed"] += 1
+            return "shed"
+        if gate["inflight"] < self.limit and not gate["waiting"]:
+            gate["inflight"] += 1
+            gate["admitted"] += 1
+            self._used += 1
+            return "admitted"
+        if gate["waiting"] >= self.queue or self.wait_ms <= 0:
+            gate["shed"] += 1
+            return "shed"
+        gate["waiting"] += 1
+        gate["queued"] += 1
+        self._used += 1
+        return "waiting"
+
+    def _take_turn(self, gate):
+        """lock을 쥔 채 부른다. 줄 선 요청이 자리를 얻으면 True."""
+        if gate["inflight"] >= self.limit:
+            return False
+        gate["waiting"] -= 1
+        gate["inflight"] += 1
+        gate["admitted"] += 1
+        return True
+
+    def _give_up(self, gate):
+        gate["waiting"] -= 1
+        gate["timed_out"] += 1
+        gate["shed"] += 1
+        self._used -= 1
+
+    def _leave(self, gate):
+        with self._lock:
+            gate["inflight"] -= 1
+            self._used -= 1
+            self._released.notify_all()
+
+    @contextmanager
+    def admit(self, route_class):
+        """자리를 얻으면 True, 넘쳤으면 False를 내준다. False면 블록 안에서는 캐시로만 답한다."""
+        if not self.enabled:
+            yield True
+            return
+        gate = self._gates[route_class]
+        with self._lock:
+            state = self._enter(gate)
+            if state == "waiting":
+                deadline = time.monotonic() + self.wait_ms / 1000
+                while not self._take_turn(gate):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._give_up(gate)
+                        state = "shed"
+                        break
+                    self._released.wait(remaining)
+        if state == "shed":
+            with cache_only():
+                yield False
+            return
+        try:
+            yield True
+        finally:
+            self._leave(gate)
+
+    @asynccontextmanager
+    async def admit_async(self, route_class):
+        """admit와 같지만 줄 서는 동안 이벤트 루프를 막지 않는다."""
+        if not self.enabled:
+            yield True
+            return
+        gate = self._gates[route_class]
+        with self._lock:
+            state = self._enter(gate)
+        if state == "waiting":
+            deadline = time.monotonic() + self.wait_ms / 1000
+            try:
+                while True:
+                    with self._lock:
+                        if self._take_turn(gate):
+                            break
+                        if time.monotonic() >= deadline:
+                            self._give_up(gate)
+                            state = "shed"
+                            break
+                    await asyncio.sleep(WAIT_POLL_INTERVAL)
+            except asyncio.CancelledError:
+                with self._lock:
+                    gate["waiting"] -= 1
+                    self._used -= 1
+                raise
+        if state == "shed":
+            with cache_only():
+                yield False
+            return
+        try:
+            yield True
+        finally:
+            self._leave(gate)
+
+    def snapshot(self):
+        with self._lock:
+            gates = {name: dict(gate) for name, gate in self._gates.items()}
+            used = self._used
+        return {
+            "limit": self.limit,
+            "queue": self.queue,
+            "total": self.total,
+            "wait_ms": self.wait_ms,
+            "used": used,
+            "classes": gates,
+        }
+
+
+@contextmanager
+def cache_only():
+    """이 블록 안에서는 upstream을 부르지 않고 캐시에 있는 것으로만 답한다."""
+    token = _CACHE_ONLY.set(True)
+    try:
+        yield
+    finally:
+        _CACHE_ONLY.reset(token)
+
+
+async def run_cache_only(coro):
+    with cache_only():
+        return await coro
+
+
+def clear_cache_only():
+    """지금 문맥의 캐시 전용 표시를 지운다. 여러 요청이 나눠 쓰는 작업의 문맥을 만들 때만 쓴다."""
+    _CACHE_ONLY.set(False)
+
+
+def upstream_allowed():
+    return not _CACHE_ONLY.get()
+
+
+def ensure_upstream_allowed():
+    if _CACHE_ONLY.get():
+        raise AdmissionRejected("admission queue full and nothing cached")
+
+
+# Flask 스레드에서 도는 경로(WSGI, 비동기 서버의 임베드 등)와 비동기 서버가 루프에서 기다리는 경로
+route_admission = AdmissionController()
+async_admission = AdmissionController(limit=ASYNC_ADMISSION_LIMIT, queue=ASYNC_ADMISSION_QUEUE, total=0)
+
+
+def admission_stats():
+    return {"threads": route_admission.snapshot(), "async": async_admission.snapshot()}
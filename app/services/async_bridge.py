@@ -1,11 +1,26 @@
 import asyncio
 import atexit
+import contextvars
+import logging
 import os
 import threading
+import time
+import weakref
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
+from .admission import clear_cache_only, ensure_upstream_allowed, upstream_allowed
 from .dc import api as dc_api
+from .dc.deadline import (
+    REQUEST_DEADLINE,
+    DeadlineExceeded,
+    current_deadline,
+    remaining_time,
+    request_deadline,
+    run_with_deadline,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def _env_int(name, default):
@@ -16,13 +31,113 @@ def _env_int(name, default):
 
 
 ASYNC_FALLBACK_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, _env_int("MIRROR_ASYNC_BRIDGE_WORKERS", 2)))
+# 백그라운드 루프가 이 간격(ms)마다 깨어나 예정보다 늦은 시간(루프 지연)을 잰다. 0이면 재지 않는다.
+LOOP_LAG_INTERVAL_MS = max(_env_int("MIRROR_LOOP_LAG_INTERVAL_MS", 500), 0)
+# 루프 지연이 이보다 크면 경고 로그를 남긴다.
+LOOP_LAG_WARN_MS = max(_env_int("MIRROR_LOOP_LAG_WARN_MS", 200), 1)
+# run_async 호출 소요 시간(큐 대기 포함) 히스토그램 구간 상한(ms). 마지막 구간은 그보다 긴 호출이다.
+WALL_TIME_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
 
 _BACKGROUND_LOOP = None
 _BACKGROUND_THREAD = None
 _BACKGROUND_STARTING = False
 _BACKGROUND_READY = threading.Event()
 _BACKGROUND_LOCK = threading.Lock()
+_ADOPTED_LOOP = None
+_ADOPTED_PROBE = None
 _SHARED_DC_API = None
+_SINGLE_FLIGHTS = weakref.WeakKeyDictionary()
+_SINGLE_FLIGHTS_LOCK = threading.Lock()
+_LOOP_STATS_LOCK = threading.Lock()
+_LOOP_COUNTERS = {
+    "submitted": 0,
+    "started": 0,
+    "completed": 0,
+    "failed": 0,
+    "fallback_runs": 0,
+    "fallback_api_sessions": 0,
+    "lag_warnings": 0,
+}
+_LOOP_STATE = {"lag_ms": None, "lag_max_ms": 0.0, "tasks": None, "probed_at": None}
+_WALL_TIMES = {}
+
+
+def _count(event, amount=1):
+    with _LOOP_STATS_LOCK:
+        _LOOP_COUNTERS[event] += amount
+
+
+def _record_wall_time(name, elapsed_ms):
+    with _LOOP_STATS_LOCK:
+        histogram = _WALL_TIMES.get(name)
+        if histogram is None:
+            histogram = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(WALL_TIME_BUCKETS_MS) + 1)}
+            _WALL_TIMES[name] = histogram
+        histogram["count"] += 1
+        histogram["total_ms"] += elapsed_ms
+        histogram["max_ms"] = max(histogram["max_ms"], elapsed_ms)
+        index = next(
+            (idx for idx, bound in enumerate(WALL_TIME_BUCKETS_MS) if elapsed_ms <= bound),
+            len(WALL_TIME_BUCKETS_MS),
+        )
+        histogram["buckets"][index] += 1
+
+
+async def _tracked(coro, name, submitted_at):
+    """run_async로 들어온 코루틴의 시작·끝을 세고 제출부터 끝까지 걸린 시간을 남긴다."""
+    _count("started")
+    try:
+        result = await coro
+    except BaseException:
+        _count("failed")
+        raise
+    finally:
+        _count("completed")
+        _record_wall_time(name, (time.monotonic() - submitted_at) * 1000)
+    return result
+
+
+async def _lag_probe(interval):
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag_ms = max(loop.time() - expected, 0.0) * 1000
+        tasks = len(asyncio.all_tasks(loop))
+        with _LOOP_STATS_LOCK:
+            _LOOP_STATE["lag_ms"] = round(lag_ms, 1)
+            _LOOP_STATE["lag_max_ms"] = round(max(_LOOP_STATE["lag_max_ms"], lag_ms), 1)
+            _LOOP_STATE["tasks"] = tasks
+            _LOOP_STATE["probed_at"] = time.time()
+            if lag_ms > LOOP_LAG_WARN_MS:
+                _LOOP_COUNTERS["lag_warnings"] += 1
+        if lag_ms > LOOP_LAG_WARN_MS:
+            logger.warning("async bridge loop lag: %.0fms (tasks=%d)", lag_ms, tasks)
+
+
+def loop_stats():
+    """백그라운드 루프 상태: 지연, 제출·완료 수, 대기 중인 제출, 폴백 횟수, 호출별 소요 시간 분포."""
+    with _LOOP_STATS_LOCK:
+        stats = dict(_LOOP_COUNTERS)
+        stats.update(_LOOP_STATE)
+        wall_times = {
+            name: dict(histogram, buckets=list(histogram["buckets"]), total_ms=round(histogram["total_ms"], 1))
+            for name, histogram in sorted(_WALL_TIMES.items())
+        }
+    stats["queued"] = stats["submitted"] - stats["started"]
+    stats["inflight"] = stats["started"] - stats["completed"]
+    stats["running"] = get_loop_if_running() is not None
+    stats["wall_time_buckets_ms"] = list(WALL_TIME_BUCKETS_MS)
+    stats["wall_times"] = wall_times
+    return stats
+
+
+def reset_loop_stats():
+    with _LOOP_STATS_LOCK:
+        for event in _LOOP_COUNTERS:
+            _LOOP_COUNTERS[event] = 0
+        _LOOP_STATE.update({"lag_ms": None, "lag_max_ms": 0.0, "tasks": None, "probed_at": None})
+        _WALL_TIMES.clear()
 
 
 def _background_loop_worker():
@@ -33,6 +148,8 @@ def _background_loop_worker():
         _BACKGROUND_LOOP = loop
         _BACKGROUND_STARTING = False
     _BACKGROUND_READY.set()
+    if LOOP_LAG_INTERVAL_MS > 0:
+        loop.create_task(_lag_probe(LOOP_LAG_INTERVAL_MS / 1000))
     try:
         loop.run_forever()
     finally:
@@ -67,6 +184,44 @@ def get_background_loop():
         return _BACKGROUND_LOOP
 
 
+def adopt_loop(loop):
+    """이미 도는 루프(비동기 서버의 루프)를 백그라운드 루프로 쓴다.
+
+    run_async, dc_api_context의 공유 세션, schedule_single_flight가 모두 이 루프를 쓴다.
+    """
+    global _BACKGROUND_LOOP, _BACKGROUND_THREAD, _BACKGROUND_STARTING, _ADOPTED_LOOP, _ADOPTED_PROBE
+    with _BACKGROUND_LOCK:
+        if _BACKGROUND_LOOP is not None and _BACKGROUND_LOOP is not loop and _BACKGROUND_LOOP.is_running():
+            raise RuntimeError("async bridge loop is already running")
+        _BACKGROUND_LOOP = loop
+        _BACKGROUND_THREAD = None
+        _BACKGROUND_STARTING = False
+        _ADOPTED_LOOP = loop
+    _BACKGROUND_READY.set()
+    if LOOP_LAG_INTERVAL_MS > 0:
+        _ADOPTED_PROBE = loop.create_task(_lag_probe(LOOP_LAG_INTERVAL_MS / 1000))
+
+
+async def release_loop():
+    """adopt_loop으로 빌린 루프를 돌려준다. 공유 세션을 닫지만 루프는 멈추지 않는다."""
+    global _BACKGROUND_LOOP, _ADOPTED_LOOP, _ADOPTED_PROBE
+    if _ADOPTED_PROBE is not None:
+        _ADOPTED_PROBE.cancel()
+        _ADOPTED_PROBE = None
+    await _close_shared_dc_api()
+    with _BACKGROUND_LOCK:
+        if _BACKGROUND_LOOP is _ADOPTED_LOOP:
+            _BACKGROUND_LOOP = None
+        _ADOPTED_LOOP = None
+    _BACKGROUND_READY.clear()
+
+
+def get_loop_if_running():
+    with _BACKGROUND_LOCK:
+        loop = _BACKGROUND_LOOP
+    return loop if loop is not None and loop.is_running() else None
+
+
 def _is_background_loop(loop):
     with _BACKGROUND_LOCK:
         return loop is not None and loop is _BACKGROUND_LOOP
@@ -81,11 +236,15 @@ async def _get_shared_dc_api():
 
 @asynccontextmanager
 async def dc_api_context():
+    # admission control이 넘친 요청은 캐시로만 답하고 upstream 세션을 받지 못한다.
+    ensure_upstream_allowed()
     loop = asyncio.get_running_loop()
     if _is_background_loop(loop):
         yield await _get_shared_dc_api()
         return
 
+    # 백그라운드 루프 밖(폴백 실행기 등)에서는 호출마다 새 세션을 만들어 연결을 다시 쓰지 못한다.
+    _count("fallback_api_sessions")
     async with dc_api.API() as api:
         yield api
 
@@ -104,7 +263,7 @@ def shutdown_async_bridge():
         loop = _BACKGROUND_LOOP
         thread = _BACKGROUND_THREAD
 
-    if loop is None:
+    if loop is None or loop is _ADOPTED_LOOP:
         return
 
     if loop.is_running():
@@ -123,17 +282,118 @@ def shutdown_async_bridge():
         _BACKGROUND_STARTING = False
 
 
+def _single_flight_tasks(loop):
+    with _SINGLE_FLIGHTS_LOCK:
+        tasks = _SINGLE_FLIGHTS.get(loop)
+        if tasks is None:
+            tasks = {}
+            _SINGLE_FLIGHTS[loop] = tasks
+        return tasks
+
+
+def _single_flight_task(loop, key, coro_factory):
+    """key의 (작업, 작업 마감 시각). 없으면 지금 호출자의 문맥으로 새로 시작한다."""
+    tasks = _single_flight_tasks(loop)
+    flight = tasks.get(key)
+    if flight is None:
+        # 우선순위와 마감은 시작한 호출자의 것을 그대로 쓴다. 마감에 걸린 작업은 받은 데까지 돌려줄 수
+        # 있으므로(댓글 일부 등) 대기자가 먼저 끊지 않게 마감 시각을 함께 둔다. 캐시 전용 표시만 지운다.
+        context = contextvars.copy_context()
+        context.run(clear_cache_only)
+        task = loop.create_task(coro_factory(), context=context)
+        flight = (task, context.run(current_deadline))
+        tasks[key] = flight
+
+        def _forget(done_task, flight_key=key):
+            current = tasks.get(flight_key)
+            if current is not None and current[0] is done_task:
+                tasks.pop(flight_key, None)
+
+        task.add_done_callback(_forget)
+    return flight
+
+
+async def single_flight(key, coro_factory):
+    """같은 key로 동시에 들어온 호출을 하나의 in-flight 작업으로 합친다.
+
+    결과 객체는 모든 호출자가 공유하므로 변경 가능한 값이면 호출자가 복사해야 한다.
+    공유 작업은 shield로 감싸 한 호출자의 취소가 다른 대기자에게 번지지 않는다.
+    캐시로만 답하는 호출자는 진행 중인 작업에 합류만 하고, 없으면 자기 문맥에서 직접 돌려 캐시만 본다.
+    작업보다 마감이 이른 대기자는 자기 마감까지만 기다린다.
+    """
+    loop = asyncio.get_running_loop()
+    if not upstream_allowed() and key not in _single_flight_tasks(loop):
+        return await coro_factory()
+    task, flight_deadline = _single_flight_task(loop, key, coro_factory)
+    deadline = current_deadline()
+    if deadline is None or (flight_deadline is not None and flight_deadline <= deadline):
+        return await asyncio.shield(task)
+    remaining = remaining_time()
+    if remaining <= 0:
+        raise DeadlineExceeded("request deadline exceeded")
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), remaining)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("request deadline exceeded") from None
+
+
+def _log_background_failure(future):
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("Background refresh failed: %s", exc)
+
+
+def schedule_single_flight(key, coro_factory):
+    """key당 하나만 도는 작업을 백그라운드 루프에 걸어 두고 기다리지 않는다.
+
+    이미 같은 key가 진행 중이면 그 작업에 합류한다. 실패는 로그만 남긴다.
+    요청 중에 걸어도 그 요청의 마감 시간은 물려받지 않는다. 캐시로만 답하는 중이면 AdmissionRejected.
+    """
+    ensure_upstream_allowed()
+
+    def background_factory():
+        return run_with_deadline(None, coro_factory())
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if _is_background_loop(loop):
+        with request_deadline(None):
+            future = _single_flight_task(loop, key, background_factory)[0]
+    else:
+        future = asyncio.run_coroutine_threadsafe(single_flight(key, background_factory), get_background_loop())
+    future.add_done_callback(_log_background_failure)
+    return future
+
+
+async def run_on_loop(coro, deadline=REQUEST_DEADLINE):
+    """이미 백그라운드 루프 위에 있는 호출자(비동기 서버)가 run_async와 같은 마감·계측으로 코루틴을 기다린다."""
+    name = getattr(coro, "__qualname__", type(coro).__name__)
+    _count("submitted")
+    return await _tracked(run_with_deadline(deadline, coro), name, time.monotonic())
+
+
 def _run_coro_in_new_loop(coro):
     return asyncio.run(coro)
 
 
-def run_async(coro):
-    """Run an async service call from Flask's sync route boundary."""
+def run_async(coro, deadline=REQUEST_DEADLINE):
+    """Run an async service call from Flask's sync route boundary.
+
+    deadline(초) 안에 upstream 조회를 끝내도록 요청 마감 시간을 건다. 0이면 걸지 않는다.
+    """
+    name = getattr(coro, "__qualname__", type(coro).__name__)
+    _count("submitted")
+    coro = _tracked(run_with_deadline(deadline, coro), name, time.monotonic())
     try:
         asyncio.get_running_loop()
     except RuntimeError:
         loop = get_background_loop()
         return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    _count("fallback_runs")
     return ASYNC_FALLBACK_EXECUTOR.submit(_run_coro_in_new_loop, coro).result()
 
 
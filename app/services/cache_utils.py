@@ -1,5 +1,15 @@
+import logging
 import os
+import pickle
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+INSTANCE_DIR = os.path.join(BASE_DIR, "instance")
 
 
 def env_int(name, default):
@@ -16,38 +26,380 @@ def safe_int(value, default=0):
         return default
 
 
-def cache_get(cache, lock, key):
-    now = time.time()
-    with lock:
-        entry = cache.get(key)
-        if not entry:
+CACHE_BACKEND = (os.getenv("MIRROR_CACHE_BACKEND") or "memory").strip().lower()
+CACHE_SQLITE_PATH = os.getenv("MIRROR_CACHE_SQLITE_PATH", os.path.join(INSTANCE_DIR, "shared_cache.sqlite3"))
+CACHE_SQLITE_BUSY_TIMEOUT_MS = max(env_int("MIRROR_CACHE_SQLITE_BUSY_TIMEOUT_MS", 200), 0)
+CACHE_SQLITE_PRUNE_EVERY = max(env_int("MIRROR_CACHE_SQLITE_PRUNE_EVERY", 128), 1)
+
+# id(cache) -> namespace. 등록된 캐시만 공유 백엔드를 탄다.
+_SHARED_CACHE_NAMESPACES = {}
+# id(cache) -> 전용 백엔드. MIRROR_CACHE_BACKEND와 관계없이 이 백엔드에 저장한다.
+_PINNED_CACHE_BACKENDS = {}
+_SHARED_CACHE_NAMESPACES_LOCK = threading.Lock()
+_CACHE_BACKEND = None
+_CACHE_BACKEND_LOCK = threading.Lock()
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def record(self, namespace, event):
+        with self._lock:
+            counters = self._counters.setdefault(namespace or "-", {"hits": 0, "misses": 0, "sets": 0, "errors": 0})
+            counters[event] += 1
+
+    def snapshot(self):
+        with self._lock:
+            namespaces = {name: dict(counters) for name, counters in self._counters.items()}
+        totals = {"hits": 0, "misses": 0, "sets": 0, "errors": 0}
+        for counters in namespaces.values():
+            for event, count in counters.items():
+                totals[event] += count
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_ratio"] = round(totals["hits"] / lookups, 4) if lookups else None
+        totals["namespaces"] = namespaces
+        return totals
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+class TTLCache:
+    """항목별 만료 시각과 최대 개수를 가진 LRU 캐시.
+
+    OrderedDict를 최근 사용 순서로 유지해 조회·저장·축출이 모두 amortized O(1)이다.
+    만료 항목은 조회 시점이나 LRU 끝에서 게으르게 지운다. 동기화는 호출자가 쥔
+    lock에 맡긴다.
+    """
+
+    __slots__ = ("max_items", "_entries")
+
+    # set() 한 번에 LRU 끝에서 확인하는 만료 후보 수. 잠금 구간을 상수로 묶는다.
+    EXPIRE_SCAN_LIMIT = 4
+
+    def __init__(self, max_items=None):
+        self.max_items = max_items
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def get_entry(self, key, now=None):
+        entry = self._entries.get(key)
+        if entry is None:
             return None
-        if entry["expires_at"] <= now:
+        if entry[1] <= (time.time() if now is None else now):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key, default=None, now=None):
+        entry = self.get_entry(key, now=now)
+        return default if entry is None else entry[0]
+
+    def expires_at(self, key):
+        entry = self._entries.get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key, value, expires_at, max_items=None, now=None):
+        entries = self._entries
+        entries[key] = (value, expires_at)
+        entries.move_to_end(key)
+        self._expire_lru_head(time.time() if now is None else now)
+        limit = self.max_items if max_items is None else max_items
+        if limit is None:
+            return
+        limit = max(limit, 0)
+        while len(entries) > limit:
+            entries.popitem(last=False)
+
+    def _expire_lru_head(self, now):
+        entries = self._entries
+        for _ in range(self.EXPIRE_SCAN_LIMIT):
+            if not entries:
+                return
+            key, entry = next(iter(entries.items()))
+            if entry[1] > now:
+                return
+            del entries[key]
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class InProcessCacheBackend:
+    """워커 프로세스 메모리의 TTLCache에 그대로 저장하는 기본 백엔드."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, cache, lock, key):
+        now = time.time()
+        with lock:
+            entry = cache.get_entry(key, now=now)
+        self.stats.record(cache_namespace(cache), "hits" if entry else "misses")
+        return entry[0] if entry else None
+
+    def set(self, cache, lock, key, value, ttl, max_items):
+        now = time.time()
+        expires_at = now + max(safe_int(ttl, 0), 0)
+        with lock:
+            cache.set(key, value, expires_at, max_items=max_items, now=now)
+        self.stats.record(cache_namespace(cache), "sets")
+
+    def delete(self, cache, lock, key):
+        with lock:
             cache.pop(key, None)
+
+
+class SQLiteCacheBackend:
+    """같은 호스트의 gunicorn 워커들이 공유하는 SQLite(WAL) 백엔드.
+
+    값은 pickle로 저장하므로 파일은 앱 전용 instance/ 아래에 두고 0600으로 만든다.
+    SQLite 오류는 캐시 미스로 취급해 요청 경로를 막지 않는다.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path=None, busy_timeout_ms=None, prune_every=None, name=None):
+        if name:
+            self.name = name
+        self.path = path or CACHE_SQLITE_PATH
+        self.busy_timeout_ms = CACHE_SQLITE_BUSY_TIMEOUT_MS if busy_timeout_ms is None else max(int(busy_timeout_ms), 0)
+        self.prune_every = CACHE_SQLITE_PRUNE_EVERY if prune_every is None else max(int(prune_every), 1)
+        self.stats = CacheStats()
+        self._local = threading.local()
+        self._sets_since_prune = {}
+        self._prune_lock = threading.Lock()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        # fork 이후 부모 프로세스의 커넥션을 물려받지 않도록 pid를 함께 확인한다.
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.path):
+            fd = os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600)
+            os.close(fd)
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema(conn)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _ensure_schema(self, conn):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, "
+                "cache_key TEXT NOT NULL, "
+                "value BLOB NOT NULL, "
+                "expires_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, cache_key)"
+                ") WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_expiry ON cache_entries (namespace, expires_at)"
+            )
+            self._schema_ready = True
+
+    @staticmethod
+    def _encode_key(key):
+        return repr(key)
+
+    def get(self, cache, lock, key):
+        namespace = cache_namespace(cache)
+        try:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND cache_key = ?",
+                (namespace, self._encode_key(key)),
+            ).fetchone()
+            if row is None or float(row[1]) <= time.time():
+                self.stats.record(namespace, "misses")
+                return None
+            value = pickle.loads(row[0])
+        except (sqlite3.Error, OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            logger.warning("shared cache get failed: namespace=%s", namespace, exc_info=True)
+            self.stats.record(namespace, "errors")
+            self.stats.record(namespace, "misses")
             return None
-        return entry["value"]
+        self.stats.record(namespace, "hits")
+        return value
+
+    def set(self, cache, lock, key, value, ttl, max_items):
+        namespace = cache_namespace(cache)
+        now = time.time()
+        expires_at = now + max(safe_int(ttl, 0), 0)
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, cache_key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, self._encode_key(key), sqlite3.Binary(payload), expires_at),
+            )
+            if self._prune_due(namespace):
+                self._prune(conn, namespace, now, max_items)
+        except (sqlite3.Error, OSError, pickle.PicklingError, TypeError, AttributeError):
+            logger.warning("shared cache set failed: namespace=%s", namespace, exc_info=True)
+            self.stats.record(namespace, "errors")
+            return
+        self.stats.record(namespace, "sets")
+
+    def delete(self, cache, lock, key):
+        namespace = cache_namespace(cache)
+        try:
+            self._connect().execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?",
+                (namespace, self._encode_key(key)),
+            )
+        except (sqlite3.Error, OSError):
+            logger.warning("shared cache delete failed: namespace=%s", namespace, exc_info=True)
+            self.stats.record(namespace, "errors")
+
+    def clear(self, namespace=None):
+        conn = self._connect()
+        if namespace is None:
+            conn.execute("DELETE FROM cache_entries")
+        else:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def _prune_due(self, namespace):
+        with self._prune_lock:
+            count = self._sets_since_prune.get(namespace, 0) + 1
+            if count >= self.prune_every:
+                self._sets_since_prune[namespace] = 0
+                return True
+            self._sets_since_prune[namespace] = count
+            return False
+
+    def _prune(self, conn, namespace, now, max_items):
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+            (namespace, now),
+        )
+        total = conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+            (namespace,),
+        ).fetchone()[0]
+        overflow = int(total) - max(max_items, 0)
+        if overflow <= 0:
+            return
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND cache_key IN ("
+            "SELECT cache_key FROM cache_entries WHERE namespace = ? ORDER BY expires_at LIMIT ?"
+            ")",
+            (namespace, namespace, overflow),
+        )
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+
+_IN_PROCESS_BACKEND = InProcessCacheBackend()
 
 
-def cache_prune(cache, now, max_items):
-    expired_keys = [key for key, entry in cache.items() if entry["expires_at"] <= now]
-    for key in expired_keys:
-        cache.pop(key, None)
-    overflow = len(cache) - max(max_items, 0)
-    if overflow <= 0:
-        return
-    oldest_keys = sorted(cache, key=lambda key: cache[key]["expires_at"])[:overflow]
-    for key in oldest_keys:
-        cache.pop(key, None)
+def _create_cache_backend(name):
+    if name == "sqlite":
+        return SQLiteCacheBackend()
+    if name not in {"", "memory"}:
+        logger.warning("unknown MIRROR_CACHE_BACKEND=%r; using in-process cache", name)
+    return _IN_PROCESS_BACKEND
+
+
+def get_cache_backend():
+    global _CACHE_BACKEND
+    with _CACHE_BACKEND_LOCK:
+        if _CACHE_BACKEND is None:
+            _CACHE_BACKEND = _create_cache_backend(CACHE_BACKEND)
+        return _CACHE_BACKEND
+
+
+def set_cache_backend(backend):
+    global _CACHE_BACKEND
+    with _CACHE_BACKEND_LOCK:
+        previous = _CACHE_BACKEND
+        _CACHE_BACKEND = backend
+    return previous
+
+
+def register_shared_cache(cache, namespace, backend=None):
+    """cache를 공유 백엔드 대상으로 등록한다. 미등록 캐시는 항상 프로세스 메모리에 남는다.
+
+    backend를 주면 MIRROR_CACHE_BACKEND 설정 대신 그 백엔드에 고정한다.
+    """
+    with _SHARED_CACHE_NAMESPACES_LOCK:
+        _SHARED_CACHE_NAMESPACES[id(cache)] = namespace
+        if backend is None:
+            _PINNED_CACHE_BACKENDS.pop(id(cache), None)
+        else:
+            _PINNED_CACHE_BACKENDS[id(cache)] = backend
+    return cache
+
+
+def cache_namespace(cache):
+    with _SHARED_CACHE_NAMESPACES_LOCK:
+        return _SHARED_CACHE_NAMESPACES.get(id(cache))
+
+
+def _backend_for(cache):
+    with _SHARED_CACHE_NAMESPACES_LOCK:
+        namespace = _SHARED_CACHE_NAMESPACES.get(id(cache))
+        pinned = _PINNED_CACHE_BACKENDS.get(id(cache))
+    if namespace is None:
+        return _IN_PROCESS_BACKEND
+    if pinned is not None:
+        return pinned
+    return get_cache_backend()
+
+
+def cache_stats():
+    backends = [_IN_PROCESS_BACKEND]
+    shared = get_cache_backend()
+    if shared is not _IN_PROCESS_BACKEND:
+        backends.append(shared)
+    with _SHARED_CACHE_NAMESPACES_LOCK:
+        pinned = list(_PINNED_CACHE_BACKENDS.values())
+    for backend in pinned:
+        if all(backend is not known for known in backends):
+            backends.append(backend)
+    return {backend.name: backend.stats.snapshot() for backend in backends}
+
+
+def cache_get(cache, lock, key):
+    return _backend_for(cache).get(cache, lock, key)
 
 
-def cache_set_after_insert(cache, lock, key, value, ttl, max_items, prune_func=cache_prune):
-    expires_at = time.time() + max(safe_int(ttl, 0), 0)
-    with lock:
-        cache[key] = {"value": value, "expires_at": expires_at}
-        if len(cache) > max(max_items, 0):
-            prune_func(cache, time.time(), max_items)
+def cache_set_after_insert(cache, lock, key, value, ttl, max_items):
+    _backend_for(cache).set(cache, lock, key, value, ttl, max_items)
 
 
 def cache_delete(cache, lock, key):
-    with lock:
-        cache.pop(key, None)
+    _backend_for(cache).delete(cache, lock, key)
@@ -1,14 +1,21 @@
+import asyncio
+import bisect
 import os
 import re
 import threading
 import time
 
 from .dc import api as dc_api
-from .async_bridge import dc_api_context
+from .admission import upstream_allowed
+from .async_bridge import dc_api_context, schedule_single_flight, single_flight
+from .cache_utils import TTLCache
 from .cache_utils import cache_get as _shared_cache_get
-from .cache_utils import cache_prune as _shared_cache_prune
+from .cache_utils import cache_set_after_insert as _shared_cache_set
+from .cache_utils import register_shared_cache as _register_shared_cache
 from .cache_utils import env_int as _env_int
 from .cache_utils import safe_int as _safe_int
+from .dc.deadline import DeadlineExceeded
+from .dc.limiter import PRIORITY_BACKGROUND, circuit_open, request_priority, run_with_priority
 
 
 def _env_bool(name, default=False):
@@ -18,16 +25,66 @@ def _env_bool(name, default=False):
     return str(value).strip().lower() in {"1", "true", "yes", "on"}
 
 
+class FrozenRow(dict):
+    """캐시에 든 채로 여러 요청이 함께 쓰는 읽기 전용 행.
+
+    dict를 상속하므로 템플릿, jsonify, 비교는 그대로 동작하고 변경 메서드만 막는다.
+    값을 바꿔야 하면 replace()로 새 행을 만든다.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenRow is read-only")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def replace(self, **changes):
+        return FrozenRow(self, **changes)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return FrozenRow, (dict(self),)
+
+
+def _row_with(row, **changes):
+    return FrozenRow(row, **changes)
+
+
 MAX_PAGE = 31
 RELATED_LIMIT = 12
 DOCS_PER_PAGE_ESTIMATE = max(int(getattr(dc_api, "DOCS_PER_PAGE", 200)), 1)
 RELATED_PAGE_FETCH_SIZE = DOCS_PER_PAGE_ESTIMATE
 RELATED_PAGE_PROBE_STEPS = max(_env_int("MIRROR_RELATED_PAGE_PROBE_STEPS", 4), 1)
 RELATED_TAIL_PAGES = max(_env_int("MIRROR_RELATED_TAIL_PAGES", 1), 0)
+# 게시판 페이지별 id 범위를 기억해 관련 글 시작 페이지를 고를 때 쓰는 시간(초). 0이면 끈다.
+RELATED_PAGE_INDEX_TTL = max(_env_int("MIRROR_RELATED_PAGE_INDEX_TTL", 600), 0)
+RELATED_PAGE_INDEX_MAX_PAGES = 64
 BOARD_PAGE_CACHE_TTL = max(_env_int("MIRROR_BOARD_PAGE_CACHE_TTL", 20), 0)
+# 신선 TTL이 지난 뒤에도 이 시간(초) 동안은 캐시를 바로 돌려주고 백그라운드에서 갱신한다.
+BOARD_STALE_TTL = max(_env_int("MIRROR_BOARD_STALE_TTL", 0), 0)
 BOARD_TIME_CACHE_TTL = max(_env_int("MIRROR_BOARD_TIME_CACHE_TTL", BOARD_PAGE_CACHE_TTL), 0)
 READ_CACHE_TTL = max(_env_int("MIRROR_READ_CACHE_TTL", 0), 0)
+# 0보다 크면 본문(제목·HTML·이미지·관련 글)은 이 시간 동안 캐시하고 댓글만 증분 갱신한다.
+READ_BODY_CACHE_TTL = max(_env_int("MIRROR_READ_BODY_CACHE_TTL", 0), 0)
 BOARD_FILL_AUTHOR_CODES = _env_bool("MIRROR_BOARD_FILL_AUTHOR_CODES", False)
+# 0이면 캐시에 있는 작성자 코드만 채운다. 0보다 크면 캐시에 없는 글을 이만큼 동시에 조회한다.
+BOARD_FILL_AUTHOR_CODES_CONCURRENCY = max(_env_int("MIRROR_BOARD_FILL_AUTHOR_CODES_CONCURRENCY", 0), 0)
+BOARD_FILL_AUTHOR_CODES_DEADLINE_MS = max(_env_int("MIRROR_BOARD_FILL_AUTHOR_CODES_DEADLINE_MS", 1500), 0)
+# 켜면 게시판 목록을 PC 페이지에서 바로 받아 정확한 작성 시각을 함께 내려준다.
+BOARD_PREFER_PC = _env_bool("MIRROR_BOARD_PREFER_PC", False)
 LATEST_ID_CACHE_TTL = 20
 AUTHOR_CODE_CACHE_TTL = 3600
 BOARD_PAGE_CACHE_MAX_ITEMS = 2048
@@ -36,23 +93,27 @@ BOARD_TIME_CACHE_MAX_ITEMS = BOARD_PAGE_CACHE_MAX_ITEMS
 READ_CACHE_MAX_ITEMS = 512
 LATEST_ID_CACHE_MAX_ITEMS = 512
 AUTHOR_CODE_CACHE_MAX_ITEMS = 8192
-CACHE_PRUNE_EVERY = max(_env_int("MIRROR_CACHE_PRUNE_EVERY", 64), 1)
-CACHE_PRUNE_MIN_INTERVAL = max(_env_int("MIRROR_CACHE_PRUNE_MIN_INTERVAL", 1), 0)
-
-_BOARD_PAGE_CACHE = {}
-_BOARD_INDEX_CACHE = {}
-_BOARD_TIME_CACHE = {}
-_READ_CACHE = {}
-_LATEST_ID_CACHE = {}
-_AUTHOR_CODE_CACHE = {}
+PAGE_ID_INDEX_MAX_ITEMS = 512
+
+_BOARD_PAGE_CACHE = _register_shared_cache(TTLCache(BOARD_PAGE_CACHE_MAX_ITEMS), "board_page")
+_BOARD_INDEX_CACHE = _register_shared_cache(TTLCache(BOARD_INDEX_CACHE_MAX_ITEMS), "board_index")
+_BOARD_TIME_CACHE = _register_shared_cache(TTLCache(BOARD_TIME_CACHE_MAX_ITEMS), "board_time")
+_READ_CACHE = _register_shared_cache(TTLCache(READ_CACHE_MAX_ITEMS), "read")
+_READ_BODY_CACHE = _register_shared_cache(TTLCache(READ_CACHE_MAX_ITEMS), "read_body")
+_READ_COMMENTS_CACHE = _register_shared_cache(TTLCache(READ_CACHE_MAX_ITEMS), "read_comments")
+_LATEST_ID_CACHE = _register_shared_cache(TTLCache(LATEST_ID_CACHE_MAX_ITEMS), "latest_id")
+_AUTHOR_CODE_CACHE = _register_shared_cache(TTLCache(AUTHOR_CODE_CACHE_MAX_ITEMS), "author_code")
+# 목록 key별 {"pages": 정렬된 페이지 번호, "ranges": page -> (min_id, max_id, fetched_at)}. 워커 로컬.
+_PAGE_ID_INDEX = TTLCache(PAGE_ID_INDEX_MAX_ITEMS)
 _BOARD_PAGE_CACHE_LOCK = threading.Lock()
 _BOARD_INDEX_CACHE_LOCK = threading.Lock()
 _BOARD_TIME_CACHE_LOCK = threading.Lock()
 _READ_CACHE_LOCK = threading.Lock()
+_READ_BODY_CACHE_LOCK = threading.Lock()
+_READ_COMMENTS_CACHE_LOCK = threading.Lock()
 _LATEST_ID_CACHE_LOCK = threading.Lock()
 _AUTHOR_CODE_CACHE_LOCK = threading.Lock()
-_CACHE_PRUNE_STATE = {}
-_CACHE_PRUNE_STATE_LOCK = threading.Lock()
+_PAGE_ID_INDEX_LOCK = threading.Lock()
 _AUTHOR_CODE_SUFFIX_RE = re.compile(r"\(([^()\s]{1,64})\)\s*$")
 _AUTHOR_CODE_OPEN_RE = re.compile(r"\(([^()\s]{1,64})$")
 _ANON_NAME_RE = re.compile(r"ㅇㅇ(\d*)")
@@ -131,7 +192,7 @@ def format_display_time(value):
 def _comment_to_dict(comment):
     comment_author, comment_author_code = _normalize_author(comment.author, comment.author_id)
     is_reply = bool(getattr(comment, "is_reply", False)) or _is_reply_comment(comment.parent_id)
-    return {
+    return FrozenRow({
         "time": format_display_time(comment.time),
         "contents": comment.contents,
         "author": comment_author,
@@ -140,7 +201,7 @@ def _comment_to_dict(comment):
         "parent_id": comment.parent_id,
         "is_reply": is_reply,
         "dccon": comment.dccon,
-    }
+    })
 
 
 def _index_time_display(item):
@@ -150,10 +211,10 @@ def _index_time_display(item):
     return format_display_time(getattr(item, "time", None))
 
 
-def _index_item_to_dict(item):
+def _index_item_to_dict(item, **extra):
     author, author_code = _normalize_author(item.author, getattr(item, "author_id", None))
     needs_time_hydrate = not bool(getattr(item, "time_is_precise", True))
-    return {
+    return FrozenRow({
         "id": item.id,
         "subject": getattr(item, "subject", None),
         "title": item.title,
@@ -174,47 +235,24 @@ def _index_item_to_dict(item):
         "isdcbest": item.isdcbest,
         "ishit": item.ishit,
         "is_mobile_source": bool(getattr(item, "is_mobile_source", False)),
-    }
+    }, **extra)
 
 
 def _cache_get(cache, lock, key):
     return _shared_cache_get(cache, lock, key)
 
 
-def _cache_prune(cache, now, max_items):
-    _shared_cache_prune(cache, now, max_items)
-
-
-def _should_prune_cache(cache, now, max_items):
-    with _CACHE_PRUNE_STATE_LOCK:
-        state = _CACHE_PRUNE_STATE.setdefault(id(cache), {"sets": 0, "last_pruned_at": 0.0})
-        state["sets"] += 1
-        should_prune = (
-            state["sets"] >= CACHE_PRUNE_EVERY
-            or now - float(state["last_pruned_at"] or 0.0) >= CACHE_PRUNE_MIN_INTERVAL
-            or len(cache) > max(max_items, 0)
-        )
-        if should_prune:
-            state["sets"] = 0
-            state["last_pruned_at"] = now
-        return should_prune
-
-
 def _cache_set(cache, lock, key, value, ttl, max_items):
-    expires_at = time.time() + max(_safe_int(ttl, 0), 0)
-    with lock:
-        cache[key] = {"value": value, "expires_at": expires_at}
-        now = time.time()
-        if _should_prune_cache(cache, now, max_items):
-            _cache_prune(cache, now, max_items)
+    _shared_cache_set(cache, lock, key, value, ttl, max_items)
 
 
+# 행은 FrozenRow라 캐시와 호출자가 그대로 공유한다. 바깥 list만 새로 만든다.
 def _copy_rows(rows):
-    return [dict(row) for row in (rows or [])]
+    return list(rows or [])
 
 
 def _copy_categories(categories):
-    return [dict(row) for row in (categories or [])]
+    return list(categories or [])
 
 
 def _copy_pagination(pagination):
@@ -231,9 +269,27 @@ def _copy_read_payload(payload):
 
 def _is_read_payload_cacheable(payload):
     data, _comments, _images = payload
+    if (data or {}).get("comments_truncated"):
+        return False
     return (data or {}).get("html") != "게시글 데이터를 가져오는 데 실패했습니다."
 
 
+def _board_cache_ttl():
+    if BOARD_PAGE_CACHE_TTL <= 0:
+        return 0
+    return BOARD_PAGE_CACHE_TTL + BOARD_STALE_TTL
+
+
+def _board_cache_age(stored_at):
+    if stored_at is None:
+        return None
+    return max(time.time() - stored_at, 0.0)
+
+
+def _is_board_cache_stale(age):
+    return age is not None and age >= BOARD_PAGE_CACHE_TTL
+
+
 def _board_index_cache_key(
     page,
     board,
@@ -295,18 +351,8 @@ def _cache_author_code(board, kind, doc_id, author, author_code, author_role=Non
     )
 
 
-async def _fetch_board_page(
-    api,
-    page,
-    board,
-    recommend,
-    kind=None,
-    page_size=RELATED_PAGE_FETCH_SIZE,
-    search_type=None,
-    search_keyword=None,
-    head_id=None,
-):
-    cache_key = (
+def _board_page_cache_key(page, board, recommend, kind=None, page_size=RELATED_PAGE_FETCH_SIZE, search_type=None, search_keyword=None, head_id=None):
+    return (
         board,
         kind or "",
         _safe_int(recommend, 0),
@@ -316,10 +362,89 @@ async def _fetch_board_page(
         (search_keyword or "").strip(),
         "" if head_id is None else str(head_id).strip(),
     )
-    cached = _cache_get(_BOARD_PAGE_CACHE, _BOARD_PAGE_CACHE_LOCK, cache_key)
-    if cached is not None:
-        return _copy_rows(cached)
 
+
+def _page_id_index_key(board_page_cache_key):
+    # board page cache key에서 page만 뺀 목록 key. page_size가 다르면 페이지 번호도 다르다.
+    return board_page_cache_key[:3] + board_page_cache_key[4:]
+
+
+def _record_page_id_range(index_key, page, rows, now=None):
+    if RELATED_PAGE_INDEX_TTL <= 0:
+        return
+    ids = [doc_id for doc_id in (_safe_int(row.get("id"), 0) for row in rows or []) if doc_id > 0]
+    page = _safe_int(page, 0)
+    if not ids or page <= 0:
+        return
+    now = time.time() if now is None else now
+    with _PAGE_ID_INDEX_LOCK:
+        entry = _PAGE_ID_INDEX.get(index_key, now=now)
+        if entry is None:
+            entry = {"pages": [], "ranges": {}}
+        ranges = entry["ranges"]
+        if page not in ranges:
+            bisect.insort(entry["pages"], page)
+        ranges[page] = (min(ids), max(ids), now)
+        if len(entry["pages"]) > RELATED_PAGE_INDEX_MAX_PAGES:
+            oldest_page = min(entry["pages"], key=lambda known_page: ranges[known_page][2])
+            entry["pages"].remove(oldest_page)
+            ranges.pop(oldest_page, None)
+        _PAGE_ID_INDEX.set(index_key, entry, now + RELATED_PAGE_INDEX_TTL, now=now)
+
+
+def _estimate_page_from_index(index_key, target_id, now=None):
+    """알려진 페이지 id 범위에서 target_id가 있을 페이지를 고른다.
+
+    최신순 목록은 페이지가 커질수록 id가 작아지므로 min_id 역순으로 이분 탐색한다.
+    범위 안이면 그 페이지를, 두 페이지 사이면 id 간격으로 보간한 페이지를 돌려준다.
+    """
+    if RELATED_PAGE_INDEX_TTL <= 0 or target_id <= 0:
+        return None
+    now = time.time() if now is None else now
+    with _PAGE_ID_INDEX_LOCK:
+        entry = _PAGE_ID_INDEX.get(index_key, now=now)
+        if entry is None:
+            return None
+        known = [
+            (page, entry["ranges"][page][0], entry["ranges"][page][1])
+            for page in entry["pages"]
+            if now - entry["ranges"][page][2] < RELATED_PAGE_INDEX_TTL
+        ]
+    if not known:
+        return None
+
+    # 첫 번째로 min_id <= target_id인 페이지.
+    position = bisect.bisect_left([-min_id for _page, min_id, _max_id in known], -target_id)
+    if position < len(known) and known[position][2] >= target_id:
+        return known[position][0]
+    if 0 < position < len(known):
+        upper_page, upper_min, _upper_max = known[position - 1]
+        lower_page, _lower_min, lower_max = known[position]
+        if lower_page - upper_page <= 1:
+            return lower_page
+        ratio = (upper_min - target_id) / max(upper_min - lower_max, 1)
+        return upper_page + max(1, min(lower_page - upper_page - 1, round(ratio * (lower_page - upper_page))))
+
+    # 알려진 범위 밖이면 가장 가까운 페이지의 id 폭으로 외삽한다.
+    edge_page, edge_min, edge_max = known[0] if position == 0 else known[-1]
+    span = max(edge_max - edge_min + 1, 1)
+    if position == 0:
+        return max(1, edge_page - ((target_id - edge_max - 1) // span + 1))
+    return edge_page + ((edge_min - target_id - 1) // span + 1)
+
+
+async def _load_board_page(
+    api,
+    cache_key,
+    page,
+    board,
+    recommend,
+    kind=None,
+    page_size=RELATED_PAGE_FETCH_SIZE,
+    search_type=None,
+    search_keyword=None,
+    head_id=None,
+):
     posts = []
     async for item in api.board(
         board_id=board,
@@ -333,21 +458,71 @@ async def _fetch_board_page(
         head_id=head_id,
         headtexts_collector=[],
     ):
-        row = _index_item_to_dict(item)
-        row["source_page"] = _safe_int(page, 1)
-        posts.append(row)
+        posts.append(_index_item_to_dict(item, source_page=_safe_int(page, 1)))
+    _record_page_id_range(_page_id_index_key(cache_key), page, posts)
     if posts:
         _cache_set(
             _BOARD_PAGE_CACHE,
             _BOARD_PAGE_CACHE_LOCK,
             cache_key,
-            _copy_rows(posts),
-            BOARD_PAGE_CACHE_TTL,
+            (_copy_rows(posts), time.time()),
+            _board_cache_ttl(),
             BOARD_PAGE_CACHE_MAX_ITEMS,
         )
     return posts
 
 
+async def _refresh_board_page(cache_key, *args, **kwargs):
+    async with dc_api_context() as api:
+        return await _load_board_page(api, cache_key, *args, **kwargs)
+
+
+async def _fetch_board_page(
+    api,
+    page,
+    board,
+    recommend,
+    kind=None,
+    page_size=RELATED_PAGE_FETCH_SIZE,
+    search_type=None,
+    search_keyword=None,
+    head_id=None,
+):
+    cache_key = _board_page_cache_key(
+        page,
+        board,
+        recommend,
+        kind=kind,
+        page_size=page_size,
+        search_type=search_type,
+        search_keyword=search_keyword,
+        head_id=head_id,
+    )
+    load_kwargs = {
+        "kind": kind,
+        "page_size": page_size,
+        "search_type": search_type,
+        "search_keyword": search_keyword,
+        "head_id": head_id,
+    }
+    cached = _cache_get(_BOARD_PAGE_CACHE, _BOARD_PAGE_CACHE_LOCK, cache_key)
+    if cached is not None:
+        rows, stored_at = cached
+        # upstream 차단기가 열려 있거나 요청이 넘쳐 캐시로만 답하는 중이면 갱신 없이 오래된 목록을 준다.
+        if _is_board_cache_stale(_board_cache_age(stored_at)) and not circuit_open() and upstream_allowed():
+            # 호출자의 api는 곧 닫힐 수 있으므로 갱신은 자체 세션으로 돈다.
+            schedule_single_flight(
+                ("board_page",) + cache_key,
+                lambda: run_with_priority(
+                    PRIORITY_BACKGROUND,
+                    lambda: _refresh_board_page(cache_key, page, board, recommend, **load_kwargs),
+                ),
+            )
+        return _copy_rows(rows)
+
+    return await _load_board_page(api, cache_key, page, board, recommend, **load_kwargs)
+
+
 def _normalize_target_ids(target_ids):
     return tuple(str(value).strip() for value in (target_ids or []) if str(value).strip())
 
@@ -390,17 +565,19 @@ async def async_board_precise_times(
     if cached is not None:
         return dict(cached)
 
-    async with dc_api_context() as api:
-        precise_times = await api.board_precise_times(
-            board_id=board,
-            page=page,
-            recommend=bool(_safe_int(recommend, 0)),
-            kind=kind,
-            search_type=search_type,
-            search_keyword=search_keyword,
-            head_id=head_id,
-            target_ids=normalized_target_ids,
-        )
+    # 시각 보강은 화면을 이미 그린 뒤의 부가 요청이라 대화형 요청에 양보한다.
+    with request_priority(PRIORITY_BACKGROUND):
+        async with dc_api_context() as api:
+            precise_times = await api.board_precise_times(
+                board_id=board,
+                page=page,
+                recommend=bool(_safe_int(recommend, 0)),
+                kind=kind,
+                search_type=search_type,
+                search_keyword=search_keyword,
+                head_id=head_id,
+                target_ids=normalized_target_ids,
+            )
 
     result = {str(doc_id): format_display_time(value) for doc_id, value in (precise_times or {}).items()}
     _cache_set(
@@ -453,7 +630,7 @@ def _normalize_head_categories(rows, head_id=None):
         has_active = has_active or category["active"]
     if not has_active:
         categories[0]["active"] = True
-    return categories
+    return [FrozenRow(category) for category in categories]
 
 
 async def _fill_missing_author_code(api, board, kind, row, recommend=0, allow_fetch=True):
@@ -467,11 +644,13 @@ async def _fill_missing_author_code(api, board, kind, row, recommend=0, allow_fe
     cache_key = _author_code_cache_key(board, kind, doc_id)
     cached = _cache_get(_AUTHOR_CODE_CACHE, _AUTHOR_CODE_CACHE_LOCK, cache_key)
     if cached is not None:
-        row["author"] = cached.get("author", row.get("author"))
-        row["author_code"] = cached.get("author_code")
+        changes = {
+            "author": cached.get("author", row.get("author")),
+            "author_code": cached.get("author_code"),
+        }
         if cached.get("author_role"):
-            row["author_role"] = cached.get("author_role")
-        return row
+            changes["author_role"] = cached.get("author_role")
+        return _row_with(row, **changes)
     if not allow_fetch:
         return row
     if row.get("is_mobile_source"):
@@ -483,27 +662,73 @@ async def _fill_missing_author_code(api, board, kind, row, recommend=0, allow_fe
     if not doc:
         return row
     author, author_code = _normalize_author(doc.author, doc.author_id)
-    row["author"] = author
-    row["author_code"] = author_code
-    row["author_role"] = _normalize_author_role(getattr(doc, "author_role", None))
-    _cache_author_code(board, kind, doc_id, author, author_code, row["author_role"])
-    return row
+    author_role = _normalize_author_role(getattr(doc, "author_role", None))
+    _cache_author_code(board, kind, doc_id, author, author_code, author_role)
+    return _row_with(row, author=author, author_code=author_code, author_role=author_role)
+
+
+def _needs_author_code_fetch(row):
+    return bool(row and row.get("id") and not row.get("author_code") and not row.get("is_mobile_source"))
+
+
+async def _refresh_missing_author_code(board, kind, row, recommend):
+    async with dc_api_context() as api:
+        return await _fill_missing_author_code(api, board, kind, row, recommend=recommend)
+
+
+async def _fetch_missing_author_code(api, board, kind, row, recommend, semaphore):
+    async with semaphore:
+        flight_key = ("author_code",) + _author_code_cache_key(board, kind, row.get("id"))
+        # 같은 글을 여러 요청이 동시에 채우려 해도 upstream 조회는 한 번만 한다.
+        # shield된 조회는 마감이 지나 이 대기자가 취소돼도 끝까지 돌아 캐시를 채운다.
+        # 호출자의 api는 요청이 끝나면 닫힐 수 있으므로 조회는 자체 세션으로 돈다.
+        await single_flight(
+            flight_key,
+            lambda: _refresh_missing_author_code(board, kind, row, recommend),
+        )
+    return await _fill_missing_author_code(api, board, kind, row, recommend=recommend, allow_fetch=False)
 
 
 async def _fill_missing_author_codes(api, board, kind, rows, recommend=0):
     if not BOARD_FILL_AUTHOR_CODES:
         return rows
 
-    for row in rows:
-        await _fill_missing_author_code(api, board, kind, row, recommend=recommend, allow_fetch=False)
+    pending = []
+    for index, row in enumerate(rows):
+        rows[index] = await _fill_missing_author_code(api, board, kind, row, recommend=recommend, allow_fetch=False)
+        if _needs_author_code_fetch(rows[index]):
+            pending.append(index)
+    if not pending or BOARD_FILL_AUTHOR_CODES_CONCURRENCY <= 0 or BOARD_FILL_AUTHOR_CODES_DEADLINE_MS <= 0:
+        return rows
+
+    semaphore = asyncio.Semaphore(BOARD_FILL_AUTHOR_CODES_CONCURRENCY)
+    tasks = {
+        asyncio.ensure_future(_fetch_missing_author_code(api, board, kind, rows[index], recommend, semaphore)): index
+        for index in pending
+    }
+    done, not_done = await asyncio.wait(tasks, timeout=BOARD_FILL_AUTHOR_CODES_DEADLINE_MS / 1000)
+    # 마감을 넘긴 행은 비워 둔 채 응답하고, 이미 시작한 조회 결과는 다음 요청이 캐시에서 쓴다.
+    for task in not_done:
+        task.cancel()
+    for task in done:
+        if not task.cancelled() and task.exception() is None:
+            rows[tasks[task]] = task.result()
     return rows
 
 
-async def _read_document_with_api(api, api_id, board, kind=None, recommend=0, search_type=None, search_keyword=None, head_id=None):
-    data = {}
-    comments = []
-    images = []
-    doc = await api.document(
+def _missing_read_payload():
+    return {
+        "title": "삭제되거나 찾을 수 없는 게시글입니다.",
+        "author": "-",
+        "author_code": None,
+        "time": "-",
+        "voteup_count": 0,
+        "html": "게시글 데이터를 가져오는 데 실패했습니다.",
+    }, [], []
+
+
+async def _fetch_read_document(api, api_id, board, kind=None, recommend=0, search_type=None, search_keyword=None, head_id=None):
+    return await api.document(
         board_id=board,
         document_id=api_id,
         kind=kind,
@@ -511,16 +736,11 @@ async def _read_document_with_api(api, api_id, board, kind=None, recommend=0, se
         search_type=search_type,
         search_keyword=search_keyword,
         head_id=head_id,
+        prefetch_comments=True,
     )
-    if doc is None:
-        return {
-            "title": "삭제되거나 찾을 수 없는 게시글입니다.",
-            "author": "-",
-            "author_code": None,
-            "time": "-",
-            "voteup_count": 0,
-            "html": "게시글 데이터를 가져오는 데 실패했습니다.",
-        }, [], []
+
+
+def _read_body_from_document(doc, api_id, board, kind=None):
     author, author_code = _normalize_author(doc.author, doc.author_id)
     author_role = _normalize_author_role(getattr(doc, "author_role", None))
     _cache_author_code(board, kind, api_id, author, author_code, author_role)
@@ -535,35 +755,67 @@ async def _read_document_with_api(api, api_id, board, kind=None, recommend=0, se
         "html": doc.html,
         "related_posts": [_index_item_to_dict(item) for item in getattr(doc, "related_posts", [])],
     }
-    seen_comment_ids = set()
+    return data, [img.src for img in doc.images]
+
+
+def _comment_id(comment):
+    return str(getattr(comment, "id", "") or "").strip()
+
+
+def _embedded_comment_state(doc):
+    """본문에 딸려 온 댓글과, 댓글 API를 더 불러야 하는지 여부."""
     embedded_comments = list(getattr(doc, "embedded_comments", []) or [])
     embedded_total = _safe_int(getattr(doc, "embedded_comment_total", 0), 0)
-    for com in embedded_comments:
-        comment_id = str(getattr(com, "id", "") or "").strip()
-        if comment_id:
-            seen_comment_ids.add(comment_id)
-        comments.append(_comment_to_dict(com))
-
     should_fetch_comments = (
         not embedded_comments
         or embedded_total <= 0
         or embedded_total > len(embedded_comments)
     )
-    if should_fetch_comments:
-        async for com in doc.comments():
-            comment_id = str(getattr(com, "id", "") or "").strip()
-            if comment_id and comment_id in seen_comment_ids:
+    return _merge_comment_rows(
+        {},
+        [(_comment_id(com), _comment_to_dict(com)) for com in embedded_comments],
+    ), should_fetch_comments
+
+
+async def _collect_comment_rows(comments, fresh):
+    """댓글을 (id, dict)로 fresh에 모은다. 요청 마감 시간에 걸리면 모은 데까지만 두고 True를 돌려준다."""
+    try:
+        async for com in comments:
+            fresh.append((_comment_id(com), _comment_to_dict(com)))
+    except DeadlineExceeded:
+        return True
+    return False
+
+
+def _with_truncation_flag(data, state):
+    if not state.get("truncated"):
+        return data
+    # 본문 캐시에 든 dict를 건드리지 않도록 복사해서 표시한다.
+    return dict(data, comments_truncated=True)
+
+
+def _merge_comment_rows(state, fresh):
+    """id 기준으로 댓글을 합친다. 이미 있는 id는 제자리에서 새 값으로 바꾸고 새 id는 뒤에 붙인다."""
+    ids = list((state or {}).get("ids") or [])
+    rows = list((state or {}).get("comments") or [])
+    positions = {comment_id: index for index, comment_id in enumerate(ids) if comment_id}
+    for comment_id, row in fresh:
+        if comment_id:
+            index = positions.get(comment_id)
+            if index is not None:
+                rows[index] = row
                 continue
-            if comment_id:
-                seen_comment_ids.add(comment_id)
-            comments.append(_comment_to_dict(com))
-    for img in doc.images:
-        images.append(img.src)
-    return data, comments, images
+            positions[comment_id] = len(rows)
+        elif row in rows:
+            continue
+        ids.append(comment_id)
+        rows.append(row)
+    return {"ids": ids, "comments": rows, "last_page": (state or {}).get("last_page")}
 
 
-async def async_read(api_id, board, kind=None, recommend=0, search_type=None, search_keyword=None, head_id=None):
-    cache_key = _read_cache_key(
+async def _read_document_with_api(api, api_id, board, kind=None, recommend=0, search_type=None, search_keyword=None, head_id=None):
+    doc = await _fetch_read_document(
+        api,
         api_id,
         board,
         kind=kind,
@@ -572,13 +824,73 @@ async def async_read(api_id, board, kind=None, recommend=0, search_type=None, se
         search_keyword=search_keyword,
         head_id=head_id,
     )
-    if READ_CACHE_TTL > 0:
-        cached = _cache_get(_READ_CACHE, _READ_CACHE_LOCK, cache_key)
-        if cached is not None:
-            return _copy_read_payload(cached)
+    if doc is None:
+        return _missing_read_payload()
+    data, images = _read_body_from_document(doc, api_id, board, kind=kind)
+    comment_state, should_fetch_comments = _embedded_comment_state(doc)
+    if should_fetch_comments:
+        fresh = []
+        truncated = await _collect_comment_rows(doc.comments(), fresh)
+        comment_state = _merge_comment_rows(comment_state, fresh)
+        comment_state["truncated"] = truncated
+    return _with_truncation_flag(data, comment_state), comment_state["comments"], images
 
-    async with dc_api_context() as api:
-        payload = await _read_document_with_api(
+
+async def _fetch_mobile_comment_state(api, api_id, board, state, start_page=1, first_page=None):
+    pagination = {}
+    fresh = []
+    # 본문과 함께 받아 둔 첫 페이지가 있을 때만 넘긴다.
+    prefetched = {"first_page": first_page} if first_page is not None else {}
+    truncated = await _collect_comment_rows(
+        api.mobile_comments(board, api_id, start_page=start_page, pagination_collector=pagination, **prefetched),
+        fresh,
+    )
+    merged = _merge_comment_rows(state, fresh)
+    merged["last_page"] = pagination.get("last_page") or merged.get("last_page")
+    merged["truncated"] = truncated
+    return merged
+
+
+async def _fetch_full_comment_state(api, api_id, board, state, kind=None, doc=None):
+    try:
+        return await _fetch_mobile_comment_state(
+            api,
+            api_id,
+            board,
+            state,
+            first_page=getattr(doc, "first_comment_page", None),
+        )
+    except Exception:
+        pass
+    # 모바일 댓글이 막히면 기존 경로(PC 폴백 포함)로 전부 다시 읽는다. 페이지 정보는 없다.
+    comments = doc.comments() if doc is not None else api.comments(board, api_id, kind=kind)
+    fresh = []
+    truncated = await _collect_comment_rows(comments, fresh)
+    merged = _merge_comment_rows(state, fresh)
+    merged["last_page"] = None
+    merged["truncated"] = truncated
+    return merged
+
+
+async def _refresh_comment_state(api, api_id, board, state, kind=None):
+    last_page = _safe_int((state or {}).get("last_page"), 0)
+    if last_page > 0:
+        try:
+            return await _fetch_mobile_comment_state(api, api_id, board, state, start_page=last_page)
+        except Exception:
+            pass
+    return await _fetch_full_comment_state(api, api_id, board, {}, kind=kind)
+
+
+async def _read_with_body_cache(api, cache_key, api_id, board, kind=None, recommend=0, search_type=None, search_keyword=None, head_id=None):
+    """본문은 길게 캐시하고 댓글은 마지막 모바일 댓글 페이지부터만 다시 읽어 합친다."""
+    body = _cache_get(_READ_BODY_CACHE, _READ_BODY_CACHE_LOCK, cache_key)
+    if body is not None:
+        data, images = body
+        state = _cache_get(_READ_COMMENTS_CACHE, _READ_COMMENTS_CACHE_LOCK, cache_key)
+        state = await _refresh_comment_state(api, api_id, board, state, kind=kind)
+    else:
+        doc = await _fetch_read_document(
             api,
             api_id,
             board,
@@ -588,6 +900,51 @@ async def async_read(api_id, board, kind=None, recommend=0, search_type=None, se
             search_keyword=search_keyword,
             head_id=head_id,
         )
+        if doc is None:
+            return _missing_read_payload()
+        data, images = _read_body_from_document(doc, api_id, board, kind=kind)
+        state, should_fetch_comments = _embedded_comment_state(doc)
+        if not should_fetch_comments:
+            state["last_page"] = 1 if getattr(doc, "is_mobile_source", False) else None
+        elif getattr(doc, "is_mobile_source", False):
+            state = await _fetch_full_comment_state(api, api_id, board, state, kind=kind, doc=doc)
+        else:
+            fresh = []
+            truncated = await _collect_comment_rows(doc.comments(), fresh)
+            state = _merge_comment_rows(state, fresh)
+            state["truncated"] = truncated
+        _cache_set(
+            _READ_BODY_CACHE,
+            _READ_BODY_CACHE_LOCK,
+            cache_key,
+            (data, images),
+            READ_BODY_CACHE_TTL,
+            READ_CACHE_MAX_ITEMS,
+        )
+    _cache_set(
+        _READ_COMMENTS_CACHE,
+        _READ_COMMENTS_CACHE_LOCK,
+        cache_key,
+        state,
+        READ_BODY_CACHE_TTL,
+        READ_CACHE_MAX_ITEMS,
+    )
+    return _with_truncation_flag(data, state), state["comments"], images
+
+
+async def _load_read_payload(cache_key, api_id, board, kind=None, recommend=0, search_type=None, search_keyword=None, head_id=None):
+    read_kwargs = {
+        "kind": kind,
+        "recommend": recommend,
+        "search_type": search_type,
+        "search_keyword": search_keyword,
+        "head_id": head_id,
+    }
+    async with dc_api_context() as api:
+        if READ_BODY_CACHE_TTL > 0:
+            payload = await _read_with_body_cache(api, cache_key, api_id, board, **read_kwargs)
+        else:
+            payload = await _read_document_with_api(api, api_id, board, **read_kwargs)
     if READ_CACHE_TTL > 0 and _is_read_payload_cacheable(payload):
         _cache_set(
             _READ_CACHE,
@@ -600,6 +957,88 @@ async def async_read(api_id, board, kind=None, recommend=0, search_type=None, se
     return payload
 
 
+async def async_read(api_id, board, kind=None, recommend=0, search_type=None, search_keyword=None, head_id=None):
+    cache_key = _read_cache_key(
+        api_id,
+        board,
+        kind=kind,
+        recommend=recommend,
+        search_type=search_type,
+        search_keyword=search_keyword,
+        head_id=head_id,
+    )
+    if READ_CACHE_TTL > 0:
+        cached = _cache_get(_READ_CACHE, _READ_CACHE_LOCK, cache_key)
+        if cached is not None:
+            return _copy_read_payload(cached)
+
+    # READ_CACHE_TTL=0이어도 동시에 들어온 같은 글 요청은 upstream 조회 한 번을 공유한다.
+    payload = await single_flight(
+        ("read",) + cache_key,
+        lambda: _load_read_payload(
+            cache_key,
+            api_id,
+            board,
+            kind=kind,
+            recommend=recommend,
+            search_type=search_type,
+            search_keyword=search_keyword,
+            head_id=head_id,
+        ),
+    )
+    return _copy_read_payload(payload)
+
+
+async def _load_board_index(
+    cache_key,
+    page,
+    board,
+    recommend,
+    fetch_num,
+    kind=None,
+    document_id_upper_limit=None,
+    document_id_lower_limit=None,
+    scan_limit=None,
+    search_type=None,
+    search_keyword=None,
+    head_id=None,
+):
+    data = []
+    headtexts = []
+    pagination = {}
+    board_kwargs = {"prefer_pc": True} if BOARD_PREFER_PC else {}
+    async with dc_api_context() as api:
+        async for item in api.board(
+            board_id=board,
+            num=fetch_num,
+            start_page=page,
+            recommend=recommend,
+            kind=kind,
+            document_id_upper_limit=document_id_upper_limit,
+            document_id_lower_limit=document_id_lower_limit,
+            max_scan_pages=scan_limit,
+            search_type=search_type,
+            search_keyword=search_keyword,
+            head_id=head_id,
+            headtexts_collector=headtexts,
+            pagination_collector=pagination,
+            **board_kwargs,
+        ):
+            data.append(_index_item_to_dict(item))
+        await _fill_missing_author_codes(api, board, kind, data, recommend=recommend)
+        categories = _normalize_head_categories(headtexts, head_id=head_id)
+    if data or categories:
+        _cache_set(
+            _BOARD_INDEX_CACHE,
+            _BOARD_INDEX_CACHE_LOCK,
+            cache_key,
+            (_copy_rows(data), _copy_categories(categories), _copy_pagination(pagination), time.time()),
+            _board_cache_ttl(),
+            BOARD_INDEX_CACHE_MAX_ITEMS,
+        )
+    return data, categories, pagination
+
+
 async def async_index_with_head_categories(
     page,
     board,
@@ -647,52 +1086,47 @@ async def async_index_with_head_categories(
         search_keyword=search_keyword,
         head_id=head_id,
     )
+    def load():
+        return _load_board_index(
+            cache_key,
+            page,
+            board,
+            recommend,
+            fetch_num,
+            kind=kind,
+            document_id_upper_limit=document_id_upper_limit,
+            document_id_lower_limit=document_id_lower_limit,
+            scan_limit=scan_limit,
+            search_type=search_type,
+            search_keyword=search_keyword,
+            head_id=head_id,
+        )
+
     if not force_refresh:
         cached = _cache_get(_BOARD_INDEX_CACHE, _BOARD_INDEX_CACHE_LOCK, cache_key)
         if cached is not None:
-            if len(cached) >= 3:
-                rows, categories, pagination = cached[:3]
+            stored_at = None
+            if len(cached) >= 4:
+                rows, categories, pagination, stored_at = cached[:4]
+            elif len(cached) == 3:
+                rows, categories, pagination = cached
             else:
                 rows, categories = cached
                 pagination = {}
+            age = _board_cache_age(stored_at)
+            # upstream 차단기가 열려 있거나 요청이 넘쳐 캐시로만 답하는 중이면 갱신을 미루고 오래된 목록을 그대로 보여 준다.
+            if _is_board_cache_stale(age) and not circuit_open() and upstream_allowed():
+                schedule_single_flight(("board_index",) + cache_key, lambda: run_with_priority(PRIORITY_BACKGROUND, load))
             if pagination_collector is not None:
                 pagination_collector.update(_copy_pagination(pagination))
+                if BOARD_STALE_TTL > 0 and age is not None:
+                    pagination_collector["cache_age"] = int(age)
             return _copy_rows(rows), _copy_categories(categories)
 
-    data = []
-    headtexts = []
-    pagination = {}
-    async with dc_api_context() as api:
-        async for item in api.board(
-            board_id=board,
-            num=fetch_num,
-            start_page=page,
-            recommend=recommend,
-            kind=kind,
-            document_id_upper_limit=document_id_upper_limit,
-            document_id_lower_limit=document_id_lower_limit,
-            max_scan_pages=scan_limit,
-            search_type=search_type,
-            search_keyword=search_keyword,
-            head_id=head_id,
-            headtexts_collector=headtexts,
-            pagination_collector=pagination,
-        ):
-            data.append(_index_item_to_dict(item))
-        await _fill_missing_author_codes(api, board, kind, data, recommend=recommend)
-        categories = _normalize_head_categories(headtexts, head_id=head_id)
-    if data or categories:
-        _cache_set(
-            _BOARD_INDEX_CACHE,
-            _BOARD_INDEX_CACHE_LOCK,
-            cache_key,
-            (_copy_rows(data), _copy_categories(categories), _copy_pagination(pagination)),
-            BOARD_PAGE_CACHE_TTL,
-            BOARD_INDEX_CACHE_MAX_ITEMS,
-        )
+    rows, categories, pagination = await single_flight(("board_index",) + cache_key, load)
     if pagination_collector is not None:
         pagination_collector.update(_copy_pagination(pagination))
-    return data, categories
+    return _copy_rows(rows), _copy_categories(categories)
 
 
 async def _related_after_position_with_api(
@@ -810,7 +1244,24 @@ async def _related_after_position_with_api(
     found_posts = []
 
     attempted_candidate_pages = set()
-    candidate_pages = [source_page_value] if source_page_value > 0 else []
+    candidate_pages = []
+    if not recommend_value:
+        index_key = _page_id_index_key(
+            _board_page_cache_key(
+                1,
+                board,
+                recommend_value,
+                kind=kind,
+                search_type=search_type_value,
+                search_keyword=search_keyword_value,
+                head_id=head_id_value or None,
+            )
+        )
+        indexed_page = _estimate_page_from_index(index_key, target_id)
+        if indexed_page:
+            candidate_pages.append(indexed_page)
+    if source_page_value > 0 and source_page_value not in candidate_pages:
+        candidate_pages.append(source_page_value)
     for candidate_page in candidate_pages:
         attempted_candidate_pages.add(candidate_page)
         found_page, found_index, found_posts = await find_target_from_page(candidate_page)
@@ -885,6 +1336,21 @@ async def _related_after_position_with_api(
     return related[:fetch_limit], len(related) > fetch_limit
 
 
+async def async_prefetch_board_page(page, board, recommend, kind=None, search_type=None, search_keyword=None, head_id=None):
+    """관련 글 탐색이 처음 읽을 board page cache를 미리 채운다."""
+    async with dc_api_context() as api:
+        return await _fetch_board_page(
+            api,
+            page,
+            board,
+            recommend,
+            kind=kind,
+            search_type=search_type,
+            search_keyword=search_keyword,
+            head_id=head_id,
+        )
+
+
 async def async_related_after_position(
     api_id,
     after_id,
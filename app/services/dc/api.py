@@ -1,17 +1,23 @@
+import asyncio
+import functools
 import json
 import logging
+import os
 import re
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import parse_qs, parse_qsl, urlencode, urljoin, urlparse
 
 import aiohttp
 import lxml.html
 
+from app.services.cache_utils import INSTANCE_DIR, SQLiteCacheBackend, TTLCache
 from app.services.cache_utils import cache_delete as _shared_cache_delete
 from app.services.cache_utils import cache_get as _shared_cache_get
-from app.services.cache_utils import cache_prune as _shared_cache_prune
 from app.services.cache_utils import cache_set_after_insert
-from app.services.cache_utils import env_int
+from app.services.cache_utils import env_int, register_shared_cache
+from app.services.standin import standin_url
 
 logger = logging.getLogger(__name__)
 
@@ -32,12 +38,8 @@ def cache_get(cache, lock, key):
     return _shared_cache_get(cache, lock, key)
 
 
-def cache_prune(cache, now, max_items):
-    _shared_cache_prune(cache, now, max_items)
-
-
 def cache_set(cache, lock, key, value, ttl, max_items):
-    cache_set_after_insert(cache, lock, key, value, ttl, max_items, prune_func=cache_prune)
+    cache_set_after_insert(cache, lock, key, value, ttl, max_items)
 
 
 def cache_delete(cache, lock, key):
@@ -50,7 +52,25 @@ BOARD_TIME_LOOKAHEAD_PAGES = 1
 HTTP_TIMEOUT = env_int("MIRROR_HTTP_TIMEOUT", 20)
 BOARD_KIND_CACHE_TTL = max(env_int("MIRROR_BOARD_KIND_CACHE_TTL", 21600), 0)
 BOARD_KIND_CACHE_MAX_ITEMS = 2048
+# 게시판별로 성공한 목록 URL 패턴과 갤러리 종류를 재시작 후에도 쓰도록 파일에 남긴다. 빈 값이면 끈다.
+BOARD_KIND_STORE_PATH = os.getenv(
+    "MIRROR_BOARD_KIND_STORE_PATH",
+    os.path.join(INSTANCE_DIR, "board_kind_cache.sqlite3"),
+).strip()
+# 파싱한 PC 목록 페이지를 board()와 board_precise_times가 함께 쓰도록 잠깐 보관한다.
+PC_LIST_CACHE_TTL = max(env_int("MIRROR_PC_LIST_CACHE_TTL", 10), 0)
+PC_LIST_CACHE_MAX_ITEMS = 256
 DC_CONN_LIMIT = max(env_int("MIRROR_DC_CONN_LIMIT", 20), 1)
+# 0보다 크면 후보 URL 응답이 이 시간(ms) 안에 오지 않을 때 다음 후보를 함께 요청한다.
+FETCH_HEDGE_DELAY_MS = max(env_int("MIRROR_DC_HEDGE_DELAY_MS", 0), 0)
+FETCH_HEDGE_MAX_INFLIGHT = max(env_int("MIRROR_DC_HEDGE_MAX_INFLIGHT", 2), 1)
+# 목록 페이지는 페이지 이동 영역까지만 트리를 만든다. 0이면 항상 전체를 파싱한다.
+LIST_STREAM_PARSE = env_int("MIRROR_DC_STREAM_LIST_PARSE", 1) > 0
+# 첫 댓글 페이지에서 전체 페이지 수를 알면 나머지 페이지를 이만큼 동시에 받는다.
+COMMENT_PAGE_CONCURRENCY = max(env_int("MIRROR_DC_COMMENT_PAGE_CONCURRENCY", 4), 1)
+# HTML 파싱과 목록 행 추출을 이 개수의 스레드에서 돌려 이벤트 루프가 다른 요청의 I/O를 계속 처리하게 한다.
+# lxml은 파싱하는 동안 GIL을 놓는다. 0이면 루프에서 바로 파싱한다.
+PARSE_WORKERS = max(env_int("MIRROR_DC_PARSE_WORKERS", 2), 0)
 DC_DNS_CACHE_TTL = max(env_int("MIRROR_DC_DNS_CACHE_TTL", 60), 0)
 DC_SESSION_COOKIE_ALLOWLIST = frozenset({"_ga", "ci_c"})
 MOBILE_USER_AGENT = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
@@ -74,12 +94,52 @@ GALLERY_POSTS_COOKIES = {
     "list_count": str(DOCS_PER_PAGE),
 }
 
-_BOARD_KIND_CACHE = {}
+_BOARD_KIND_CACHE = TTLCache(BOARD_KIND_CACHE_MAX_ITEMS)
 _BOARD_KIND_CACHE_LOCK = threading.Lock()
+_GALLERY_KIND_CACHE = TTLCache(BOARD_KIND_CACHE_MAX_ITEMS)
+_GALLERY_KIND_CACHE_LOCK = threading.Lock()
+if BOARD_KIND_STORE_PATH:
+    _BOARD_KIND_STORE = SQLiteCacheBackend(path=BOARD_KIND_STORE_PATH, name="board_kind_store")
+else:
+    # 파일 저장을 끄면 MIRROR_CACHE_BACKEND 설정을 따른다.
+    _BOARD_KIND_STORE = None
+register_shared_cache(_BOARD_KIND_CACHE, "board_kind", backend=_BOARD_KIND_STORE)
+register_shared_cache(_GALLERY_KIND_CACHE, "gallery_kind", backend=_BOARD_KIND_STORE)
+# DocumentIndex는 API 메서드를 잡은 lambda를 들고 있어 pickle할 수 없으므로 워커 로컬로 둔다.
+_PC_LIST_CACHE = TTLCache(PC_LIST_CACHE_MAX_ITEMS)
+_PC_LIST_CACHE_LOCK = threading.Lock()
+_RATE_LIMIT_STATE = {"last_at": 0.0, "count": 0}
+_RATE_LIMIT_STATE_LOCK = threading.Lock()
+
+
+_PARSE_EXECUTOR = (
+    ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="mirror-dc-parse") if PARSE_WORKERS else None
+)
+
+
+async def run_parse(func, *args, **kwargs):
+    """CPU를 쓰는 파싱을 파싱 스레드에서 돌리고 결과를 기다린다. 스레드를 끄면 그 자리에서 부른다."""
+    if _PARSE_EXECUTOR is None:
+        return func(*args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_PARSE_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+
+def _mark_rate_limited():
+    with _RATE_LIMIT_STATE_LOCK:
+        _RATE_LIMIT_STATE["last_at"] = time.time()
+        _RATE_LIMIT_STATE["count"] += 1
+
+
+def last_rate_limited_at():
+    """이 워커가 마지막으로 upstream rate limit 응답을 받은 시각. 없으면 0."""
+    with _RATE_LIMIT_STATE_LOCK:
+        return _RATE_LIMIT_STATE["last_at"]
 
 
+from .deadline import DeadlineExceeded, deadline_timeout, remaining_time
+from .limiter import host_limiter
 from .models import Comment, Document, DocumentIndex, Image
-from .parsers import ParserMixin, has_gallery_image_icon, has_gallery_video_icon, to_int
+from .parsers import ParserMixin, has_gallery_image_icon, has_gallery_video_icon, parse_list_page, to_int, xpath
 
 
 class API(ParserMixin):
@@ -222,6 +282,41 @@ class API(ParserMixin):
     def __invalidate_list_url_pattern(self, cache_key):
         cache_delete(_BOARD_KIND_CACHE, _BOARD_KIND_CACHE_LOCK, cache_key)
 
+    def __gallery_kind_from_url(self, url):
+        parsed = urlparse(url or "")
+        host = (parsed.netloc or "").lower()
+        path = parsed.path or ""
+        if host == "m.dcinside.com":
+            return "mini" if path.startswith("/mini/") else None
+        if host != "gall.dcinside.com":
+            return None
+        for prefix, kind in (("/mgallery/", "minor"), ("/mini/", "mini"), ("/person/", "person"), ("/board/", "normal")):
+            if path.startswith(prefix):
+                return kind
+        return None
+
+    def __known_gallery_kind(self, board_id, kind=None):
+        kind = (kind or "").lower()
+        if kind or not board_id:
+            return kind
+        return cache_get(_GALLERY_KIND_CACHE, _GALLERY_KIND_CACHE_LOCK, board_id) or ""
+
+    def __remember_gallery_kind(self, board_id, used_url):
+        kind = self.__gallery_kind_from_url(used_url)
+        if not kind or not board_id:
+            return
+        # 파일 저장소 쓰기를 줄이려고 바뀐 경우에만 기록한다.
+        if cache_get(_GALLERY_KIND_CACHE, _GALLERY_KIND_CACHE_LOCK, board_id) == kind:
+            return
+        cache_set(
+            _GALLERY_KIND_CACHE,
+            _GALLERY_KIND_CACHE_LOCK,
+            board_id,
+            kind,
+            BOARD_KIND_CACHE_TTL,
+            BOARD_KIND_CACHE_MAX_ITEMS,
+        )
+
     def __prepare_headers(self, url, headers=None):
         prepared = dict(headers or {})
         host = (urlparse(url).netloc or "").lower()
@@ -252,11 +347,12 @@ class API(ParserMixin):
         }
 
         if self.__is_mobile_request(used_url):
-            containers = parsed.xpath("//*[@id='pagination_div']")
+            containers = xpath(parsed, "//*[@id='pagination_div']")
             if len(containers) != 1:
                 return unknown
             container = containers[0]
-            strong_nodes = container.xpath(
+            strong_nodes = xpath(
+                container,
                 ".//*[contains(concat(' ', normalize-space(@class), ' '), ' paging-inner ')]//strong"
             )
             current_pages = []
@@ -270,7 +366,7 @@ class API(ParserMixin):
             current_page = current_pages[0]
             linked_pages = []
             has_cursor_link = False
-            for href in container.xpath(".//a[@href]/@href"):
+            for href in xpath(container, ".//a[@href]/@href"):
                 page = self.__positive_page_from_url(href)
                 if page is not None:
                     linked_pages.append(page)
@@ -291,11 +387,12 @@ class API(ParserMixin):
             }
 
         candidates = []
-        containers = parsed.xpath(
+        containers = xpath(
+            parsed,
             "//*[contains(concat(' ', normalize-space(@class), ' '), ' bottom_paging_box ')]"
         )
         for container in containers:
-            em_nodes = container.xpath("./em")
+            em_nodes = xpath(container, "./em")
             if len(em_nodes) != 1:
                 continue
             current_text = self.__compact_text(em_nodes[0])
@@ -307,7 +404,7 @@ class API(ParserMixin):
 
             direct_links = []
             has_ajax_widget_links = False
-            for link in container.xpath("./a"):
+            for link in xpath(container, "./a"):
                 href = (link.get("href") or "").strip()
                 lower_href = href.lower()
                 if lower_href.startswith("javascript:") and "ajax_list_search" in lower_href:
@@ -412,22 +509,39 @@ class API(ParserMixin):
 
     async def __request_text(self, method, url, headers=None, data=None, cookies=None):
         request_headers = self.__prepare_headers(url, headers)
-
-        async with self.session.request(
-            method,
-            url,
-            headers=request_headers,
-            data=data,
-            cookies=cookies,
-        ) as res:
-            text = await res.text()
-            status = res.status
-            response_headers = dict(res.headers)
+        deadline_timeout(HTTP_TIMEOUT)
+        limiter = host_limiter(urlparse(url).netloc)
+        probe = await limiter.acquire()
+        rate_limited = None
+        try:
+            # 요청 마감이 HTTP_TIMEOUT보다 가까우면 남은 시간만큼만 기다린다.
+            timeout = deadline_timeout(HTTP_TIMEOUT)
+            request_options = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout < HTTP_TIMEOUT else {}
+            try:
+                async with self.session.request(
+                    method,
+                    standin_url(url),
+                    headers=request_headers,
+                    data=data,
+                    cookies=cookies,
+                    **request_options,
+                ) as res:
+                    text = await res.text()
+                    status = res.status
+                    response_headers = dict(res.headers)
+            except asyncio.TimeoutError as exc:
+                if request_options and (remaining_time() or 0) <= 0:
+                    raise DeadlineExceeded("request deadline exceeded") from exc
+                raise
+            rate_limited = self.__is_rate_limited_response(status, text[:1000])
+        finally:
+            limiter.finish(probe=probe, rate_limited=rate_limited)
 
         self.__prune_session_cookies()
 
-        if self.__is_rate_limited_response(status, text[:1000]):
+        if rate_limited:
             logger.warning("rate limited: status=%s url=%s", status, url)
+            _mark_rate_limited()
             raise RuntimeError(f"rate limited: {status}")
 
         return status, response_headers, text
@@ -459,7 +573,7 @@ class API(ParserMixin):
         return url + separator + urlencode({"list_num": BOARD_LIST_PAGE_SIZE})
 
     def __build_list_urls(self, board_id, page, recommend=False, kind=None, search_type=None, search_keyword=None, head_id=None):
-        kind = (kind or "").lower()
+        kind = self.__known_gallery_kind(board_id, kind)
         urls = []
         mobile_recommend_suffix = "&recommend=1" if recommend else ""
         pc_recommend_suffix = "&exception_mode=recommend" if recommend else ""
@@ -569,7 +683,7 @@ class API(ParserMixin):
         return ("&" + urlencode(params)) if params else ""
 
     def __build_view_urls(self, board_id, document_id, kind=None, recommend=False, search_type=None, search_keyword=None, head_id=None):
-        kind = (kind or "").lower()
+        kind = self.__known_gallery_kind(board_id, kind)
         urls = []
         mobile_suffix = self.__build_mobile_view_suffix(recommend, search_type, search_keyword, head_id=head_id)
         pc_suffix = self.__build_pc_view_suffix(recommend, search_type, search_keyword, head_id=head_id)
@@ -597,7 +711,7 @@ class API(ParserMixin):
         return self.__dedupe_urls(urls)
 
     def __build_pc_view_urls(self, board_id, document_id, kind=None):
-        kind = (kind or "").lower()
+        kind = self.__known_gallery_kind(board_id, kind)
         urls = []
         kind_urls = {
             "normal": "https://gall.dcinside.com/board/view/?id={}&no={}".format(board_id, document_id),
@@ -615,7 +729,31 @@ class API(ParserMixin):
         ])
         return self.__dedupe_urls(urls)
 
+    async def __fetch_candidate(self, url, validator=None):
+        """후보 URL 하나를 받아 (parsed, text, redirect_url)을 돌려준다. 쓸 수 없으면 parsed는 None."""
+        status, _, text = await self.__request_text("GET", url)
+        if status >= 400:
+            return None, text, None
+        if not text:
+            return None, text, None
+        return await run_parse(self.__parse_candidate, url, text, validator)
+
+    def __parse_candidate(self, url, text, validator=None):
+        redirect_url = self.__extract_top_level_redirect_url(text)
+        if redirect_url:
+            return None, text, self.__normalize_redirect_url(url, redirect_url)
+        if LIST_STREAM_PARSE and validator == self.__board_page_validator:
+            parsed = parse_list_page(text)
+        else:
+            parsed = lxml.html.fromstring(text)
+        if validator and not validator(parsed, text, url):
+            return None, text, None
+        return parsed, text, None
+
     async def __fetch_parsed_from_urls(self, urls, validator=None):
+        if FETCH_HEDGE_DELAY_MS > 0 and FETCH_HEDGE_MAX_INFLIGHT > 1 and len(urls) > 1:
+            return await self.__fetch_parsed_hedged(urls, validator=validator)
+
         queue = list(urls)
         idx = 0
         while idx < len(queue):
@@ -623,26 +761,63 @@ class API(ParserMixin):
             idx += 1
 
             try:
-                status, _, text = await self.__request_text("GET", url)
-                if status >= 400:
-                    continue
-                if not text:
-                    continue
-
-                redirect_url = self.__extract_top_level_redirect_url(text)
-                if redirect_url:
-                    redirect_url = self.__normalize_redirect_url(url, redirect_url)
-                    if redirect_url and redirect_url not in queue:
-                        queue.append(redirect_url)
-                    continue
-                parsed = lxml.html.fromstring(text)
-                if validator and not validator(parsed, text, url):
-                    continue
-                return parsed, text, url
+                parsed, text, redirect_url = await self.__fetch_candidate(url, validator=validator)
+            except DeadlineExceeded:
+                break
             except Exception:
                 continue
+            if redirect_url:
+                if redirect_url not in queue:
+                    queue.append(redirect_url)
+                continue
+            if parsed is not None:
+                return parsed, text, url
         return None, "", None
 
+    async def __fetch_parsed_hedged(self, urls, validator=None):
+        """후보를 순서대로 시작하되, 앞 후보가 늦거나 실패하면 다음 후보를 겹쳐 요청한다.
+
+        동시에 도는 요청은 FETCH_HEDGE_MAX_INFLIGHT개로 묶고, 먼저 validator를 통과한
+        응답을 쓰며 나머지는 취소한다. 같은 차례에 끝난 응답은 앞 후보를 우선한다.
+        """
+        queue = list(urls)
+        idx = 0
+        inflight = {}
+        hedge_delay = FETCH_HEDGE_DELAY_MS / 1000
+        try:
+            while idx < len(queue) or inflight:
+                if idx < len(queue) and len(inflight) < FETCH_HEDGE_MAX_INFLIGHT:
+                    url = queue[idx]
+                    idx += 1
+                    inflight[asyncio.ensure_future(self.__fetch_candidate(url, validator=validator))] = url
+                can_hedge = idx < len(queue) and len(inflight) < FETCH_HEDGE_MAX_INFLIGHT
+                done, _ = await asyncio.wait(
+                    inflight,
+                    timeout=hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in sorted(done, key=lambda item: queue.index(inflight[item])):
+                    url = inflight.pop(task)
+                    if task.cancelled():
+                        continue
+                    if isinstance(task.exception(), DeadlineExceeded):
+                        return None, "", None
+                    if task.exception() is not None:
+                        continue
+                    parsed, text, redirect_url = task.result()
+                    if redirect_url:
+                        if redirect_url not in queue:
+                            queue.append(redirect_url)
+                        continue
+                    if parsed is not None:
+                        return parsed, text, url
+            return None, "", None
+        finally:
+            for task in inflight:
+                task.cancel()
+            if inflight:
+                await asyncio.gather(*inflight, return_exceptions=True)
+
     def __normalize_redirect_url(self, current_url, redirect_url):
         normalized_url = urljoin(current_url, redirect_url)
         current_parsed = urlparse(current_url)
@@ -692,22 +867,67 @@ class API(ParserMixin):
         if preserved_head_id is not None and not head_added:
             query_items.append((target_head_key, preserved_head_id))
         return parsed._replace(query=urlencode(query_items)).geturl()
-    async def board(self, board_id, num=-1, start_page=1, recommend=False, document_id_upper_limit=None, document_id_lower_limit=None, is_minor=False, kind=None, max_scan_pages=None, search_type=None, search_keyword=None, head_id=None, headtexts_collector=None, pagination_collector=None):
-        page = start_page
-        scanned_pages = 0
-        if pagination_collector is not None:
-            pagination_collector.clear()
-        if headtexts_collector is not None:
-            headtexts_collector[:] = []
+
+    def __parse_board_rows(self, parsed, board_id, kind=None, recommend=False, is_mobile_source=False):
+        mobile_rows = [
+            row
+            for row in xpath(parsed, "//ul[contains(@class, 'gall-detail-lst')]/li")
+            if not row.get("class", "").startswith("ad")
+        ]
+        if mobile_rows:
+            items = (
+                self.__parse_mobile_list_item(
+                    row,
+                    board_id,
+                    kind=kind,
+                    is_mobile_source=is_mobile_source,
+                    recommend=recommend,
+                )
+                for row in mobile_rows
+            )
         else:
-            self.last_board_headtexts = []
-        headtexts_captured = False
-        upper_limit = to_optional_int(document_id_upper_limit)
-        lower_limit = to_optional_int(document_id_lower_limit)
-        while num:
-            if max_scan_pages is not None and scanned_pages >= max_scan_pages:
-                break
-            list_urls = self.__build_list_urls(
+            items = (
+                self.__parse_pc_board_row(
+                    row,
+                    board_id,
+                    kind=kind,
+                    recommend=recommend,
+                    is_mobile_source=is_mobile_source,
+                )
+                for row in xpath(parsed, "//tr[contains(@class, 'ub-content') and contains(@class, 'us-post')]")
+            )
+        return [item for item in items if item is not None]
+
+    def __pc_list_cache_key(self, board_id, page, recommend=False, kind=None, search_type=None, search_keyword=None, head_id=None):
+        keyword = (search_keyword or "").strip()
+        return (
+            board_id,
+            (kind or "").lower(),
+            page,
+            bool(recommend),
+            self.__normalize_search_type(search_type) if keyword else "",
+            keyword,
+            self.__normalize_head_id(head_id) or "",
+        )
+
+    async def __fetch_pc_list_page(self, board_id, page, recommend=False, kind=None, search_type=None, search_keyword=None, head_id=None):
+        """PC 목록 한 페이지를 파싱해 돌려준다. 정확한 작성 시각이 있는 PC 행을 짧게 캐시한다."""
+        cache_key = self.__pc_list_cache_key(
+            board_id,
+            page,
+            recommend=recommend,
+            kind=kind,
+            search_type=search_type,
+            search_keyword=search_keyword,
+            head_id=head_id,
+        )
+        cached = cache_get(_PC_LIST_CACHE, _PC_LIST_CACHE_LOCK, cache_key)
+        if cached is not None:
+            return cached
+
+        list_urls = [
+            self.__with_pc_list_page_size(url)
+            for url in self.__build_list_urls(
                 board_id,
                 page,
                 recommend=recommend,
@@ -716,105 +936,144 @@ class API(ParserMixin):
                 search_keyword=search_keyword,
                 head_id=head_id,
             )
-            cache_key = self.__board_kind_cache_key(
-                board_id,
-                kind=kind,
-                recommend=recommend,
-                search_keyword=search_keyword,
+            if not self.__is_mobile_request(url)
+        ]
+        parsed, text, used_url = await self.__fetch_parsed_from_urls(
+            list_urls,
+            validator=self.__board_page_validator,
+        )
+        if parsed is None:
+            return None
+        self.__remember_gallery_kind(board_id, used_url)
+        list_page = await run_parse(self.__list_page_from_parsed, parsed, text, used_url, board_id, kind=kind, recommend=recommend)
+        if list_page["rows"] and PC_LIST_CACHE_TTL > 0:
+            cache_set(_PC_LIST_CACHE, _PC_LIST_CACHE_LOCK, cache_key, list_page, PC_LIST_CACHE_TTL, PC_LIST_CACHE_MAX_ITEMS)
+        return list_page
+
+    async def __fetch_board_list_page(self, board_id, page, recommend=False, kind=None, search_type=None, search_keyword=None, head_id=None):
+        list_urls = self.__build_list_urls(
+            board_id,
+            page,
+            recommend=recommend,
+            kind=kind,
+            search_type=search_type,
+            search_keyword=search_keyword,
+            head_id=head_id,
+        )
+        cache_key = self.__board_kind_cache_key(
+            board_id,
+            kind=kind,
+            recommend=recommend,
+            search_keyword=search_keyword,
+        )
+        cached_url, cached_pattern = self.__get_cached_list_url(list_urls, cache_key)
+        if cached_url and cached_url != list_urls[0]:
+            parsed, text, used_url = await self.__fetch_parsed_from_urls(
+                [cached_url],
+                validator=self.__board_page_validator,
             )
-            cached_url, cached_pattern = self.__get_cached_list_url(list_urls, cache_key)
-            if cached_url and cached_url != list_urls[0]:
-                parsed, text, used_url = await self.__fetch_parsed_from_urls(
-                    [cached_url],
-                    validator=self.__board_page_validator,
-                )
-                if parsed is None:
-                    self.__invalidate_list_url_pattern(cache_key)
-                    parsed, text, used_url = await self.__fetch_parsed_from_urls(
-                        list_urls,
-                        validator=self.__board_page_validator,
-                    )
-            else:
+            if parsed is None:
+                self.__invalidate_list_url_pattern(cache_key)
+                cached_pattern = None
                 parsed, text, used_url = await self.__fetch_parsed_from_urls(
                     list_urls,
                     validator=self.__board_page_validator,
                 )
-            if cached_pattern and used_url and self.__list_url_pattern(used_url) != cached_pattern:
+        else:
+            parsed, text, used_url = await self.__fetch_parsed_from_urls(
+                list_urls,
+                validator=self.__board_page_validator,
+            )
+        if used_url and self.__list_url_pattern(used_url) != cached_pattern:
+            if cached_pattern:
                 self.__invalidate_list_url_pattern(cache_key)
-            if used_url:
-                self.__cache_list_url_pattern(cache_key, used_url)
+            self.__cache_list_url_pattern(cache_key, used_url)
+        self.__remember_gallery_kind(board_id, used_url)
+        if parsed is None:
+            return None
+        return await run_parse(
+            self.__list_page_from_parsed,
+            parsed,
+            text,
+            used_url,
+            board_id,
+            kind=kind,
+            recommend=recommend,
+            is_mobile_source=self.__is_mobile_request(used_url),
+        )
+
+    def __list_page_from_parsed(self, parsed, text, used_url, board_id, kind=None, recommend=False, is_mobile_source=False):
+        return {
+            "rows": self.__parse_board_rows(
+                parsed,
+                board_id,
+                kind=kind,
+                recommend=recommend,
+                is_mobile_source=is_mobile_source,
+            ),
+            "pagination": self.__parse_board_pagination(parsed, used_url),
+            "headtexts": self.__parse_mobile_headtext_tabs(parsed),
+            "is_empty": "등록된 게시물이 없습니다." in text,
+        }
+
+    async def board(self, board_id, num=-1, start_page=1, recommend=False, document_id_upper_limit=None, document_id_lower_limit=None, is_minor=False, kind=None, max_scan_pages=None, search_type=None, search_keyword=None, head_id=None, headtexts_collector=None, pagination_collector=None, prefer_pc=False):
+        page = start_page
+        scanned_pages = 0
+        if pagination_collector is not None:
+            pagination_collector.clear()
+        if headtexts_collector is not None:
+            headtexts_collector[:] = []
+        else:
+            self.last_board_headtexts = []
+        headtexts_captured = False
+        upper_limit = to_optional_int(document_id_upper_limit)
+        lower_limit = to_optional_int(document_id_lower_limit)
+        page_kwargs = {
+            "recommend": recommend,
+            "kind": kind,
+            "search_type": search_type,
+            "search_keyword": search_keyword,
+            "head_id": head_id,
+        }
+        while num:
+            if max_scan_pages is not None and scanned_pages >= max_scan_pages:
+                break
+            list_page = None
+            if prefer_pc:
+                # PC 목록은 초 단위 작성 시각을 담고 있어 /board/times 보강 요청이 필요 없다.
+                list_page = await self.__fetch_pc_list_page(board_id, page, **page_kwargs)
+            if list_page is None:
+                list_page = await self.__fetch_board_list_page(board_id, page, **page_kwargs)
             scanned_pages += 1
-            if parsed is None:
+            if list_page is None:
                 break
-            pagination = self.__parse_board_pagination(parsed, used_url)
+            pagination = list_page["pagination"]
             if pagination_collector is not None and not pagination_collector:
                 pagination_collector.update(dict(pagination))
             if not headtexts_captured:
-                headtexts = self.__parse_mobile_headtext_tabs(parsed)
+                headtexts = list(list_page["headtexts"])
                 if headtexts_collector is not None:
                     headtexts_collector[:] = headtexts
                 else:
                     self.last_board_headtexts = headtexts
                 headtexts_captured = True
-            if "등록된 게시물이 없습니다." in text:
+            if list_page["is_empty"]:
                 break
             yielded_in_page = 0
-            is_mobile_source = self.__is_mobile_request(used_url)
-
-            mobile_rows = [
-                row
-                for row in parsed.xpath("//ul[contains(@class, 'gall-detail-lst')]/li")
-                if not row.get("class", "").startswith("ad")
-            ]
-            if mobile_rows:
-                for row in mobile_rows:
-                    indexdata = self.__parse_mobile_list_item(
-                        row,
-                        board_id,
-                        kind=kind,
-                        is_mobile_source=is_mobile_source,
-                        recommend=recommend,
-                    )
-                    if indexdata is None:
-                        continue
-                    document_id = to_optional_int(indexdata.id)
-                    if document_id is None:
-                        continue
-                    if upper_limit is not None and upper_limit <= document_id:
-                        continue
-                    if lower_limit is not None and lower_limit >= document_id:
-                        return
-
-                    yield indexdata
-                    yielded_in_page += 1
-                    num -= 1
-                    if num == 0:
-                        break
-            else:
-                rows = parsed.xpath("//tr[contains(@class, 'ub-content') and contains(@class, 'us-post')]")
-                for row in rows:
-                    indexdata = self.__parse_pc_board_row(
-                        row,
-                        board_id,
-                        kind=kind,
-                        recommend=recommend,
-                        is_mobile_source=is_mobile_source,
-                    )
-                    if indexdata is None:
-                        continue
-                    document_id = to_optional_int(indexdata.id)
-                    if document_id is None:
-                        continue
-                    if upper_limit is not None and upper_limit <= document_id:
-                        continue
-                    if lower_limit is not None and lower_limit >= document_id:
-                        return
+            for indexdata in list_page["rows"]:
+                document_id = to_optional_int(indexdata.id)
+                if document_id is None:
+                    continue
+                if upper_limit is not None and upper_limit <= document_id:
+                    continue
+                if lower_limit is not None and lower_limit >= document_id:
+                    return
 
-                    yield indexdata
-                    yielded_in_page += 1
-                    num -= 1
-                    if num == 0:
-                        break
+                yield indexdata
+                yielded_in_page += 1
+                num -= 1
+                if num == 0:
+                    break
 
             if yielded_in_page == 0:
                 break
@@ -830,37 +1089,19 @@ class API(ParserMixin):
         start_page = max(to_int(page, 1), 1)
 
         for current_page in range(start_page, start_page + page_count):
-            list_urls = [
-                self.__with_pc_list_page_size(url)
-                for url in self.__build_list_urls(
-                    board_id,
-                    current_page,
-                    recommend=recommend,
-                    kind=kind,
-                    search_type=search_type,
-                    search_keyword=search_keyword,
-                    head_id=head_id,
-                )
-                if not self.__is_mobile_request(url)
-            ]
-            parsed, _, _ = await self.__fetch_parsed_from_urls(
-                list_urls,
-                validator=self.__is_usable_board_page,
+            list_page = await self.__fetch_pc_list_page(
+                board_id,
+                current_page,
+                recommend=recommend,
+                kind=kind,
+                search_type=search_type,
+                search_keyword=search_keyword,
+                head_id=head_id,
             )
-            if parsed is None:
+            if list_page is None:
                 continue
 
-            rows = parsed.xpath("//tr[contains(@class, 'ub-content') and contains(@class, 'us-post')]")
-            for row in rows:
-                item = self.__parse_pc_board_row(
-                    row,
-                    board_id,
-                    kind=kind,
-                    recommend=recommend,
-                    is_mobile_source=False,
-                )
-                if item is None:
-                    continue
+            for item in list_page["rows"]:
                 if not getattr(item, "time_is_precise", False):
                     continue
                 item_id = str(item.id)
@@ -881,32 +1122,39 @@ class API(ParserMixin):
             if status >= 400 or not text:
                 continue
             try:
-                parsed = lxml.html.fromstring(text)
+                sources = await run_parse(self.__document_media_sources_from_page, text)
             except Exception:
                 continue
-            containers = parsed.xpath("//div[contains(@class, 'writing_view_box')]")
-            if not containers:
-                containers = parsed.xpath("//div[@class='thum-txtin']")
-            if not containers:
-                containers = parsed.xpath("//div[contains(@class, 'thum-txt-area')]")
-            if not containers:
-                continue
-            sources = self.__real_document_media_sources(containers[0])
             if sources:
                 return sources
         return []
+
+    def __document_media_sources_from_page(self, text):
+        parsed = lxml.html.fromstring(text)
+        for expr in (
+            "//div[contains(@class, 'writing_view_box')]",
+            "//div[@class='thum-txtin']",
+            "//div[contains(@class, 'thum-txt-area')]",
+        ):
+            containers = xpath(parsed, expr)
+            if containers:
+                return self.__real_document_media_sources(containers[0])
+        return []
+
     async def __repair_placeholder_images_from_pc(self, doc_content, board_id, document_id, kind=None):
         if not self.__has_placeholder_document_images(doc_content):
             return doc_content
-
         pc_media_sources = await self.__pc_document_media_sources(board_id, document_id, kind=kind)
+        return self.__apply_pc_media_sources(doc_content, pc_media_sources)
+
+    def __apply_pc_media_sources(self, doc_content, pc_media_sources):
         if not pc_media_sources:
             return doc_content
 
         mobile_images = set(self.__document_image_elements(doc_content))
         remaining_media = list(pc_media_sources)
 
-        for el in doc_content.xpath(".//img | .//video | .//source[not(ancestor::video)]"):
+        for el in xpath(doc_content, ".//img | .//video | .//source[not(ancestor::video)]"):
             tag = (getattr(el, "tag", "") or "").lower()
             if tag == "img":
                 if el not in mobile_images:
@@ -941,25 +1189,66 @@ class API(ParserMixin):
                 parent.replace(el, self.__document_video_element(replacement["src"]))
 
         return doc_content
-    async def __replace_poll_iframes(self, doc_content):
-        for iframe in list(doc_content.xpath(".//iframe[@src]")):
-            src = iframe.get("src")
-            poll_src = self.__normalize_poll_url(src)
-            if not poll_src:
-                continue
+
+    def __poll_iframes(self, doc_content):
+        polls = []
+        for iframe in xpath(doc_content, ".//iframe[@src]"):
+            poll_src = self.__normalize_poll_url(iframe.get("src"))
+            if poll_src:
+                polls.append((iframe, poll_src))
+        return polls
+
+    async def __fetch_poll_summary(self, poll_src):
+        try:
+            status, _, text = await self.__request_text("GET", self.__poll_preview_url(poll_src))
+            return self.__parse_poll_summary(text) if status < 400 else None
+        except Exception:
             try:
-                status, _, text = await self.__request_text("GET", self.__poll_preview_url(poll_src))
-                poll = self.__parse_poll_summary(text) if status < 400 else None
+                status, _, text = await self.__request_text("GET", poll_src)
+                return self.__parse_poll_summary(text) if status < 400 else None
             except Exception:
-                try:
-                    status, _, text = await self.__request_text("GET", poll_src)
-                    poll = self.__parse_poll_summary(text) if status < 400 else None
-                except Exception:
-                    poll = None
+                return None
+
+    def __apply_poll_summaries(self, polls, summaries):
+        for (iframe, poll_src), poll in zip(polls, summaries):
             iframe.getparent().replace(iframe, self.__poll_card_element(poll_src, poll=poll))
+
+    async def __replace_poll_iframes(self, doc_content):
+        polls = self.__poll_iframes(doc_content)
+        summaries = await asyncio.gather(*(self.__fetch_poll_summary(poll_src) for _, poll_src in polls))
+        self.__apply_poll_summaries(polls, summaries)
         return doc_content
 
-    async def document(self, board_id, document_id, kind=None, recommend=False, search_type=None, search_keyword=None, head_id=None):
+    @staticmethod
+    def __needs_comment_fetch(embedded_comments, embedded_comment_total):
+        return not embedded_comments or embedded_comment_total <= 0 or embedded_comment_total > len(embedded_comments)
+
+    async def __load_document_extras(self, doc_content, board_id, document_id, kind=None, repair_images=False, first_comment_page=None):
+        """PC 미디어 조회, 투표 요약, 첫 댓글 페이지를 한꺼번에 보내고 끝난 뒤 본문 트리에 합친다."""
+        polls = self.__poll_iframes(doc_content)
+        fetches = [self.__fetch_poll_summary(poll_src) for _, poll_src in polls]
+        if repair_images:
+            fetches.append(self.__pc_document_media_sources(board_id, document_id, kind=kind))
+        if first_comment_page is not None:
+            # 댓글 페이지는 결과를 Document에 넘기므로 여기서는 끝나기만 기다린다.
+            fetches.append(asyncio.wait({first_comment_page}))
+        try:
+            results = await asyncio.gather(*fetches)
+        except BaseException:
+            if first_comment_page is not None:
+                first_comment_page.cancel()
+            raise
+        if repair_images:
+            doc_content = self.__apply_pc_media_sources(doc_content, results[len(polls)])
+        self.__apply_poll_summaries(polls, results[:len(polls)])
+        return doc_content
+
+    async def document(self, board_id, document_id, kind=None, recommend=False, search_type=None, search_keyword=None, head_id=None, prefetch_comments=False):
+        """게시글 본문을 읽는다.
+
+        prefetch_comments를 켜면 본문에 딸린 댓글만으로 부족할 때 첫 댓글 페이지를 본문 보강 요청과
+        함께 보내 두고, Document.comments와 first_comment_page로 그 결과를 넘긴다.
+        """
         parsed, text, used_url = await self.__fetch_parsed_from_urls(
             self.__build_view_urls(
                 board_id,
@@ -974,15 +1263,16 @@ class API(ParserMixin):
         )
         if parsed is None:
             return None
+        self.__remember_gallery_kind(board_id, used_url)
         is_mobile_source = self.__is_mobile_request(used_url)
         # Try various XPaths for title/meta container
-        doc_head_containers = parsed.xpath("//div[contains(@class, 'gallview-tit-box')]")
+        doc_head_containers = xpath(parsed, "//div[contains(@class, 'gallview-tit-box')]")
         if not doc_head_containers:
             # Fallback for minor gallery or dynamic structure
-            doc_head_containers = parsed.xpath("//div[@class='gall-tit-box']")
+            doc_head_containers = xpath(parsed, "//div[@class='gall-tit-box']")
         if not doc_head_containers:
             # PC view fallback (m board can redirect to gall.dcinside.com)
-            doc_head_containers = parsed.xpath("//div[contains(@class, 'gallview_head')]")
+            doc_head_containers = xpath(parsed, "//div[contains(@class, 'gallview_head')]")
             
         if not doc_head_containers:
             return None
@@ -990,11 +1280,11 @@ class API(ParserMixin):
         doc_head_container = doc_head_containers[0]
         
         # Try various XPaths for content container
-        doc_content_container = parsed.xpath("//div[@class='thum-txtin']")
+        doc_content_container = xpath(parsed, "//div[@class='thum-txtin']")
         if not doc_content_container:
-            doc_content_container = parsed.xpath("//div[contains(@class, 'writing_view_box')]")
+            doc_content_container = xpath(parsed, "//div[contains(@class, 'writing_view_box')]")
         if not doc_content_container:
-            doc_content_container = parsed.xpath("//div[contains(@class, 'thum-txt-area')]")
+            doc_content_container = xpath(parsed, "//div[contains(@class, 'thum-txt-area')]")
 
         if len(doc_content_container):
             header = self.__parse_document_header(doc_head_container)
@@ -1012,20 +1302,34 @@ class API(ParserMixin):
             )
 
             doc_content = self.__prepare_document_content(doc_content_container[0])
-            if is_mobile_source:
-                doc_content = await self.__repair_placeholder_images_from_pc(
-                    doc_content,
-                    board_id,
-                    document_id,
-                    kind=kind,
-                )
-            await self.__replace_poll_iframes(doc_content)
             related_posts = []
             embedded_comments = []
             embedded_comment_total = 0
+            pc_comment_context = None
             if is_mobile_source:
                 related_posts = self.__parse_embedded_mobile_posts(parsed, board_id, document_id, kind=kind, recommend=recommend)
                 embedded_comments, embedded_comment_total = self.__parse_embedded_mobile_comments(parsed)
+            else:
+                pc_comment_context = self.__pc_comment_context_from_page(parsed, used_url)
+
+            first_comment_page = None
+            if prefetch_comments and self.__needs_comment_fetch(embedded_comments, embedded_comment_total):
+                if is_mobile_source:
+                    first_comment_page = asyncio.ensure_future(
+                        self.__fetch_mobile_comment_page(board_id, document_id, 1)
+                    )
+                elif pc_comment_context is not None:
+                    first_comment_page = asyncio.ensure_future(
+                        self.__fetch_pc_comment_page(board_id, document_id, pc_comment_context, 1)
+                    )
+            doc_content = await self.__load_document_extras(
+                doc_content,
+                board_id,
+                document_id,
+                kind=kind,
+                repair_images=is_mobile_source and self.__has_placeholder_document_images(doc_content),
+                first_comment_page=first_comment_page,
+            )
 
             return Document(
                     id = document_id,
@@ -1041,13 +1345,14 @@ class API(ParserMixin):
                     voteup_count= voteup_count,
                     votedown_count= votedown_count,
                     logined_voteup_count= logined_voteup_count,
-                    comments= lambda b=board_id, d=document_id, k=kind, mobile=is_mobile_source: self.comments(b, d, kind=k, prefer_mobile=mobile),
+                    comments= lambda b=board_id, d=document_id, k=kind, mobile=is_mobile_source, first=first_comment_page, context=pc_comment_context: self.comments(b, d, kind=k, prefer_mobile=mobile, first_page=first, pc_context=context),
                     time= self.__parse_time(time_str),
                     subject=subject,
                     is_mobile_source=is_mobile_source,
                     related_posts=related_posts,
                     embedded_comments=embedded_comments,
                     embedded_comment_total=embedded_comment_total,
+                    first_comment_page=first_comment_page,
                     )
         else:
             # fail due to unusual tags in mobile version
@@ -1062,145 +1367,233 @@ class API(ParserMixin):
                 continue
             if status >= 400 or not text:
                 continue
-            parsed = lxml.html.fromstring(text)
-            e_s_n_o = parsed.xpath("string(//input[@id='e_s_n_o']/@value)").strip()
-            gall_type = parsed.xpath("string(//input[@id='_GALLTYPE_']/@value)").strip()
-            if not e_s_n_o or not gall_type:
-                continue
-            return {
-                "referer": url,
-                "e_s_n_o": e_s_n_o,
-                "board_type": parsed.xpath("string(//input[@id='board_type']/@value)").strip(),
-                "_GALLTYPE_": gall_type,
-                "secret_article_key": parsed.xpath("string(//input[@id='secret_article_key']/@value)").strip(),
-            }
+            context = await run_parse(lambda: self.__pc_comment_context_from_page(lxml.html.fromstring(text), url))
+            if context is not None:
+                return context
         raise RuntimeError("pc comment context not found")
-    async def __comments_from_pc(self, board_id, document_id, num=-1, start_page=1, kind=None):
-        if num == 0:
-            return
-        context = await self.__get_pc_comment_context(board_id, document_id, kind=kind)
-        seen_ids = set()
 
-        for page in range(start_page, 999999):
-            payload = {
-                "id": board_id,
-                "no": document_id,
-                "cmt_id": board_id,
-                "cmt_no": document_id,
-                "focus_cno": "",
-                "focus_pno": "",
-                "e_s_n_o": context["e_s_n_o"],
-                "comment_page": str(page),
-                "sort": "D",
-                "prevCnt": "",
-                "board_type": context["board_type"],
-                "_GALLTYPE_": context["_GALLTYPE_"],
-                "secret_article_key": context["secret_article_key"],
-            }
-            headers = {
-                "Accept": "application/json, text/javascript, */*; q=0.01",
-                "Referer": context["referer"],
-                "X-Requested-With": "XMLHttpRequest",
-            }
-            status, _, body = await self.__request_text(
-                "POST",
-                "https://gall.dcinside.com/board/comment/",
-                headers=headers,
-                data=payload,
-            )
-            if status >= 400:
-                raise RuntimeError(f"pc comment fetch failed: {status}")
-            if not body.strip():
-                raise RuntimeError("pc comment fetch returned empty body")
+    @staticmethod
+    def __pc_comment_context_from_page(parsed, url):
+        e_s_n_o = xpath(parsed, "string(//input[@id='e_s_n_o']/@value)").strip()
+        gall_type = xpath(parsed, "string(//input[@id='_GALLTYPE_']/@value)").strip()
+        if not e_s_n_o or not gall_type:
+            return None
+        return {
+            "referer": url,
+            "e_s_n_o": e_s_n_o,
+            "board_type": xpath(parsed, "string(//input[@id='board_type']/@value)").strip(),
+            "_GALLTYPE_": gall_type,
+            "secret_article_key": xpath(parsed, "string(//input[@id='secret_article_key']/@value)").strip(),
+        }
 
-            try:
-                data = json.loads(body)
-            except Exception as exc:
-                raise RuntimeError("pc comment fetch returned invalid json") from exc
-            comments = data.get("comments") or []
-            if not comments:
-                if seen_ids:
-                    raise RuntimeError("pc comment fetch ended early")
-                break
+    def __start_page_tasks(self, fetch_page, pages, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
 
-            yielded_in_page = 0
-            for raw in comments:
-                comment_id = str(raw.get("no") or "").strip()
-                if not comment_id or comment_id in seen_ids:
-                    continue
-                seen_ids.add(comment_id)
-                yield self.__parse_pc_comment(raw)
-                yielded_in_page += 1
-                num -= 1
-                if num == 0:
-                    return
+        async def run(page):
+            async with semaphore:
+                return await fetch_page(page)
 
-            if yielded_in_page == 0:
-                if seen_ids:
-                    raise RuntimeError("pc comment page produced no new comments")
-                break
+        return [asyncio.ensure_future(run(page)) for page in pages]
 
-            pagination = str(data.get("pagination") or "")
-            max_page = 1
-            for page_no in re.findall(r">(\d+)<", pagination):
-                try:
-                    max_page = max(max_page, int(page_no))
-                except ValueError:
-                    continue
-            if page >= max_page:
-                break
+    @staticmethod
+    async def __cancel_page_tasks(tasks):
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __fetch_pc_comment_page(self, board_id, document_id, context, page):
+        """PC 댓글 한 페이지를 받아 (원본 댓글 목록, 알려진 마지막 페이지)를 돌려준다."""
+        payload = {
+            "id": board_id,
+            "no": document_id,
+            "cmt_id": board_id,
+            "cmt_no": document_id,
+            "focus_cno": "",
+            "focus_pno": "",
+            "e_s_n_o": context["e_s_n_o"],
+            "comment_page": str(page),
+            "sort": "D",
+            "prevCnt": "",
+            "board_type": context["board_type"],
+            "_GALLTYPE_": context["_GALLTYPE_"],
+            "secret_article_key": context["secret_article_key"],
+        }
+        headers = {
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "Referer": context["referer"],
+            "X-Requested-With": "XMLHttpRequest",
+        }
+        status, _, body = await self.__request_text(
+            "POST",
+            "https://gall.dcinside.com/board/comment/",
+            headers=headers,
+            data=payload,
+        )
+        if status >= 400:
+            raise RuntimeError(f"pc comment fetch failed: {status}")
+        if not body.strip():
+            raise RuntimeError("pc comment fetch returned empty body")
+
+        try:
+            data = await run_parse(json.loads, body)
+        except Exception as exc:
+            raise RuntimeError("pc comment fetch returned invalid json") from exc
 
-    async def __comments_from_mobile(self, board_id, document_id, num=-1, start_page=1, fail_fast=False):
+        pagination = str(data.get("pagination") or "")
+        max_page = 1
+        for page_no in re.findall(r">(\d+)<", pagination):
+            try:
+                max_page = max(max_page, int(page_no))
+            except ValueError:
+                continue
+        return data.get("comments") or [], max_page
+
+    async def __comments_from_pc(self, board_id, document_id, num=-1, start_page=1, kind=None, context=None, first_page=None):
         if num == 0:
             return
-        url = "https://m.dcinside.com/ajax/response-comment"
-        for page in range(start_page, 999999):
-            payload = {"id": board_id, "no": document_id, "cpage": page, "managerskill":"", "del_scope": "1", "csort": ""}
-            try:
-                status, _, body = await self.__request_text(
-                    "POST",
-                    url,
-                    headers=XML_HTTP_REQ_HEADERS,
-                    data=payload,
+        if context is None:
+            context = await self.__get_pc_comment_context(board_id, document_id, kind=kind)
+        seen_ids = set()
+        # 개수 제한이 있으면 필요한 만큼만 받도록 한 페이지씩 진행한다.
+        concurrency = COMMENT_PAGE_CONCURRENCY if num == -1 else 1
+        next_page = start_page
+        known_last = start_page
+        while next_page <= known_last:
+            pages = range(next_page, (known_last if concurrency > 1 else next_page) + 1)
+            if first_page is not None:
+                # 본문과 함께 미리 받아 둔 첫 페이지
+                pages, tasks, first_page = range(next_page, next_page + 1), [first_page], None
+            else:
+                tasks = self.__start_page_tasks(
+                    lambda page: self.__fetch_pc_comment_page(board_id, document_id, context, page),
+                    pages,
+                    concurrency,
                 )
-            except RuntimeError:
-                if fail_fast:
-                    raise
-                break
-            if status >= 400:
-                if fail_fast:
-                    raise RuntimeError(f"mobile comment fetch failed: {status}")
-                break
-            if not body or not body.strip():
-                if fail_fast:
-                    raise RuntimeError("mobile comment fetch returned empty body")
-                break
             try:
-                parsed = lxml.html.fromstring(body)
-            except Exception:
-                if fail_fast:
-                    raise RuntimeError("mobile comment fetch returned invalid html")
-                break
-            comment_rows = self.__mobile_comment_rows(parsed)
-            if not comment_rows:
-                if fail_fast:
-                    raise RuntimeError("mobile comment page produced no comment rows")
-                break
-            for li in comment_rows:
-                yield self.__parse_mobile_comment_li(li)
-                num -= 1
-                if num == 0:
-                    return
-            page_num_els = parsed.xpath(".//span[contains(concat(' ', normalize-space(@class), ' '), ' pgnum ')]")
-            if page_num_els:
-                page_numbers = [
-                    int(value)
-                    for value in re.findall(r"\d+", " ".join(el.text_content() for el in page_num_els))
-                ]
-                if page_numbers and page >= max(page_numbers):
-                    break
+                for page, task in zip(pages, tasks):
+                    comments, page_last = await task
+                    if not comments:
+                        if seen_ids:
+                            raise RuntimeError("pc comment fetch ended early")
+                        return
+
+                    yielded_in_page = 0
+                    for raw in comments:
+                        comment_id = str(raw.get("no") or "").strip()
+                        if not comment_id or comment_id in seen_ids:
+                            continue
+                        seen_ids.add(comment_id)
+                        yield self.__parse_pc_comment(raw)
+                        yielded_in_page += 1
+                        num -= 1
+                        if num == 0:
+                            return
+
+                    if yielded_in_page == 0:
+                        if seen_ids:
+                            raise RuntimeError("pc comment page produced no new comments")
+                        return
+                    if page >= page_last:
+                        return
+                    known_last = max(known_last, page_last)
+            finally:
+                await self.__cancel_page_tasks(tasks)
+            next_page = pages[-1] + 1
+
+    async def __fetch_mobile_comment_page(self, board_id, document_id, page):
+        """모바일 댓글 한 페이지를 받아 (댓글 행, 알려진 마지막 페이지)를 돌려준다.
+
+        페이지 표시가 없으면 마지막 페이지는 None이다. 쓸 수 없는 응답은 RuntimeError로 올린다.
+        """
+        payload = {"id": board_id, "no": document_id, "cpage": page, "managerskill":"", "del_scope": "1", "csort": ""}
+        status, _, body = await self.__request_text(
+            "POST",
+            "https://m.dcinside.com/ajax/response-comment",
+            headers=XML_HTTP_REQ_HEADERS,
+            data=payload,
+        )
+        if status >= 400:
+            raise RuntimeError(f"mobile comment fetch failed: {status}")
+        if not body or not body.strip():
+            raise RuntimeError("mobile comment fetch returned empty body")
+        return await run_parse(self.__parse_mobile_comment_page, body, page)
+
+    def __parse_mobile_comment_page(self, body, page):
+        try:
+            parsed = lxml.html.fromstring(body)
+        except Exception:
+            raise RuntimeError("mobile comment fetch returned invalid html")
+        comment_rows = self.__mobile_comment_rows(parsed)
+        if not comment_rows:
+            raise RuntimeError("mobile comment page produced no comment rows")
+        page_num_els = xpath(parsed, ".//span[contains(concat(' ', normalize-space(@class), ' '), ' pgnum ')]")
+        if not page_num_els:
+            return comment_rows, None
+        page_numbers = [
+            int(value)
+            for value in re.findall(r"\d+", " ".join(el.text_content() for el in page_num_els))
+        ]
+        # 숫자를 못 읽으면 다음 페이지를 한 장씩 확인한다.
+        return comment_rows, max(page_numbers) if page_numbers else page + 1
+
+    async def __comments_from_mobile(self, board_id, document_id, num=-1, start_page=1, fail_fast=False, pagination_collector=None, first_page=None):
+        if num == 0:
+            return
+        concurrency = COMMENT_PAGE_CONCURRENCY if num == -1 else 1
+        next_page = start_page
+        known_last = start_page
+        while next_page <= known_last:
+            pages = range(next_page, (known_last if concurrency > 1 else next_page) + 1)
+            if first_page is not None:
+                pages, tasks, first_page = range(next_page, next_page + 1), [first_page], None
             else:
-                break
+                tasks = self.__start_page_tasks(
+                    lambda page: self.__fetch_mobile_comment_page(board_id, document_id, page),
+                    pages,
+                    concurrency,
+                )
+            try:
+                # 동시에 받아도 결과는 페이지 순서대로 처리해 앞 페이지 실패가 순차 조회와 같게 드러난다.
+                for page, task in zip(pages, tasks):
+                    try:
+                        comment_rows, page_last = await task
+                    except DeadlineExceeded:
+                        raise
+                    except RuntimeError:
+                        if fail_fast:
+                            raise
+                        return
+                    if pagination_collector is not None:
+                        pagination_collector["last_page"] = page
+                    for li in comment_rows:
+                        yield self.__parse_mobile_comment_li(li)
+                        num -= 1
+                        if num == 0:
+                            return
+                    if page_last is None or page >= page_last:
+                        return
+                    known_last = max(known_last, page_last)
+            finally:
+                await self.__cancel_page_tasks(tasks)
+            next_page = pages[-1] + 1
+
+    async def mobile_comments(self, board_id, document_id, start_page=1, pagination_collector=None, first_page=None):
+        """모바일 댓글을 start_page부터 끝까지 가져온다. PC 폴백 없이 실패를 그대로 올린다.
+
+        모바일 댓글은 등록순이라 새 댓글은 마지막 페이지 뒤에 붙는다. pagination_collector에는
+        마지막으로 읽은 페이지 번호(last_page)를 남겨 다음 증분 갱신의 시작점으로 쓴다.
+        first_page는 document(prefetch_comments=True)가 미리 받아 둔 start_page 결과다.
+        """
+        async for comment in self.__comments_from_mobile(
+            board_id,
+            document_id,
+            start_page=start_page,
+            fail_fast=True,
+            pagination_collector=pagination_collector,
+            first_page=first_page,
+        ):
+            yield comment
 
     @staticmethod
     def __comment_id(comment):
@@ -1228,9 +1621,22 @@ class API(ParserMixin):
             if remaining_state["value"] == 0:
                 return
 
-    async def comments(self, board_id, document_id, num=-1, start_page=1, kind=None, prefer_mobile=True):
+    async def comments(self, board_id, document_id, num=-1, start_page=1, kind=None, prefer_mobile=True, first_page=None, pc_context=None):
+        """댓글을 가져온다. first_page는 우선 소스(prefer_mobile)에서 미리 받아 둔 첫 페이지 작업이다.
+
+        요청 마감 시간이 지나면 다른 소스로 넘어가지 않고 DeadlineExceeded를 올린다.
+        """
         if num == 0:
             return
+        if start_page != 1:
+            first_page = None
+        # 미리 받은 페이지나 문맥이 있을 때만 넘긴다.
+        mobile_prefetched = {"first_page": first_page} if prefer_mobile and first_page is not None else {}
+        pc_prefetched = {}
+        if pc_context is not None:
+            pc_prefetched["context"] = pc_context
+        if not prefer_mobile and first_page is not None:
+            pc_prefetched["first_page"] = first_page
         yielded_ids = set()
         remaining_state = {"value": num}
 
@@ -1243,6 +1649,7 @@ class API(ParserMixin):
                     num=num,
                     start_page=start_page,
                     fail_fast=True,
+                    **mobile_prefetched,
                 )
                 async for comment in self.__deduped_comments(
                     mobile_comments,
@@ -1253,6 +1660,8 @@ class API(ParserMixin):
                     yield comment
                 if mobile_stats["seen"]:
                     return
+            except DeadlineExceeded:
+                raise
             except Exception:
                 logger.debug(
                     "mobile comments failed, falling back to pc: board=%s doc=%s",
@@ -1270,6 +1679,7 @@ class API(ParserMixin):
                 num=pc_fetch_num,
                 start_page=start_page,
                 kind=kind,
+                **pc_prefetched,
             )
             async for comment in self.__deduped_comments(
                 pc_comments,
@@ -1281,6 +1691,8 @@ class API(ParserMixin):
                 yield comment
             if pc_stats["seen"] and (remaining_state["value"] == -1 or remaining_state["value"] <= 0):
                 return
+        except DeadlineExceeded:
+            raise
         except Exception:
             logger.debug(
                 "pc comments failed, falling back to mobile: board=%s doc=%s",
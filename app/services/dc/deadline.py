@@ -0,0 +1,63 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+from app.services.cache_utils import env_int
+
+# 라우트 하나가 upstream 조회에 쓸 수 있는 전체 시간(초). Gunicorn MIRROR_TIMEOUT보다 짧게 둔다. 0이면 끈다.
+REQUEST_DEADLINE = max(env_int("MIRROR_REQUEST_DEADLINE", 45), 0)
+
+# time.monotonic() 기준 마감 시각. None이면 마감이 없다.
+_REQUEST_DEADLINE = contextvars.ContextVar("mirror_dc_request_deadline", default=None)
+
+
+class DeadlineExceeded(RuntimeError):
+    """요청 마감 시간이 지나 upstream을 더 부르지 않은 경우."""
+
+
+def current_deadline():
+    """time.monotonic() 기준 마감 시각. 마감이 없으면 None."""
+    return _REQUEST_DEADLINE.get()
+
+
+def remaining_time():
+    """마감까지 남은 시간(초). 마감이 없으면 None."""
+    deadline = _REQUEST_DEADLINE.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def deadline_timeout(default):
+    """요청 하나에 줄 timeout. 남은 시간이 더 짧으면 그만큼으로 줄이고, 다 썼으면 DeadlineExceeded."""
+    remaining = remaining_time()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceeded("request deadline exceeded")
+    return min(default, remaining)
+
+
+@contextmanager
+def request_deadline(seconds):
+    """이 블록 안에서 보내는 upstream 요청이 seconds 안에 끝나도록 한다.
+
+    이미 더 이른 마감이 있으면 그대로 둔다. None이나 0 이하면 마감을 없앤다.
+    """
+    if seconds is None or seconds <= 0:
+        deadline = None
+    else:
+        deadline = time.monotonic() + seconds
+        current = _REQUEST_DEADLINE.get()
+        if current is not None:
+            deadline = min(deadline, current)
+    token = _REQUEST_DEADLINE.set(deadline)
+    try:
+        yield
+    finally:
+        _REQUEST_DEADLINE.reset(token)
+
+
+async def run_with_deadline(seconds, coro):
+    with request_deadline(seconds):
+        return await coro
@@ -0,0 +1,239 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from app.services.cache_utils import env_int
+
+logger = logging.getLogger(__name__)
+
+# 호스트별 토큰 버킷. 값은 워커 프로세스 하나 기준이다. 0이면 속도 제한을 끈다.
+HOST_RATE = max(env_int("MIRROR_DC_HOST_RATE", 8), 0)
+HOST_BURST = max(env_int("MIRROR_DC_HOST_BURST", 16), 1)
+# rate limit 응답을 보면 속도를 절반으로 줄이고(AIMD), 성공할 때마다 조금씩 되돌린다.
+HOST_MIN_RATE = 0.5
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_STEP = 0.1
+# 토큰을 기다리는 최대 시간. 넘기면 upstream을 부르지 않고 실패로 돌려준다.
+LIMIT_MAX_WAIT_MS = max(env_int("MIRROR_DC_LIMIT_MAX_WAIT_MS", 3000), 0)
+# 연속 rate limit 응답이 이만큼 쌓이면 차단기를 열고 쿨다운 동안 upstream 호출을 막는다. 0이면 끔.
+BREAKER_THRESHOLD = max(env_int("MIRROR_DC_BREAKER_THRESHOLD", 3), 0)
+BREAKER_COOLDOWN = max(env_int("MIRROR_DC_BREAKER_COOLDOWN", 60), 1)
+# 백그라운드 요청은 버킷에 이만큼(버스트 대비 비율)은 남겨 두고 대화형 요청에 양보한다.
+BACKGROUND_RESERVE_RATIO = 0.25
+WAIT_POLL_INTERVAL = 0.05
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+
+_REQUEST_PRIORITY = contextvars.ContextVar("mirror_dc_request_priority", default=PRIORITY_INTERACTIVE)
+
+
+class UpstreamUnavailable(RuntimeError):
+    """차단기가 열려 있거나 토큰 대기 한도를 넘겨 upstream을 부르지 않은 경우."""
+
+
+class HostLimiter:
+    """한 호스트로 가는 요청의 토큰 버킷과 차단기.
+
+    상태는 스레드 lock으로 보호하고, 대기는 asyncio.sleep으로 짧게 나눠 돌기 때문에
+    어느 이벤트 루프에서 불러도 된다.
+    """
+
+    def __init__(self, host, rate=None, burst=None):
+        self.host = host
+        self.max_rate = float(HOST_RATE if rate is None else rate)
+        self.burst = float(HOST_BURST if burst is None else burst)
+        self._lock = threading.Lock()
+        self._rate = self.max_rate
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._interactive_waiting = 0
+        self._consecutive_limited = 0
+        self._state = "closed"
+        self._opened_until = 0.0
+        self._probe_inflight = False
+        self._counters = {
+            "requests": 0,
+            "waits": 0,
+            "rejected": 0,
+            "rate_limited": 0,
+            "trips": 0,
+        }
+        self._last_trip_at = None
+
+    def _refill(self, now):
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self.max_rate > 0 and elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+
+    def _check_breaker(self, now):
+        """요청을 보내도 되면 (True, probe 여부)를 돌려준다."""
+        if self._state == "closed":
+            return True, False
+        if self._state == "open" and now < self._opened_until:
+            return False, False
+        if self._probe_inflight:
+            return False, False
+        # 쿨다운이 지나면 요청 하나만 시험 삼아 보내 본다.
+        self._state = "half_open"
+        self._probe_inflight = True
+        return True, True
+
+    def _try_take(self, priority, now):
+        """토큰을 가져가면 0, 아니면 다시 시도할 때까지 기다릴 시간(초)."""
+        if self.max_rate <= 0:
+            return 0.0
+        self._refill(now)
+        reserve = 0.0
+        if priority == PRIORITY_BACKGROUND:
+            if self._interactive_waiting:
+                return WAIT_POLL_INTERVAL
+            reserve = self.burst * BACKGROUND_RESERVE_RATIO
+        if self._tokens >= 1.0 + reserve:
+            self._tokens -= 1.0
+            return 0.0
+        return max((1.0 + reserve - self._tokens) / self._rate, 0.001)
+
+    async def acquire(self, priority=None):
+        """요청 하나를 보낼 자리를 얻는다. 차단기 시험 요청이면 True를 돌려준다."""
+        priority = priority or _REQUEST_PRIORITY.get()
+        interactive = priority != PRIORITY_BACKGROUND
+        deadline = time.monotonic() + LIMIT_MAX_WAIT_MS / 1000
+        waiting = False
+        try:
+            while True:
+                now = time.monotonic()
+                with self._lock:
+                    allowed, probe = self._check_breaker(time.time())
+                    if not allowed:
+                        self._counters["rejected"] += 1
+                        raise UpstreamUnavailable(f"circuit open: {self.host}")
+                    wait = self._try_take(priority, now)
+                    if wait <= 0:
+                        self._counters["requests"] += 1
+                        return probe
+                    if probe:
+                        self._probe_inflight = False
+                    if now + min(wait, WAIT_POLL_INTERVAL) > deadline:
+                        self._counters["rejected"] += 1
+                        raise UpstreamUnavailable(f"rate limit wait exceeded: {self.host}")
+                    if not waiting:
+                        waiting = True
+                        self._counters["waits"] += 1
+                        if interactive:
+                            self._interactive_waiting += 1
+                await asyncio.sleep(min(wait, WAIT_POLL_INTERVAL))
+        finally:
+            if waiting and interactive:
+                with self._lock:
+                    self._interactive_waiting -= 1
+
+    def finish(self, probe=False, rate_limited=None):
+        """응답을 받은 뒤 부른다. rate_limited가 None이면 결과를 모르는 실패로 본다."""
+        now = time.time()
+        with self._lock:
+            if probe:
+                self._probe_inflight = False
+            if rate_limited is None:
+                return
+            if rate_limited:
+                self._counters["rate_limited"] += 1
+                self._consecutive_limited += 1
+                self._rate = max(HOST_MIN_RATE, self._rate * RATE_DECREASE_FACTOR)
+                self._tokens = min(self._tokens, 0.0)
+                if self._state == "half_open" or (
+                    BREAKER_THRESHOLD and self._consecutive_limited >= BREAKER_THRESHOLD and self._state == "closed"
+                ):
+                    self._trip(now)
+                return
+            self._consecutive_limited = 0
+            if self.max_rate > 0:
+                self._rate = min(self.max_rate, self._rate + RATE_INCREASE_STEP)
+            if self._state != "closed":
+                logger.info("upstream circuit closed: host=%s", self.host)
+                self._state = "closed"
+
+    def _trip(self, now):
+        self._state = "open"
+        self._opened_until = now + BREAKER_COOLDOWN
+        self._counters["trips"] += 1
+        self._last_trip_at = now
+        logger.warning(
+            "upstream circuit opened: host=%s consecutive_rate_limited=%s cooldown=%ss",
+            self.host,
+            self._consecutive_limited,
+            BREAKER_COOLDOWN,
+        )
+
+    def is_open(self, now=None):
+        with self._lock:
+            return self._state == "open" and (time.time() if now is None else now) < self._opened_until
+
+    def snapshot(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            stats = dict(self._counters)
+            stats.update(
+                {
+                    "state": self._state,
+                    "rate": round(self._rate, 3),
+                    "max_rate": self.max_rate,
+                    "tokens": round(self._tokens, 3),
+                    "interactive_waiting": self._interactive_waiting,
+                    "consecutive_rate_limited": self._consecutive_limited,
+                    "opened_until": self._opened_until if self._state == "open" else None,
+                    "last_trip_at": self._last_trip_at,
+                }
+            )
+        return stats
+
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def host_limiter(host):
+    host = (host or "").lower()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(host)
+        if limiter is None:
+            limiter = HostLimiter(host)
+            _LIMITERS[host] = limiter
+        return limiter
+
+
+def circuit_open():
+    """DCInside 호스트 중 하나라도 차단기가 열려 있으면 True."""
+    with _LIMITERS_LOCK:
+        limiters = list(_LIMITERS.values())
+    return any(limiter.is_open() for limiter in limiters)
+
+
+def limiter_stats():
+    with _LIMITERS_LOCK:
+        limiters = dict(_LIMITERS)
+    return {host: limiter.snapshot() for host, limiter in sorted(limiters.items())}
+
+
+def reset_limiters():
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+
+@contextmanager
+def request_priority(priority):
+    """이 블록 안에서 보내는 upstream 요청의 우선순위를 정한다."""
+    token = _REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+async def run_with_priority(priority, coro_factory):
+    with request_priority(priority):
+        return await coro_factory()
@@ -42,14 +42,78 @@ def has_gallery_video_icon(value):
     )
 
 
+# 파서가 쓰는 XPath 식을 처음 볼 때 한 번만 컴파일해 두는 저장소. node.xpath(expr)는 부를 때마다
+# 식을 다시 컴파일하므로 목록 한 페이지에서 같은 식을 행마다 수백 번 컴파일하게 된다.
+_COMPILED_XPATHS = {}
+
+
+def compiled_xpath(expr):
+    compiled = _COMPILED_XPATHS.get(expr)
+    if compiled is None:
+        compiled = _COMPILED_XPATHS.setdefault(expr, lxml.etree.XPath(expr))
+    return compiled
+
+
+def xpath(node, expr):
+    """node.xpath(expr)와 같은 결과를 미리 컴파일한 식으로 구한다."""
+    return compiled_xpath(expr)(node)
+
+
+LIST_PAGE_FEED_CHUNK = 16384
+_FULL_HTML_RE = re.compile(r"^\s*<(?:html|!doctype)", re.I)
+
+
+def parse_list_page(text, chunk_size=LIST_PAGE_FEED_CHUNK):
+    """게시판 목록 HTML을 조각으로 나눠 파서에 먹이고, 목록 뒤 페이지 이동 영역이 닫히면 멈춘다.
+
+    광고와 스크립트가 몰린 페이지 꼬리는 트리로 만들지 않는다. 말머리 탭, 목록 행,
+    페이지 이동까지는 lxml.html.fromstring과 같은 트리를 돌려준다.
+    """
+    if not _FULL_HTML_RE.match(text):
+        return lxml.html.fromstring(text)
+    parser = lxml.etree.HTMLPullParser(events=("end",))
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+    list_closed = False
+    seen_pc_row = False
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+        for _event, element in parser.read_events():
+            tag = element.tag
+            classes = element.get("class") or ""
+            if tag == "tr" and "ub-content" in classes and "us-post" in classes:
+                seen_pc_row = True
+            elif tag == "ul" and "gall-detail-lst" in classes:
+                list_closed = True
+            elif tag == "table" and seen_pc_row:
+                list_closed = True
+            elif list_closed and (
+                element.get("id") == "pagination_div" or "bottom_paging_box" in classes.split()
+            ):
+                root = parser.close()
+                _drop_following_nodes(element)
+                return root
+    return parser.close()
+
+
+def _drop_following_nodes(element):
+    # 마지막 조각에 같이 들어온 꼬리 노드를 지워 조각 크기와 관계없이 같은 트리를 만든다.
+    node = element
+    parent = node.getparent()
+    while parent is not None:
+        for sibling in list(node.itersiblings()):
+            parent.remove(sibling)
+        node = parent
+        parent = node.getparent()
+
+
 class ParserMixin:
     def __parse_mobile_headtext_tabs(self, parsed):
         tabs = []
         seen = set()
-        tab_nodes = parsed.xpath("//ul[contains(@class, 'mal-lst')]//li[a]")
+        tab_nodes = xpath(parsed, "//ul[contains(@class, 'mal-lst')]//li[a]")
 
         for node in tab_nodes:
-            link_nodes = node.xpath("./a[1]")
+            link_nodes = xpath(node, "./a[1]")
             if not link_nodes:
                 continue
             link = link_nodes[0]
@@ -82,27 +146,28 @@ class ParserMixin:
     def __is_usable_board_page(self, parsed, text, url):
         if "등록된 게시물이 없습니다." in text:
             return True
-        mobile_rows = parsed.xpath(
+        mobile_rows = xpath(
+            parsed,
             "//ul[contains(@class, 'gall-detail-lst')]/li["
             "not(contains(concat(' ', normalize-space(@class), ' '), ' ad ')) and "
             "(.//a[contains(@class, 'lt') and (contains(@href, '/board/') or contains(@href, '/mini/'))])"
             "]"
         )
-        pc_rows = parsed.xpath("//tr[contains(@class, 'ub-content') and contains(@class, 'us-post')]")
+        pc_rows = xpath(parsed, "//tr[contains(@class, 'ub-content') and contains(@class, 'us-post')]")
         return bool(mobile_rows or pc_rows)
 
     def __is_usable_document_page(self, parsed, text, url):
-        doc_head_containers = parsed.xpath("//div[contains(@class, 'gallview-tit-box')]")
+        doc_head_containers = xpath(parsed, "//div[contains(@class, 'gallview-tit-box')]")
         if not doc_head_containers:
-            doc_head_containers = parsed.xpath("//div[@class='gall-tit-box']")
+            doc_head_containers = xpath(parsed, "//div[@class='gall-tit-box']")
         if not doc_head_containers:
-            doc_head_containers = parsed.xpath("//div[contains(@class, 'gallview_head')]")
+            doc_head_containers = xpath(parsed, "//div[contains(@class, 'gallview_head')]")
 
-        doc_content_container = parsed.xpath("//div[@class='thum-txtin']")
+        doc_content_container = xpath(parsed, "//div[@class='thum-txtin']")
         if not doc_content_container:
-            doc_content_container = parsed.xpath("//div[contains(@class, 'writing_view_box')]")
+            doc_content_container = xpath(parsed, "//div[contains(@class, 'writing_view_box')]")
         if not doc_content_container:
-            doc_content_container = parsed.xpath("//div[contains(@class, 'thum-txt-area')]")
+            doc_content_container = xpath(parsed, "//div[contains(@class, 'thum-txt-area')]")
         return bool(doc_head_containers and doc_content_container)
 
     def __compact_text(self, node):
@@ -121,13 +186,14 @@ class ParserMixin:
         return match.group(1) if match else None
 
     def __extract_mobile_author_id(self, row, include_onclick=False):
-        block_info = row.xpath(".//*[contains(@class, 'blockInfo')]/@data-info")
+        block_info = xpath(row, ".//*[contains(@class, 'blockInfo')]/@data-info")
         if block_info:
             author_id = (block_info[0] or "").strip()
             if author_id:
                 return author_id
 
-        gallog_hrefs = row.xpath(
+        gallog_hrefs = xpath(
+            row,
             ".//a[contains(@href, 'gallog.dcinside.com/') or contains(@href, '/gallog/')]/@href"
         )
         for href in gallog_hrefs:
@@ -136,7 +202,7 @@ class ParserMixin:
                 return author_id
 
         if include_onclick:
-            for onclick_text in row.xpath(".//*[@onclick]/@onclick"):
+            for onclick_text in xpath(row, ".//*[@onclick]/@onclick"):
                 author_id = self.__extract_gallog_author_id(onclick_text)
                 if author_id:
                     return author_id
@@ -147,7 +213,7 @@ class ParserMixin:
             return None
         values = []
         for attr in ("class", "src", "data-original", "title", "alt"):
-            values.extend(str(value or "") for value in node.xpath(f".//@{attr}"))
+            values.extend(str(value or "") for value in xpath(node, f".//@{attr}"))
         return self.__extract_author_role_from_text(" ".join(values))
 
     def __extract_author_role_from_text(self, value):
@@ -165,12 +231,14 @@ class ParserMixin:
         return None
 
     def __find_mobile_list_link(self, row):
-        link_nodes = row.xpath(
+        link_nodes = xpath(
+            row,
             ".//a[contains(@class, 'lt') and "
             "(contains(@href, '/board/') or contains(@href, '/mini/'))]"
         )
         if not link_nodes:
-            link_nodes = row.xpath(
+            link_nodes = xpath(
+                row,
                 ".//a[(contains(@href, '/board/') or contains(@href, '/mini/')) "
                 "and not(contains(@href, '#comment_box'))]"
             )
@@ -178,16 +246,16 @@ class ParserMixin:
 
     def __extract_mobile_title_subject(self, link, prefer_icon_sibling=True):
         subject = None
-        subject_el = link.xpath(".//span[contains(@class, 'subjectin')]")
+        subject_el = xpath(link, ".//span[contains(@class, 'subjectin')]")
         if subject_el:
             title = self.__compact_text(subject_el[0])
-            subject_tag = subject_el[0].xpath(".//b")
+            subject_tag = xpath(subject_el[0], ".//b")
             if subject_tag:
                 subject = self.__compact_text(subject_tag[0]) or None
             return title, subject
 
         if prefer_icon_sibling:
-            title_nodes = link.xpath(".//*[contains(@class,'sp-lst')]/following-sibling::*[1]")
+            title_nodes = xpath(link, ".//*[contains(@class,'sp-lst')]/following-sibling::*[1]")
             if title_nodes:
                 return self.__compact_text(title_nodes[0]), None
         return self.__compact_text(link), None
@@ -195,7 +263,7 @@ class ParserMixin:
     def __extract_mobile_ginfo(self, link, subject=None, allow_subject_cell=True):
         ginfo = [
             self.__compact_text(node)
-            for node in link.xpath(".//ul[contains(@class, 'ginfo')]/li")
+            for node in xpath(link, ".//ul[contains(@class, 'ginfo')]/li")
         ]
         author = "익명"
         post_time = self.__parse_time("")
@@ -218,7 +286,7 @@ class ParserMixin:
         return subject, author, post_time, view_count, voteup_count, time_text
 
     def __extract_mobile_author_role_from_ginfo(self, link, allow_subject_cell=True):
-        nodes = link.xpath(".//ul[contains(@class, 'ginfo')]/li")
+        nodes = xpath(link, ".//ul[contains(@class, 'ginfo')]/li")
         if not nodes:
             return None
         named_nodes = [
@@ -234,17 +302,17 @@ class ParserMixin:
         return self.__extract_author_role(nodes[author_offset])
 
     def __extract_mobile_comment_count(self, row, full_text_fallback=False):
-        comment_nodes = row.xpath(".//a[contains(@class, 'rt')]//*[contains(@class, 'ct')]")
+        comment_nodes = xpath(row, ".//a[contains(@class, 'rt')]//*[contains(@class, 'ct')]")
         if comment_nodes:
             return to_int(self.__compact_text(comment_nodes[0]), 0)
         if full_text_fallback:
-            rt_nodes = row.xpath(".//a[contains(@class, 'rt')]")
+            rt_nodes = xpath(row, ".//a[contains(@class, 'rt')]")
             if rt_nodes:
                 return to_int(self.__compact_text(rt_nodes[0]), 0)
         return 0
 
     def __mobile_icon_flags(self, link):
-        return " ".join(link.xpath(".//span[contains(@class,'sp-lst')]/@class"))
+        return " ".join(xpath(link, ".//span[contains(@class,'sp-lst')]/@class"))
 
     def __gallery_flags(self, flags, board_id=None, recommend_marker="reco", include_board_best=True, include_issue_hit=False):
         flags = flags or ""
@@ -356,7 +424,8 @@ class ParserMixin:
     def __parse_embedded_mobile_posts(self, parsed, board_id, current_document_id, kind=None, recommend=False):
         posts = []
         seen_ids = {str(current_document_id)}
-        rows = parsed.xpath(
+        rows = xpath(
+            parsed,
             "//*[@id='view_next' and "
             "contains(concat(' ', normalize-space(@class), ' '), ' gall-detail-lst ')]/li"
         )
@@ -382,24 +451,25 @@ class ParserMixin:
 
         author_id = None
         if nick_node is not None:
-            block_id_nodes = nick_node.xpath(".//*[contains(@class, 'blockCommentId')]")
+            block_id_nodes = xpath(nick_node, ".//*[contains(@class, 'blockCommentId')]")
             if block_id_nodes:
                 author_id = block_id_nodes[0].get("data-info", None)
             if not author_id:
-                block_ip_nodes = nick_node.xpath(".//*[contains(@class, 'blockCommentIp')]")
+                block_ip_nodes = xpath(nick_node, ".//*[contains(@class, 'blockCommentIp')]")
                 if block_ip_nodes:
                     author_id = "".join(block_ip_nodes[0].itertext()).strip()
 
         author = "익명"
         if nick_node is not None:
-            nick_buttons = nick_node.xpath(".//*[contains(@class, 'nick')]")
+            nick_buttons = xpath(nick_node, ".//*[contains(@class, 'nick')]")
             if nick_buttons:
                 author = " ".join(nick_buttons[0].itertext()).strip() or "익명"
             else:
                 author = " ".join(nick_node.itertext()).strip() or "익명"
         author_role = self.__extract_author_role(nick_node)
 
-        dccon_images = content_node.xpath(
+        dccon_images = xpath(
+            content_node,
             ".//img[contains(@src, 'dccon') or contains(@data-original, 'dccon') "
             "or contains(@data-gif, 'dccon') or contains(@src, 'dicad')]"
         )
@@ -412,7 +482,7 @@ class ParserMixin:
             )
 
         voice = None
-        voice_nodes = content_node.xpath(".//iframe/@src")
+        voice_nodes = xpath(content_node, ".//iframe/@src")
         if voice_nodes:
             voice = voice_nodes[0]
 
@@ -430,7 +500,8 @@ class ParserMixin:
         )
 
     def __mobile_comment_rows(self, parsed):
-        rows = parsed.xpath(
+        rows = xpath(
+            parsed,
             ".//ul[contains(@class, 'all-comment-lst')]/li["
             "contains(concat(' ', normalize-space(@class), ' '), ' comment ') "
             "or contains(concat(' ', normalize-space(@class), ' '), ' comment-add ') "
@@ -440,7 +511,8 @@ class ParserMixin:
         if rows:
             return rows
         if len(parsed) >= 2:
-            return parsed[1].xpath(
+            return xpath(
+                parsed[1],
                 ".//li[contains(concat(' ', normalize-space(@class), ' '), ' comment ') "
                 "or contains(concat(' ', normalize-space(@class), ' '), ' comment-add ') "
                 "or (@no and @m_no)]"
@@ -464,12 +536,12 @@ class ParserMixin:
             digits = re.sub(r"[^0-9]", "", value or "")
             return int(digits) if digits else 0
 
-        total_nodes = parsed.xpath("string((//input[@id='reple_totalCnt'])[1]/@value)")
+        total_nodes = xpath(parsed, "string((//input[@id='reple_totalCnt'])[1]/@value)")
         if total_nodes:
             total = parse_count_text(total_nodes)
         if total <= 0:
             title_text = " ".join(
-                parsed.xpath("//div[contains(@class, 'all-comment-tit')]//*[contains(@class, 'ct')]/text()")
+                xpath(parsed, "//div[contains(@class, 'all-comment-tit')]//*[contains(@class, 'ct')]/text()")
             )
             total = parse_count_text(title_text)
         return comments, total
@@ -486,12 +558,12 @@ class ParserMixin:
         except (lxml.etree.ParserError, ValueError):
             return None
 
-        for meta in parsed.xpath("/html/head/meta | /html/body/meta"):
+        for meta in xpath(parsed, "/html/head/meta | /html/body/meta"):
             redirect_url = self.__extract_meta_refresh_url(meta)
             if redirect_url:
                 return redirect_url
 
-        for script in parsed.xpath("/html/head/script | /html/body/script"):
+        for script in xpath(parsed, "/html/head/script | /html/body/script"):
             redirect_url = self.__extract_script_redirect_url(script.text_content() or "")
             if redirect_url:
                 return redirect_url
@@ -615,7 +687,7 @@ class ParserMixin:
         )
 
     def __extract_pc_board_author(self, row):
-        author_el = row.xpath(".//td[contains(@class, 'gall_writer')]")
+        author_el = xpath(row, ".//td[contains(@class, 'gall_writer')]")
         author = "익명"
         author_id = None
         author_role = None
@@ -631,20 +703,20 @@ class ParserMixin:
         return author, author_id, author_role
 
     def __extract_pc_board_counts(self, row):
-        view_count = to_int("".join(row.xpath(".//td[contains(@class, 'gall_count')]/text()") or []), 0)
-        voteup_count = to_int("".join(row.xpath(".//td[contains(@class, 'gall_recommend')]/text()") or []), 0)
-        comment_count = to_int("".join(row.xpath(".//a[contains(@class, 'reply_numbox')]//span[contains(@class, 'reply_num')]/text()") or []), 0)
+        view_count = to_int("".join(xpath(row, ".//td[contains(@class, 'gall_count')]/text()") or []), 0)
+        voteup_count = to_int("".join(xpath(row, ".//td[contains(@class, 'gall_recommend')]/text()") or []), 0)
+        comment_count = to_int("".join(xpath(row, ".//a[contains(@class, 'reply_numbox')]//span[contains(@class, 'reply_num')]/text()") or []), 0)
         return view_count, voteup_count, comment_count
 
     def __pc_board_flags(self, row):
         return " ".join([
             row.get("data-type", ""),
-            " ".join(row.xpath(".//td[contains(@class, 'gall_tit')]//em/@class")),
+            " ".join(xpath(row, ".//td[contains(@class, 'gall_tit')]//em/@class")),
         ])
 
     def __parse_pc_board_row(self, row, board_id, kind=None, recommend=False, is_mobile_source=False):
         data_no = row.get("data-no", "")
-        href_els = row.xpath(".//td[contains(@class, 'gall_tit')]//a[contains(@href, 'view')]")
+        href_els = xpath(row, ".//td[contains(@class, 'gall_tit')]//a[contains(@href, 'view')]")
         if not href_els:
             return None
         href = href_els[0].get("href", "")
@@ -656,7 +728,7 @@ class ParserMixin:
         title = self.__compact_text(href_els[0])
         author, author_id, author_role = self.__extract_pc_board_author(row)
 
-        date_el = row.xpath(".//td[contains(@class, 'gall_date')]")
+        date_el = xpath(row, ".//td[contains(@class, 'gall_date')]")
         time_text = ""
         if date_el:
             time_text = (date_el[0].get("title") or date_el[0].text_content() or "").strip()
@@ -685,7 +757,7 @@ class ParserMixin:
         )
 
     def __first_text(self, parsed, xpath_expr):
-        nodes = parsed.xpath(xpath_expr)
+        nodes = xpath(parsed, xpath_expr)
         if not nodes:
             return None
         node = nodes[0]
@@ -695,9 +767,9 @@ class ParserMixin:
 
     def __parse_document_header(self, doc_head_container):
         subject = None
-        title_subject_el = doc_head_container.xpath(".//span[contains(@class, 'title_subject')]")
-        title_headtext_el = doc_head_container.xpath(".//span[contains(@class, 'title_headtext')]")
-        title_el = doc_head_container.xpath(".//span[contains(@class, 'tit')]")
+        title_subject_el = xpath(doc_head_container, ".//span[contains(@class, 'title_subject')]")
+        title_headtext_el = xpath(doc_head_container, ".//span[contains(@class, 'title_headtext')]")
+        title_el = xpath(doc_head_container, ".//span[contains(@class, 'tit')]")
         if title_subject_el:
             title = title_subject_el[0].text_content().strip()
             if title_headtext_el:
@@ -713,37 +785,37 @@ class ParserMixin:
 
         # Mobile view often exposes writer in ginfo2 first item:
         # <li><a href="/gallog/{id}">닉네임</a></li> or plain "ㅇㅇ(1.2)" text.
-        ginfo_author = doc_head_container.xpath(".//ul[contains(@class, 'ginfo2')]/li[1]")
+        ginfo_author = xpath(doc_head_container, ".//ul[contains(@class, 'ginfo2')]/li[1]")
         if ginfo_author:
             author = ginfo_author[0].text_content().strip() or "익명"
-            gallog_href = ginfo_author[0].xpath("string((.//a[contains(@href, '/gallog/')])[1]/@href)")
+            gallog_href = xpath(ginfo_author[0], "string((.//a[contains(@href, '/gallog/')])[1]/@href)")
             if gallog_href:
                 match = re.search(r"/gallog/([^/?'\"#]+)", gallog_href)
                 if match:
                     author_id = match.group(1)
 
         if author == "익명":
-            author_el = doc_head_container.xpath(".//span[@class='nickname'] | .//span[contains(@class, 'nickname')]")
+            author_el = xpath(doc_head_container, ".//span[@class='nickname'] | .//span[contains(@class, 'nickname')]")
             if author_el:
                 author = author_el[0].text_content().strip() or "익명"
 
-        author_id_el = doc_head_container.xpath(".//span[@class='ip']")
+        author_id_el = xpath(doc_head_container, ".//span[@class='ip']")
         if author_id is None and author_id_el:
             author_id = author_id_el[0].text_content().strip() or None
         if not author_id:
-            gallog_hrefs = doc_head_container.xpath(".//a[contains(@href, 'gallog.dcinside.com/')]/@href")
+            gallog_hrefs = xpath(doc_head_container, ".//a[contains(@href, 'gallog.dcinside.com/')]/@href")
             if gallog_hrefs:
                 match = re.search(r"gallog\.dcinside\.com/([^/?'\"#]+)", gallog_hrefs[0])
                 if match:
                     author_id = match.group(1)
         if not author_id:
-            gallog_hrefs = doc_head_container.xpath(".//a[contains(@href, '/gallog/')]/@href")
+            gallog_hrefs = xpath(doc_head_container, ".//a[contains(@href, '/gallog/')]/@href")
             if gallog_hrefs:
                 match = re.search(r"/gallog/([^/?'\"#]+)", gallog_hrefs[0])
                 if match:
                     author_id = match.group(1)
         if not author_id:
-            onclick_nodes = doc_head_container.xpath(".//*[@onclick]/@onclick")
+            onclick_nodes = xpath(doc_head_container, ".//*[@onclick]/@onclick")
             for onclick_text in onclick_nodes:
                 match = re.search(r"gallog\.dcinside\.com/([^/?'\"#]+)", onclick_text)
                 if match:
@@ -753,12 +825,12 @@ class ParserMixin:
         meta_text = " ".join(doc_head_container.text_content().split())
         time_str = None
         # Mobile markup
-        time_el = doc_head_container.xpath(".//span[@class='date'] | .//span[contains(@class, 'time')]")
+        time_el = xpath(doc_head_container, ".//span[@class='date'] | .//span[contains(@class, 'time')]")
         if time_el:
             time_str = time_el[0].text_content().strip()
         # PC markup
         if not time_str:
-            time_el = doc_head_container.xpath(".//span[@class='gall_date'] | .//span[contains(@class, 'gall_date')]")
+            time_el = xpath(doc_head_container, ".//span[@class='gall_date'] | .//span[contains(@class, 'gall_date')]")
             if time_el:
                 time_str = time_el[0].text_content().strip()
         # Final fallback: parse date-like text in header block.
@@ -804,9 +876,9 @@ class ParserMixin:
         return view_count, voteup_count, votedown_count, logined_voteup_count
 
     def __prepare_document_content(self, doc_content):
-        for adv in doc_content.xpath("div[@class='adv-groupin']"):
+        for adv in xpath(doc_content, "div[@class='adv-groupin']"):
             adv.getparent().remove(adv)
-        for adv in doc_content.xpath(".//img"):
+        for adv in xpath(doc_content, ".//img"):
             src = adv.get("src", "")
             if (
                 src.startswith("https://nstatic")
@@ -827,7 +899,7 @@ class ParserMixin:
     def __pick_document_video_src(self, el):
         tag = (getattr(el, "tag", "") or "").lower()
         if tag == "video":
-            for source in el.xpath(".//source"):
+            for source in xpath(el, ".//source"):
                 for key in ("src", "data-src", "data-original", "data-mp4"):
                     src = source.get(key)
                     if src:
@@ -845,7 +917,7 @@ class ParserMixin:
         if not fallback_src or self.__is_placeholder_document_image_src(fallback_src):
             return None
 
-        direct_sources = video.xpath("./source")
+        direct_sources = xpath(video, "./source")
         if not any("change_gif" in (source.get("onerror") or "") for source in direct_sources):
             return None
 
@@ -875,17 +947,17 @@ class ParserMixin:
     def __document_image_elements(self, doc_content):
         return [
             img
-            for img in doc_content.xpath(".//img")
+            for img in xpath(doc_content, ".//img")
             if not (self.__pick_document_image_src(img) or "").startswith("https://img.iacstatic.co.kr")
         ]
 
     def __real_document_video_sources(self, doc_content):
         sources = []
-        for video in doc_content.xpath(".//video"):
+        for video in xpath(doc_content, ".//video"):
             src = self.__pick_document_video_src(video)
             if src and not self.__is_placeholder_document_image_src(src):
                 sources.append(src)
-        for source in doc_content.xpath(".//source[not(ancestor::video)]"):
+        for source in xpath(doc_content, ".//source[not(ancestor::video)]"):
             src = self.__pick_document_video_src(source)
             if src and not self.__is_placeholder_document_image_src(src):
                 sources.append(src)
@@ -893,7 +965,7 @@ class ParserMixin:
 
     def __real_document_video_poster_sources(self, doc_content):
         sources = []
-        for video in doc_content.xpath(".//video"):
+        for video in xpath(doc_content, ".//video"):
             poster = video.get("poster")
             if poster and not self.__is_placeholder_document_image_src(poster):
                 sources.append(poster)
@@ -901,7 +973,7 @@ class ParserMixin:
 
     def __real_document_media_sources(self, doc_content):
         sources = []
-        for el in doc_content.xpath(".//img | .//video | .//source[not(ancestor::video)]"):
+        for el in xpath(doc_content, ".//img | .//video | .//source[not(ancestor::video)]"):
             tag = (getattr(el, "tag", "") or "").lower()
             if tag == "img":
                 src = self.__pick_document_image_src(el)
@@ -948,7 +1020,7 @@ class ParserMixin:
         sources = []
         sources.extend(
             src
-            for i in doc_content.xpath(".//img")
+            for i in xpath(doc_content, ".//img")
             for src in [self.__pick_document_image_src(i)]
             if src
             and not self.__is_placeholder_document_image_src(src)
@@ -1053,20 +1125,20 @@ class ParserMixin:
         title = self.__first_text(parsed, "//*[contains(@class, 'vote-tit-inner')]") or "투표"
         meta = [
             " ".join(node.text_content().split())
-            for node in parsed.xpath("//*[contains(@class, 'vote-date-lst')]/li")
+            for node in xpath(parsed, "//*[contains(@class, 'vote-date-lst')]/li")
             if " ".join(node.text_content().split())
         ]
         participant = self.__first_text(parsed, "//*[contains(@class, 'vote-join')]")
         options = [
             " ".join(node.text_content().split())
-            for node in parsed.xpath("//*[contains(@class, 'vote-ask-lst')]//*[contains(@class, 'vote-txt')]")
+            for node in xpath(parsed, "//*[contains(@class, 'vote-ask-lst')]//*[contains(@class, 'vote-txt')]")
             if " ".join(node.text_content().split())
         ]
         results = []
-        for node in parsed.xpath("//*[contains(@class, 'vote-gp-lst')]/li"):
-            option = " ".join(node.xpath("string(.//*[contains(@class, 'vote-txt')])").split())
-            percent = " ".join(node.xpath("string(.//*[contains(@class, 'percent')])").split())
-            count = " ".join(node.xpath("string(.//*[contains(@class, 'vote-ct')])").split())
+        for node in xpath(parsed, "//*[contains(@class, 'vote-gp-lst')]/li"):
+            option = " ".join(xpath(node, "string(.//*[contains(@class, 'vote-txt')])").split())
+            percent = " ".join(xpath(node, "string(.//*[contains(@class, 'percent')])").split())
+            count = " ".join(xpath(node, "string(.//*[contains(@class, 'vote-ct')])").split())
             if option:
                 results.append({"option": option, "percent": percent, "count": count})
         return {
@@ -1086,7 +1158,8 @@ class ParserMixin:
         if memo and "<" in memo:
             try:
                 fragment = lxml.html.fragment_fromstring(memo, create_parent="div")
-                dccon_candidates = fragment.xpath(
+                dccon_candidates = xpath(
+                    fragment,
                     ".//img[contains(@src, 'dccon') or contains(@src, 'dicad') or contains(@class, 'written_dccon')]"
                 )
                 if dccon_candidates:
@@ -1096,7 +1169,7 @@ class ParserMixin:
                         or dccon_candidates[0].get("src")
                     )
                 if not voice:
-                    voice_nodes = fragment.xpath(".//iframe/@src")
+                    voice_nodes = xpath(fragment, ".//iframe/@src")
                     if voice_nodes:
                         voice = voice_nodes[0]
                 contents = "\n".join(i.strip() for i in fragment.itertext() if i.strip())
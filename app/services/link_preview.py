@@ -12,7 +12,8 @@ from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup
 
-from .cache_utils import cache_get, cache_set_after_insert, env_int
+from .admission import upstream_allowed
+from .cache_utils import TTLCache, cache_get, cache_set_after_insert, env_int
 from .media_proxy import PC_USER_AGENT, resolve_media_target
 
 
@@ -32,7 +33,7 @@ _CACHE_FAILURE = object()
 
 _CHARSET_PATTERN = re.compile(r"charset\s*=\s*[\"']?\s*([a-zA-Z0-9._:-]+)", re.IGNORECASE)
 
-_preview_cache = {}
+_preview_cache = TTLCache(PREVIEW_CACHE_MAX_ITEMS)
 _preview_cache_lock = threading.Lock()
 _url_locks = tuple(threading.Lock() for _ in range(64))
 
@@ -416,6 +417,9 @@ def fetch_preview(url):
     found, cached = _cached_result(key)
     if found:
         return cached
+    # admission control이 넘친 요청은 기다리지 않고 다시 시도하라고 돌려보낸다.
+    if not upstream_allowed():
+        return RATE_LIMITED
 
     lock = _url_locks[int(key[:8], 16) % len(_url_locks)]
     with lock:
@@ -0,0 +1,350 @@
+"""/media 응답을 instance/ 아래 파일로 저장해 두고 다시 쓰는 디스크 캐시.
+
+키는 정규화한 src의 sha256이고, <dir>/<앞 두 글자>/<키>에 본문을, <키>.meta에 Content-Type과
+길이를 둔다. 둘 다 임시 파일에 쓴 뒤 os.replace로 바꿔 넣으므로 읽는 쪽은 다 쓴 파일만 본다.
+같은 키는 한 요청만 선점해 받으면서 쓰고, 그동안 들어온 요청은 저장 없이 upstream을 중계한다.
+조회할 때마다 .meta의 mtime을 갱신하고, 전체 크기가 한도를 넘으면 백그라운드 스레드 하나가
+디렉터리를 훑어 가장 오래 안 쓴 항목부터 지운다. 워커 프로세스끼리는 디렉터리만 공유하고,
+남이 지운 파일은 미스로 본다.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from .cache_utils import INSTANCE_DIR, env_int
+
+logger = logging.getLogger(__name__)
+
+# 디스크 캐시 전체 크기 상한(바이트). 0이면 끈다.
+MEDIA_DISK_CACHE_MAX_BYTES = max(env_int("MIRROR_MEDIA_DISK_CACHE_MAX_BYTES", 0), 0)
+MEDIA_DISK_CACHE_DIR = os.getenv("MIRROR_MEDIA_DISK_CACHE_DIR", os.path.join(INSTANCE_DIR, "media_cache"))
+# 항목 하나의 크기 상한(바이트). 0이면 전체 상한의 1/8. 큰 동영상 하나가 캐시를 다 밀어내지 않게 한다.
+MEDIA_DISK_CACHE_MAX_ENTRY_BYTES = max(env_int("MIRROR_MEDIA_DISK_CACHE_MAX_ENTRY_BYTES", 0), 0)
+# 한도를 넘으면 이 비율까지 줄여 두어 저장할 때마다 디렉터리를 훑지 않게 한다.
+EVICT_LOW_WATER_RATIO = 0.9
+# 이보다 오래된 임시 파일은 중간에 죽은 워커가 남긴 것으로 보고 정리한다.
+STALE_TEMP_SECONDS = 3600
+META_SUFFIX = ".meta"
+TEMP_PREFIX = ".tmp-"
+
+_STATE_LOCK = threading.Lock()
+_STATE = {"bytes": None}
+_FILLING = set()
+_EVICT_LOCK = threading.Lock()
+_COUNTERS = {
+    "hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "evictions": 0,
+    "errors": 0,
+    "hit_bytes": 0,
+    "stored_bytes": 0,
+    "store_fetch_ms": 0.0,
+}
+
+
+class MediaCacheEntry:
+    __slots__ = ("key", "path", "content_type", "length", "stored_at")
+
+    def __init__(self, key, path, content_type, length, stored_at):
+        self.key = key
+        self.path = path
+        self.content_type = content_type
+        self.length = length
+        self.stored_at = stored_at
+
+
+class MediaTooLarge(Exception):
+    """받는 중에 본문이 크기 한도를 넘은 경우. 쓰던 임시 파일은 지운다."""
+
+
+def _count(event, amount=1):
+    with _STATE_LOCK:
+        _COUNTERS[event] += amount
+
+
+def enabled():
+    return MEDIA_DISK_CACHE_MAX_BYTES > 0
+
+
+def cache_key(src):
+    return hashlib.sha256(src.encode("utf-8")).hexdigest()
+
+
+def _paths(key):
+    directory = os.path.join(os.path.abspath(MEDIA_DISK_CACHE_DIR), key[:2])
+    data_path = os.path.join(directory, key)
+    return directory, data_path, data_path + META_SUFFIX
+
+
+def max_entry_bytes():
+    if MEDIA_DISK_CACHE_MAX_ENTRY_BYTES:
+        return min(MEDIA_DISK_CACHE_MAX_ENTRY_BYTES, MEDIA_DISK_CACHE_MAX_BYTES)
+    return MEDIA_DISK_CACHE_MAX_BYTES // 8
+
+
+def lookup(key):
+    """저장된 항목이 온전하면 MediaCacheEntry, 아니면 None. 적중하면 최근 사용 시각을 갱신한다."""
+    _directory, data_path, meta_path = _paths(key)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as file_obj:
+            meta = json.load(file_obj)
+        length = int(meta["length"])
+        if os.stat(data_path).st_size != length:
+            return None
+        os.utime(meta_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        logger.warning("media cache entry unreadable: key=%s", key, exc_info=True)
+        _count("errors")
+        return None
+    return MediaCacheEntry(
+        key,
+        data_path,
+        meta.get("content_type") or "application/octet-stream",
+        length,
+        float(meta.get("stored_at") or 0.0),
+    )
+
+
+def record_hit(entry):
+    with _STATE_LOCK:
+        _COUNTERS["hits"] += 1
+        _COUNTERS["hit_bytes"] += entry.length
+
+
+def record_miss():
+    """캐시에 없어 upstream에서 받은 요청. 저장 여부(Range·HEAD, 크기 초과, 저장 실패)와 상관없이 센다."""
+    _count("misses")
+
+
+def record_error():
+    _count("errors")
+
+
+class MediaCacheWriter:
+    """받는 대로 임시 파일에 쓰다가 commit하면 제자리에 넣는다. 끝나면(commit·abort) 키 선점을 푼다."""
+
+    def __init__(self, key, content_type):
+        self.key = key
+        self.content_type = content_type
+        self.length = 0
+        self._directory, self._data_path, self._meta_path = _paths(key)
+        fd, self._temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=self._directory)
+        self._file = os.fdopen(fd, "wb")
+        self._done = False
+
+    def write(self, chunk):
+        self._file.write(chunk)
+        self.length += len(chunk)
+
+    def commit(self, fetch_ms=None):
+        """fetch_ms는 upstream에서 본문을 다 받는 데 걸린 시간. 적중으로 아낀 시간을 어림하는 데 쓴다."""
+        try:
+            self._file.close()
+            os.replace(self._temp_path, self._data_path)
+            stored_at = time.time()
+            meta = json.dumps({"content_type": self.content_type, "length": self.length, "stored_at": stored_at})
+            _write_atomic(self._directory, self._meta_path, lambda file_obj: file_obj.write(meta.encode("utf-8")))
+        except BaseException:
+            self.abort()
+            raise
+        self._done = True
+        _release(self.key)
+        with _STATE_LOCK:
+            _COUNTERS["stores"] += 1
+            _COUNTERS["stored_bytes"] += self.length
+            _COUNTERS["store_fetch_ms"] += fetch_ms or 0.0
+        _account(self.length)
+        return MediaCacheEntry(self.key, self._data_path, self.content_type, self.length, stored_at)
+
+    def abort(self):
+        if self._done:
+            return
+        self._done = True
+        try:
+            self._file.close()
+            os.unlink(self._temp_path)
+        except OSError:
+            pass
+        _release(self.key)
+
+
+def _release(key):
+    with _STATE_LOCK:
+        _FILLING.discard(key)
+
+
+def open_writer(key, content_type):
+    """key를 선점하고 MediaCacheWriter를 연다. 다른 요청이 이미 받는 중이거나 디렉터리를 못 쓰면 None."""
+    with _STATE_LOCK:
+        if key in _FILLING:
+            return None
+        _FILLING.add(key)
+    try:
+        os.makedirs(_paths(key)[0], exist_ok=True)
+        return MediaCacheWriter(key, content_type)
+    except OSError:
+        logger.warning("media cache directory unavailable: key=%s", key, exc_info=True)
+        _count("errors")
+        _release(key)
+        return None
+
+
+def _write_atomic(directory, path, write):
+    fd, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file_obj:
+            result = write(file_obj)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return result
+
+
+def store(key, chunks, content_type, max_bytes, fetch_ms=None):
+    """chunks를 끝까지 받아 저장하고 MediaCacheEntry를 돌려준다. 다른 요청이 받는 중이면 None.
+
+    max_bytes를 넘으면 MediaTooLarge. chunks나 디스크에서 난 오류는 그대로 올린다.
+    """
+    writer = open_writer(key, content_type)
+    if writer is None:
+        return None
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if writer.length + len(chunk) > max_bytes:
+                raise MediaTooLarge()
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.commit(fetch_ms)
+
+
+def _account(length):
+    """요청 경로에서는 크기만 더한다. 처음이거나 한도를 넘으면 정리는 백그라운드 스레드에 맡긴다."""
+    with _STATE_LOCK:
+        if _STATE["bytes"] is None:
+            need_scan = True
+        else:
+            _STATE["bytes"] += length
+            need_scan = _STATE["bytes"] > MEDIA_DISK_CACHE_MAX_BYTES
+    if need_scan:
+        _start_evict_background()
+
+
+def _evict_in_background():
+    try:
+        evict()
+    except Exception:
+        logger.warning("media cache eviction failed", exc_info=True)
+    finally:
+        _EVICT_LOCK.release()
+
+
+def _start_evict_background():
+    # 이미 정리 중이면 건너뛴다. 그 뒤에도 한도를 넘으면 다음 저장이 다시 건다.
+    if not _EVICT_LOCK.acquire(blocking=False):
+        return False
+    try:
+        thread = threading.Thread(target=_evict_in_background, name="mirror-media-cache-evict", daemon=True)
+        thread.start()
+        return True
+    except Exception:
+        _EVICT_LOCK.release()
+        raise
+
+
+def _scan():
+    """(최근 사용 시각, 크기, 본문 경로, meta 경로) 목록. 오래된 임시 파일은 이때 지운다."""
+    entries = []
+    now = time.time()
+    try:
+        buckets = list(os.scandir(os.path.abspath(MEDIA_DISK_CACHE_DIR)))
+    except FileNotFoundError:
+        return entries
+    for bucket in buckets:
+        if not bucket.is_dir():
+            continue
+        for item in os.scandir(bucket.path):
+            try:
+                if item.name.startswith(TEMP_PREFIX):
+                    if now - item.stat().st_mtime > STALE_TEMP_SECONDS:
+                        os.unlink(item.path)
+                    continue
+                if item.name.endswith(META_SUFFIX):
+                    if not os.path.exists(item.path[: -len(META_SUFFIX)]):
+                        os.unlink(item.path)
+                    continue
+                meta_path = item.path + META_SUFFIX
+                try:
+                    used_at = os.stat(meta_path).st_mtime
+                except FileNotFoundError:
+                    # 본문만 있고 meta가 없으면 쓰다 만 항목이니 가장 먼저 지운다.
+                    used_at = 0.0
+                entries.append((used_at, item.stat().st_size, item.path, meta_path))
+            except FileNotFoundError:
+                continue
+    return entries
+
+
+def evict(max_bytes=None):
+    """전체 크기가 max_bytes를 넘으면 최근에 안 쓴 항목부터 지워 낮은 수위까지 줄인다."""
+    limit = MEDIA_DISK_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = _scan()
+    total = sum(entry[1] for entry in entries)
+    evicted = 0
+    if total > limit:
+        target = int(limit * EVICT_LOW_WATER_RATIO)
+        for _used_at, size, data_path, meta_path in sorted(entries):
+            if total <= target:
+                break
+            for path in (meta_path, data_path):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    logger.warning("media cache evict failed: %s", path, exc_info=True)
+            total -= size
+            evicted += 1
+    with _STATE_LOCK:
+        _STATE["bytes"] = total
+        _COUNTERS["evictions"] += evicted
+    return evicted
+
+
+def media_cache_stats():
+    with _STATE_LOCK:
+        stats = dict(_COUNTERS)
+        stats["bytes"] = _STATE["bytes"]
+        stats["filling"] = len(_FILLING)
+    lookups = stats["hits"] + stats["misses"]
+    stats["enabled"] = enabled()
+    stats["max_bytes"] = MEDIA_DISK_CACHE_MAX_BYTES
+    stats["max_entry_bytes"] = max_entry_bytes()
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+    # 적중 한 번마다 upstream에서 받지 않은 바이트와, 저장한 본문을 받는 데 든 평균 시간만큼 아낀 것으로 어림한다.
+    stats["store_fetch_ms"] = round(stats["store_fetch_ms"], 1)
+    average_fetch_ms = stats["store_fetch_ms"] / stats["stores"] if stats["stores"] else 0.0
+    stats["saved_upstream_bytes"] = stats["hit_bytes"]
+    stats["saved_ms_estimate"] = round(average_fetch_ms * stats["hits"], 1)
+    return stats
+
+
+def reset_media_cache_stats():
+    with _STATE_LOCK:
+        for key in _COUNTERS:
+            _COUNTERS[key] = 0.0 if key == "store_fetch_ms" else 0
+        _STATE["bytes"] = None
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 import ipaddress
+import logging
 import os
 import re
 import socket
@@ -12,7 +13,12 @@ from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import requests
 from requests.adapters import HTTPAdapter
-from flask import Response, stream_with_context, url_for
+from flask import Response, send_file, stream_with_context, url_for
+
+from . import media_cache
+from .standin import standin_enabled, standin_url
+
+logger = logging.getLogger(__name__)
 
 
 def _env_int(name, default):
@@ -122,6 +128,24 @@ def _media_http_session():
     return session
 
 
+def _standin_http_session():
+    # 대역 서버는 루프백에 있으므로 공개 주소 고정 없이 보낸다.
+    session = getattr(_MEDIA_SESSION_LOCAL, "standin_session", None)
+    if session is None:
+        session = requests.Session()
+        session.trust_env = False
+        _MEDIA_SESSION_LOCAL.standin_session = session
+    return session
+
+
+def _standin_target(url):
+    """대역 서버로 보낼 URL. 대역 서버가 꺼져 있거나 DCInside 호스트가 아니면 None."""
+    if not standin_enabled():
+        return None
+    rewritten = standin_url(url)
+    return rewritten if rewritten != url else None
+
+
 def _pinned_media_adapter(target, *, shared=True):
     if not shared:
         return PinnedMediaAdapter(target)
@@ -138,6 +162,9 @@ def _pinned_media_adapter(target, *, shared=True):
 def _http_get(url, **kwargs):
     if requests.get is not _ORIGINAL_REQUESTS_GET:
         return requests.get(url, **kwargs)
+    standin_target = _standin_target(url)
+    if standin_target is not None:
+        return _standin_http_session().get(standin_target, **kwargs)
     target = resolve_media_target(url)
     if target is None:
         raise UnsafeMediaAddress("media host did not resolve exclusively to public addresses")
@@ -153,6 +180,9 @@ def _http_get(url, **kwargs):
 def _http_head(url, **kwargs):
     if requests.head is not _ORIGINAL_REQUESTS_HEAD:
         return requests.head(url, **kwargs)
+    standin_target = _standin_target(url)
+    if standin_target is not None:
+        return _standin_http_session().head(standin_target, **kwargs)
     target = resolve_media_target(url)
     if target is None:
         raise UnsafeMediaAddress("media host did not resolve exclusively to public addresses")
@@ -471,9 +501,38 @@ def stream_media_body(upstream, max_bytes=None):
         upstream.close()
 
 
-def build_streaming_media_response(upstream, content_type, content_length=None):
+def stream_and_cache_media_body(upstream, writer, content_length, fetch_started):
+    """upstream 본문을 그대로 내보내면서 디스크 캐시 임시 파일에도 쓴다. 끝까지 받았을 때만 저장한다."""
+    body = stream_media_body(upstream, max_bytes=content_length)
+    try:
+        for chunk in body:
+            if writer is not None:
+                try:
+                    writer.write(chunk)
+                except OSError:
+                    logger.warning("media cache write failed: key=%s", writer.key, exc_info=True)
+                    media_cache.record_error()
+                    writer.abort()
+                    writer = None
+            yield chunk
+        if writer is not None and writer.length == content_length:
+            try:
+                writer.commit((time.monotonic() - fetch_started) * 1000)
+            except OSError:
+                logger.warning("media cache commit failed: key=%s", writer.key, exc_info=True)
+                media_cache.record_error()
+    finally:
+        # 클라이언트가 끊었거나 upstream이 덜 보냈으면 쓰던 임시 파일을 버린다.
+        if writer is not None:
+            writer.abort()
+        body.close()
+
+
+def build_streaming_media_response(upstream, content_type, content_length=None, body=None):
+    if body is None:
+        body = stream_media_body(upstream, max_bytes=content_length)
     response = Response(
-        stream_with_context(stream_media_body(upstream, max_bytes=content_length)),
+        stream_with_context(body),
         status=upstream.status_code,
         direct_passthrough=True,
     )
@@ -581,7 +640,68 @@ def parse_media_content_length(headers):
     return parsed_values.pop(), None
 
 
+def build_cached_media_response(entry):
+    """디스크 캐시 파일을 그대로 보낸다. Range·조건부 요청은 send_file이, 전송은 WSGI 서버의 file_wrapper(sendfile)가 맡는다."""
+    try:
+        response = send_file(
+            entry.path,
+            mimetype=entry.content_type,
+            conditional=True,
+            etag=f"{entry.key[:32]}-{int(entry.stored_at)}",
+            max_age=MEDIA_CACHE_MAX_AGE,
+        )
+    except FileNotFoundError:
+        # 다른 워커가 방금 지웠다.
+        return None
+    response.headers["Cache-Control"] = f"public, max-age={MEDIA_CACHE_MAX_AGE}"
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    return response
+
+
+def _store_media_body(cache_key, body, content_type, fetch_started):
+    """이미 메모리에 다 받은 본문을 디스크 캐시에 넣는다. 실패해도 응답에는 영향을 주지 않는다."""
+    if len(body) > media_cache.max_entry_bytes():
+        return
+    try:
+        media_cache.store(
+            cache_key,
+            [body],
+            content_type,
+            media_cache.max_entry_bytes(),
+            fetch_ms=(time.monotonic() - fetch_started) * 1000,
+        )
+    except OSError:
+        logger.warning("media cache store failed: key=%s", cache_key, exc_info=True)
+        media_cache.record_error()
+
+
+def _cached_media_response(cache_key):
+    entry = media_cache.lookup(cache_key)
+    if entry is None:
+        return None
+    response = build_cached_media_response(entry)
+    if response is not None:
+        media_cache.record_hit(entry)
+    return response
+
+
 def build_media_response(src, board, pid, kind=None, range_header=None, head_only=False):
+    if not media_cache.enabled():
+        return _build_upstream_media_response(src, board, pid, kind, range_header, head_only)
+    cache_key = media_cache.cache_key(src)
+    response = _cached_media_response(cache_key)
+    if response is not None:
+        return response
+    # 여기서부터는 어느 경로로 중계하든(저장하든 말든) 미스다.
+    media_cache.record_miss()
+    # Range·HEAD 요청은 전체 본문을 받지 않으므로 저장하지 않고 예전처럼 중계한다.
+    if head_only or normalize_range_header(range_header):
+        return _build_upstream_media_response(src, board, pid, kind, range_header, head_only)
+    return _build_upstream_media_response(src, board, pid, kind, range_header, head_only, cache_key=cache_key)
+
+
+def _build_upstream_media_response(src, board, pid, kind, range_header, head_only, cache_key=None):
+    fetch_started = time.monotonic()
     headers = {
         "Accept-Encoding": "identity",
         "User-Agent": PC_USER_AGENT,
@@ -618,6 +738,22 @@ def build_media_response(src, board, pid, kind=None, range_header=None, head_onl
     if head_only:
         verified_length = content_length if can_stream_decoded_body else None
         return build_head_media_response(upstream, content_type, content_length=verified_length)
+    if (
+        cache_key is not None
+        and upstream.status_code == 200
+        and can_stream_decoded_body
+        and content_length is not None
+        and content_length <= media_cache.max_entry_bytes()
+    ):
+        # 받는 대로 클라이언트에 흘려보내면서 임시 파일에도 쓴다. 같은 키를 다른 요청이 받는 중이면 중계만 한다.
+        writer = media_cache.open_writer(cache_key, content_type)
+        if writer is not None:
+            return build_streaming_media_response(
+                upstream,
+                content_type,
+                content_length=content_length,
+                body=stream_and_cache_media_body(upstream, writer, content_length, fetch_started),
+            )
     if can_stream_decoded_body and is_streaming_media_response(content_type, upstream.status_code, normalized_range):
         if content_length is not None:
             return build_streaming_media_response(upstream, content_type, content_length=content_length)
@@ -635,6 +771,8 @@ def build_media_response(src, board, pid, kind=None, range_header=None, head_onl
     body, error_status = read_limited_media_body(upstream)
     if error_status:
         return "", error_status
+    if cache_key is not None and upstream.status_code == 200:
+        _store_media_body(cache_key, body or b"", content_type, fetch_started)
 
     response = Response(body or b"", status=upstream.status_code)
     response.headers["Content-Type"] = content_type
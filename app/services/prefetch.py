@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+
+from .admission import upstream_allowed
+from .async_bridge import schedule_single_flight
+from .cache_utils import TTLCache, env_int
+from .dc import api as dc_api
+from .dc.limiter import PRIORITY_BACKGROUND, circuit_open, run_with_priority
+
+
+def _env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
+PREFETCH_ENABLED = _env_bool("MIRROR_PREFETCH", False)
+PREFETCH_MAX_CONCURRENCY = max(env_int("MIRROR_PREFETCH_MAX_CONCURRENCY", 2), 1)
+PREFETCH_DEDUPE_WINDOW = max(env_int("MIRROR_PREFETCH_DEDUPE_WINDOW", 30), 0)
+# upstream rate limit 응답을 본 뒤 이 시간(초) 동안은 미리 가져오기를 멈춘다.
+PREFETCH_RATE_LIMIT_COOLDOWN = max(env_int("MIRROR_PREFETCH_RATE_LIMIT_COOLDOWN", 300), 0)
+# 미리 가져온 항목을 실제 요청이 쓰면 적중으로 센다. 캐시 TTL과 비슷하게 잡는다.
+PREFETCH_HIT_WINDOW = max(env_int("MIRROR_PREFETCH_HIT_WINDOW", 60), 1)
+PREFETCH_TRACK_MAX_ITEMS = 2048
+
+_RECENT_PREFETCHES = TTLCache(PREFETCH_TRACK_MAX_ITEMS)
+_WARMED_KEYS = TTLCache(PREFETCH_TRACK_MAX_ITEMS)
+_PREFETCH_LOCK = threading.Lock()
+_PREFETCH_STATE = {"inflight": 0}
+_PREFETCH_COUNTERS = {
+    "scheduled": 0,
+    "completed": 0,
+    "failed": 0,
+    "hits": 0,
+    "skipped_disabled": 0,
+    "skipped_duplicate": 0,
+    "skipped_busy": 0,
+    "skipped_rate_limited": 0,
+}
+
+
+def _count(event, amount=1):
+    _PREFETCH_COUNTERS[event] += amount
+
+
+def _rate_limit_active(now):
+    if PREFETCH_RATE_LIMIT_COOLDOWN <= 0:
+        return False
+    last_at = dc_api.last_rate_limited_at()
+    return bool(last_at) and now - last_at < PREFETCH_RATE_LIMIT_COOLDOWN
+
+
+def schedule_prefetch(key, coro_factory):
+    """key에 해당하는 upstream 조회를 백그라운드 루프에서 미리 돌린다. 예약되면 True.
+
+    꺼져 있거나, 최근 rate limit을 봤거나, 요청이 넘쳐 캐시로만 답하는 중이거나, 같은 key를 dedupe 창
+    안에 이미 예약했거나, 동시 실행 상한에 닿았으면 건너뛴다. 응답 경로를 막지 않도록 대기열은 두지 않는다.
+    """
+    now = time.time()
+    with _PREFETCH_LOCK:
+        if not PREFETCH_ENABLED:
+            _count("skipped_disabled")
+            return False
+        if _rate_limit_active(now) or circuit_open() or not upstream_allowed():
+            _count("skipped_rate_limited")
+            return False
+        if _RECENT_PREFETCHES.get(key, now=now) is not None:
+            _count("skipped_duplicate")
+            return False
+        if _PREFETCH_STATE["inflight"] >= PREFETCH_MAX_CONCURRENCY:
+            _count("skipped_busy")
+            return False
+        _PREFETCH_STATE["inflight"] += 1
+        _RECENT_PREFETCHES.set(key, now, now + PREFETCH_DEDUPE_WINDOW, now=now)
+        _count("scheduled")
+
+    def _finish(future):
+        finished_at = time.time()
+        with _PREFETCH_LOCK:
+            _PREFETCH_STATE["inflight"] -= 1
+            if future.cancelled() or future.exception() is not None:
+                _count("failed")
+                return
+            _count("completed")
+            _WARMED_KEYS.set(key, finished_at, finished_at + PREFETCH_HIT_WINDOW, now=finished_at)
+
+    try:
+        future = schedule_single_flight(
+            ("prefetch",) + tuple(key),
+            lambda: run_with_priority(PRIORITY_BACKGROUND, coro_factory),
+        )
+    except Exception:
+        _finish_failed_schedule(key)
+        return False
+    future.add_done_callback(_finish)
+    return True
+
+
+def _finish_failed_schedule(key):
+    with _PREFETCH_LOCK:
+        _PREFETCH_STATE["inflight"] -= 1
+        _RECENT_PREFETCHES.pop(key, None)
+        _count("failed")
+
+
+def record_prefetch_use(key):
+    """실제 요청이 key를 쓸 때 부른다. 미리 가져온 항목이면 적중으로 센다."""
+    now = time.time()
+    with _PREFETCH_LOCK:
+        if _WARMED_KEYS.get(key, now=now) is None:
+            return False
+        _WARMED_KEYS.pop(key, None)
+        _count("hits")
+        return True
+
+
+def prefetch_stats():
+    with _PREFETCH_LOCK:
+        stats = dict(_PREFETCH_COUNTERS)
+        stats["inflight"] = _PREFETCH_STATE["inflight"]
+    stats["enabled"] = PREFETCH_ENABLED
+    stats["hit_rate"] = round(stats["hits"] / stats["completed"], 4) if stats["completed"] else None
+    return stats
+
+
+def reset_prefetch_state():
+    with _PREFETCH_LOCK:
+        _RECENT_PREFETCHES.clear()
+        _WARMED_KEYS.clear()
+        for event in _PREFETCH_COUNTERS:
+            _PREFETCH_COUNTERS[event] = 0
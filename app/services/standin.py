@@ -0,0 +1,40 @@
+import logging
+import os
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+STANDIN_HOST_SUFFIXES = ("dcinside.com", "dcinside.co.kr")
+
+
+def _configured_standin_url():
+    url = (os.getenv("MIRROR_DC_STANDIN_URL") or "").strip().rstrip("/")
+    # create_app과 같이 MIRROR_ENV가 없으면 production으로 본다. 대역 서버로 가는 미디어 요청은
+    # 공개 주소 고정을 건너뛰므로 development라고 명시했을 때만 켠다.
+    if url and os.getenv("MIRROR_ENV", "production").strip().lower() != "development":
+        logger.warning("MIRROR_DC_STANDIN_URL is ignored unless MIRROR_ENV=development")
+        return ""
+    return url
+
+
+# 개발·벤치마크용: 설정하면 DCInside로 가는 요청(목록·본문·댓글·투표·미디어)을 오프라인 대역 서버
+# (scripts/dc_standin.py)로 보낸다. 원래 호스트는 경로 첫 단계로 넘긴다.
+STANDIN_URL = _configured_standin_url()
+
+
+def standin_enabled():
+    return bool(STANDIN_URL)
+
+
+def standin_url(url):
+    """대역 서버가 켜져 있으면 DCInside URL을 대역 서버 URL로 바꾼다. 아니면 그대로 돌려준다."""
+    if not STANDIN_URL:
+        return url
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if not any(host == suffix or host.endswith(f".{suffix}") for suffix in STANDIN_HOST_SUFFIXES):
+        return url
+    rewritten = f"{STANDIN_URL}/{host}{parsed.path or '/'}"
+    if parsed.query:
+        rewritten += f"?{parsed.query}"
+    return rewritten
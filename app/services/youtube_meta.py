@@ -13,7 +13,8 @@ import time
 
 import requests
 
-from .cache_utils import cache_get, cache_set_after_insert, env_int
+from .admission import upstream_allowed
+from .cache_utils import TTLCache, cache_get, cache_set_after_insert, env_int
 
 YOUTUBE_FRAME0_URL = "https://i.ytimg.com/vi/{}/frame0.jpg"
 YOUTUBE_SHORTS_PROBE_URL = "https://www.youtube.com/shorts/{}"
@@ -35,7 +36,7 @@ REQUEST_TIME_BUDGET_SECONDS = env_int("MIRROR_YT_REQUEST_TIME_BUDGET", 6)
 # 캐시에 저장하는 판별 실패 표식. video_size()는 실패를 None으로 되돌려 준다.
 SIZE_UNKNOWN = "unknown"
 
-_size_cache = {}
+_size_cache = TTLCache(SIZE_CACHE_MAX_ITEMS)
 _size_lock = threading.Lock()
 
 _probe_rate = {"window_start": 0.0, "used": 0}
@@ -142,6 +143,8 @@ def video_size(video_id, deadline=None):
         return None if cached == SIZE_UNKNOWN else cached
     if deadline is not None and time.monotonic() >= deadline:
         return None
+    if not upstream_allowed():
+        return None
     if not _acquire_probe_slot():
         return None
     size = probe_frame0_size(video_id)
@@ -0,0 +1,4 @@
+from app.async_server import create_async_app
+
+
+app = create_async_app()
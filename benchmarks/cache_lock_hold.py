@@ -0,0 +1,80 @@
+"""캐시 저장 시 잠금 보유 시간 비교: 정렬 기반 prune(이전) vs TTLCache(현재).
+
+    python benchmarks/cache_lock_hold.py [--items 8192] [--sets 4000]
+
+가득 찬 캐시에 새 키를 계속 넣어 매 저장마다 축출이 일어나는 최악 경로를 잰다.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.cache_utils import TTLCache  # noqa: E402
+
+
+def legacy_prune(cache, now, max_items):
+    expired_keys = [key for key, entry in cache.items() if entry["expires_at"] <= now]
+    for key in expired_keys:
+        cache.pop(key, None)
+    overflow = len(cache) - max(max_items, 0)
+    if overflow <= 0:
+        return
+    oldest_keys = sorted(cache, key=lambda key: cache[key]["expires_at"])[:overflow]
+    for key in oldest_keys:
+        cache.pop(key, None)
+
+
+def legacy_set(cache, lock, key, value, ttl, max_items):
+    with lock:
+        started = time.perf_counter()
+        now = time.time()
+        cache[key] = {"value": value, "expires_at": now + ttl}
+        if len(cache) > max_items:
+            legacy_prune(cache, now, max_items)
+        return time.perf_counter() - started
+
+
+def ttl_cache_set(cache, lock, key, value, ttl, max_items):
+    with lock:
+        started = time.perf_counter()
+        now = time.time()
+        cache.set(key, value, now + ttl, max_items=max_items, now=now)
+        return time.perf_counter() - started
+
+
+def measure(label, cache, setter, items, sets):
+    lock = threading.Lock()
+    for index in range(items):
+        setter(cache, lock, ("warm", index), index, 3600, items)
+    samples = [setter(cache, lock, ("hot", index), index, 3600, items) for index in range(sets)]
+    samples.sort()
+    micros = [sample * 1_000_000 for sample in samples]
+    print(
+        "%-10s items=%d sets=%d mean=%.1fus p50=%.1fus p99=%.1fus max=%.1fus"
+        % (
+            label,
+            items,
+            sets,
+            statistics.fmean(micros),
+            micros[len(micros) // 2],
+            micros[int(len(micros) * 0.99) - 1],
+            micros[-1],
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=8192)
+    parser.add_argument("--sets", type=int, default=4000)
+    args = parser.parse_args()
+    measure("legacy", {}, legacy_set, args.items, args.sets)
+    measure("ttlcache", TTLCache(), ttl_cache_set, args.items, args.sets)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""캐시 적중 경로의 할당량·지연 비교: 행마다 dict 복사(이전) vs FrozenRow 공유(현재).
+
+    python benchmarks/cached_row_copy.py [--comments 200] [--rows 200] [--hits 2000]
+
+게시글 캐시 적중(댓글 N개)과 게시판 캐시 적중(행 N개)에서 캐시 조회 뒤 호출자에게
+돌려줄 값을 만드는 비용만 잰다. 할당량은 tracemalloc으로 적중 한 번당 바이트를 센다.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import core  # noqa: E402
+
+
+def _comment(index):
+    return {
+        "time": "2026-01-01 12:00",
+        "contents": "comment %d" % index,
+        "author": "ㅇㅇ",
+        "author_code": "1.2",
+        "author_role": None,
+        "parent_id": str(index),
+        "is_reply": False,
+        "dccon": None,
+    }
+
+
+def _row(index):
+    return {
+        "id": str(100000 + index),
+        "subject": None,
+        "title": "title %d" % index,
+        "has_image": False,
+        "has_video": False,
+        "author": "ㅇㅇ",
+        "author_code": "1.2",
+        "author_role": None,
+        "time": "2026-01-01 12:00",
+        "time_display": "12:00",
+        "needs_time_hydrate": False,
+        "comment_count": 3,
+        "voteup_count": 1,
+        "view_count": 20,
+        "isimage": False,
+        "isvideo": False,
+        "isrecommend": False,
+        "isdcbest": False,
+        "ishit": False,
+        "is_mobile_source": True,
+    }
+
+
+def legacy_copy_rows(rows):
+    return [dict(row) for row in (rows or [])]
+
+
+def legacy_copy_read_payload(payload):
+    data, comments, images = payload
+    copied_data = dict(data or {})
+    if "related_posts" in copied_data:
+        copied_data["related_posts"] = legacy_copy_rows(copied_data.get("related_posts"))
+    return copied_data, legacy_copy_rows(comments), list(images or [])
+
+
+def _payloads(comment_count, row_count, frozen):
+    wrap = core.FrozenRow if frozen else dict
+    related = [wrap(_row(index)) for index in range(core.RELATED_LIMIT)]
+    read_payload = (
+        {"title": "title", "html": "<p>body</p>", "related_posts": related},
+        [wrap(_comment(index)) for index in range(comment_count)],
+        ["https://img.dcinside.com/%d.jpg" % index for index in range(4)],
+    )
+    board_rows = [wrap(_row(index)) for index in range(row_count)]
+    return read_payload, board_rows
+
+
+def measure(label, func, hits):
+    func()
+    tracemalloc.start()
+    before, _peak = tracemalloc.get_traced_memory()
+    kept = [func() for _ in range(100)]
+    after, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    bytes_per_hit = (after - before) / len(kept)
+    del kept
+
+    samples = []
+    for _ in range(hits):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    micros = [sample * 1_000_000 for sample in samples]
+    print(
+        "%-18s bytes/hit=%8.0f mean=%.1fus p50=%.1fus p99=%.1fus"
+        % (
+            label,
+            bytes_per_hit,
+            statistics.fmean(micros),
+            micros[len(micros) // 2],
+            micros[int(len(micros) * 0.99) - 1],
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--comments", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--hits", type=int, default=2000)
+    args = parser.parse_args()
+
+    legacy_read, legacy_rows = _payloads(args.comments, args.rows, frozen=False)
+    frozen_read, frozen_rows = _payloads(args.comments, args.rows, frozen=True)
+    measure("legacy read hit", lambda: legacy_copy_read_payload(legacy_read), args.hits)
+    measure("frozen read hit", lambda: core._copy_read_payload(frozen_read), args.hits)
+    measure("legacy board hit", lambda: legacy_copy_rows(legacy_rows), args.hits)
+    measure("frozen board hit", lambda: core._copy_rows(frozen_rows), args.hits)
+
+
+if __name__ == "__main__":
+    main()
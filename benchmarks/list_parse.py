@@ -0,0 +1,182 @@
+"""게시판 목록 파싱 비교: 전체 트리(lxml.html.fromstring, 이전) vs 페이지 이동 영역에서 멈추는 파싱(현재).
+
+    python benchmarks/list_parse.py [--rows 30] [--tail-kb 120] [--repeat 200]
+    python benchmarks/list_parse.py --mobile captured_mobile.html --pc captured_pc.html
+
+--mobile/--pc를 주지 않으면 실제 목록 페이지 구조(말머리 탭, 목록, 페이지 이동 뒤에
+광고·스크립트 꼬리)를 흉내 낸 합성 페이지를 쓴다. 두 파서의 결과는 행·페이지 정보·
+말머리 탭 단위로 같은지 먼저 확인하고, 다르면 측정하지 않고 종료한다. 메모리는
+libxml2가 tracemalloc 밖에서 할당하므로 트리 노드 수로 비교한다.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lxml.html  # noqa: E402
+
+from app.services.dc.api import API  # noqa: E402
+from app.services.dc.parsers import parse_list_page  # noqa: E402
+
+MOBILE_URL = "https://m.dcinside.com/board/test?page=2"
+PC_URL = "https://gall.dcinside.com/board/lists/?id=test&page=2&list_num=30"
+
+
+def _tail(tail_kb):
+    block = (
+        '<div class="adv-groupin"><iframe src="https://ad.example.test/slot"></iframe>'
+        '<a href="https://ad.example.test/"><img src="https://ad.example.test/banner.jpg"></a></div>'
+        "<script>window.dataLayer=window.dataLayer||[];dataLayer.push({event:'slot',id:%d});</script>"
+        '<ul class="right-rank"><li><a href="/board/other">other %d</a></li></ul>'
+    )
+    parts = []
+    size = 0
+    index = 0
+    while size < tail_kb * 1024:
+        part = block % (index, index)
+        parts.append(part)
+        size += len(part)
+        index += 1
+    return "".join(parts)
+
+
+def synthetic_mobile_page(rows, tail_kb):
+    tabs = "".join(
+        '<li class="%s"><a href="javascript:headText_change(%d)">tab %d</a></li>' % ("on" if index == 0 else "", index, index)
+        for index in range(6)
+    )
+    items = "".join(
+        '<li><div class="gall-detail-lnktb"><a class="lt" href="https://m.dcinside.com/board/test/%d?page=2">'
+        '<span class="subject-add"><span class="sp-lst sp-lst-txt"></span><span class="subjectin">title %d</span></span>'
+        '<ul class="ginfo"><li>일반</li><li>ㅇㅇ<span class="blockInfo" data-info="1.%d"></span></li>'
+        "<li>12:%02d</li><li>조회 %d</li><li>추천 %d</li></ul></a>"
+        '<a class="rt" href="https://m.dcinside.com/board/test/%d#comment_box"><span class="ct">%d</span></a></div></li>'
+        '<li class="adv-inner"><div class="ad">ad</div></li>'
+        % (900000 - index, index, index % 255, index % 60, index * 3, index % 7, 900000 - index, index % 11)
+        for index in range(rows)
+    )
+    pagination = (
+        '<div id="pagination_div"><div class="paging-inner">'
+        '<a href="https://m.dcinside.com/board/test?page=1">1</a><strong>2</strong>'
+        '<a href="https://m.dcinside.com/board/test?page=3">3</a></div></div>'
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>test</title>'
+        "<script>var boardId='test';</script></head><body>"
+        '<ul class="mal-lst">%s</ul><ul class="gall-detail-lst">%s</ul>%s%s</body></html>'
+        % (tabs, items, pagination, _tail(tail_kb))
+    )
+
+
+def synthetic_pc_page(rows, tail_kb):
+    items = "".join(
+        '<tr class="ub-content us-post" data-no="%d" data-type="icon_pic">'
+        '<td class="gall_num">%d</td><td class="gall_subject">일반</td>'
+        '<td class="gall_tit ub-word"><a href="/board/view/?id=test&no=%d&page=2"><em class="icon_img icon_pic"></em>title %d</a>'
+        '<a class="reply_numbox" href="#"><span class="reply_num">[%d]</span></a></td>'
+        '<td class="gall_writer ub-writer" data-nick="ㅇㅇ" data-ip="1.%d"></td>'
+        '<td class="gall_date" title="2026.04.16 12:%02d:00">12:%02d</td>'
+        '<td class="gall_count">%d</td><td class="gall_recommend">%d</td></tr>'
+        % (900000 - index, 900000 - index, 900000 - index, index, index % 11, index % 255, index % 60, index % 60, index * 3, index % 7)
+        for index in range(rows)
+    )
+    pagination = (
+        '<div class="bottom_paging_wrap"><div class="bottom_paging_box">'
+        '<a href="/board/lists/?id=test&page=1">1</a><em>2</em>'
+        '<a href="/board/lists/?id=test&page=3">3</a>'
+        '<a class="search_next" href="/board/lists/?id=test&page=3&search_pos=-1">다음검색</a></div></div>'
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>test</title></head><body>'
+        '<div class="gall_listwrap"><table class="gall_list"><tbody>%s</tbody></table></div>%s%s</body></html>'
+        % (items, pagination, _tail(tail_kb))
+    )
+
+
+def _row_fields(item):
+    return tuple(
+        (name, getattr(item, name))
+        for name in item.__slots__
+        if name not in {"document", "comments"}
+    )
+
+
+def extract(api, parsed, url, board_id="test"):
+    rows = api._API__parse_board_rows(parsed, board_id, is_mobile_source=api._API__is_mobile_request(url))
+    return {
+        "rows": [_row_fields(item) for item in rows],
+        "pagination": api._API__parse_board_pagination(parsed, url),
+        "headtexts": api._API__parse_mobile_headtext_tabs(parsed),
+    }
+
+
+def _timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return [sample * 1000 for sample in samples]
+
+
+def compare(label, api, text, url, repeat):
+    full_tree = lxml.html.fromstring(text)
+    streamed_tree = parse_list_page(text)
+    full = extract(api, full_tree, url)
+    streamed = extract(api, streamed_tree, url)
+    if full != streamed:
+        for index, (left, right) in enumerate(zip(full["rows"], streamed["rows"])):
+            if left != right:
+                print("%s: row %d differs\n  full=%r\n  streamed=%r" % (label, index, left, right))
+                break
+        raise SystemExit("%s: parsers disagree (rows %d vs %d)" % (label, len(full["rows"]), len(streamed["rows"])))
+
+    print(
+        "%s: %d KB, %d rows match, nodes full=%d streamed=%d"
+        % (
+            label,
+            len(text.encode("utf-8")) // 1024,
+            len(full["rows"]),
+            sum(1 for _ in full_tree.iter()),
+            sum(1 for _ in streamed_tree.iter()),
+        )
+    )
+    for name, parse in (("full", lxml.html.fromstring), ("streamed", parse_list_page)):
+        for stage, func in (
+            ("parse", lambda: parse(text)),
+            ("parse+rows", lambda: extract(api, parse(text), url)),
+        ):
+            millis = _timed(func, repeat)
+            print(
+                "  %-9s %-11s mean=%.3fms p50=%.3fms p99=%.3fms"
+                % (name, stage, statistics.fmean(millis), millis[len(millis) // 2], millis[int(len(millis) * 0.99) - 1])
+            )
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as file_obj:
+        return file_obj.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--tail-kb", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--mobile", help="저장해 둔 모바일 목록 HTML")
+    parser.add_argument("--pc", help="저장해 둔 PC 목록 HTML")
+    args = parser.parse_args()
+
+    api = API.__new__(API)
+    mobile = _read(args.mobile) if args.mobile else synthetic_mobile_page(args.rows, args.tail_kb)
+    pc = _read(args.pc) if args.pc else synthetic_pc_page(args.rows, args.tail_kb)
+    compare("mobile", api, mobile, MOBILE_URL, args.repeat)
+    compare("pc", api, pc, PC_URL, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""동시 부하에서 이벤트 루프 지연 비교: 루프에서 바로 파싱(이전) vs 파싱 스레드(현재).
+
+    python benchmarks/parse_offload.py [--rows 200] [--concurrency 12] [--requests 10]
+                                       [--latency-ms 20] [--workers 2]
+
+대역 서버(scripts/dc_standin.py)를 같은 프로세스에 띄우고, 하나의 이벤트 루프에서 동시에
+--concurrency개 작업이 --rows행짜리 목록 페이지를 --requests번씩 읽는다. 그동안 10ms마다
+깨어나는 탐침이 예정보다 늦게 깨어난 시간(루프 지연)을 모은다. 지연이 크면 파싱하는 동안
+다른 요청의 I/O가 멈춰 있었다는 뜻이다. 속도 제한은 끄고 잰다.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["MIRROR_DC_HOST_RATE"] = "0"
+os.environ.setdefault("MIRROR_BOARD_KIND_STORE_PATH", "")
+
+from aiohttp import web  # noqa: E402
+
+from app.services import standin  # noqa: E402
+from app.services.dc import api as dc_api  # noqa: E402
+from scripts.dc_standin import StandinConfig, create_app  # noqa: E402
+
+PROBE_INTERVAL = 0.01
+
+
+async def _probe(samples, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def _reader(api, rows, requests):
+    for _ in range(requests):
+        items = [item async for item in api.board("standin", num=rows, kind="normal")]
+        if len(items) != rows:
+            raise SystemExit("expected %d rows, got %d" % (rows, len(items)))
+
+
+async def run(label, args):
+    samples = []
+    stop = asyncio.Event()
+    async with dc_api.API() as api:
+        probe = asyncio.ensure_future(_probe(samples, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(_reader(api, args.rows, args.requests) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+    samples.sort()
+    pages = args.concurrency * args.requests
+    print(
+        "%-8s pages/sec=%7.1f loop lag p50=%6.1fms p99=%6.1fms max=%6.1fms"
+        % (
+            label,
+            pages / elapsed,
+            statistics.median(samples) * 1000,
+            samples[max(int(len(samples) * 0.99) - 1, 0)] * 1000,
+            samples[-1] * 1000,
+        )
+    )
+
+
+async def main_async(args):
+    app = create_app(StandinConfig(latency_ms=args.latency_ms, list_rows=args.rows, seed=1))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    standin.STANDIN_URL = "http://127.0.0.1:%d" % runner.addresses[0][1]
+    try:
+        dc_api._PARSE_EXECUTOR = None
+        await run("inline", args)
+        dc_api._PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="mirror-dc-parse")
+        await run("executor", args)
+        dc_api._PARSE_EXECUTOR.shutdown()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--latency-ms", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2, help="파싱 스레드 수(MIRROR_DC_PARSE_WORKERS)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
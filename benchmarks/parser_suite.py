@@ -0,0 +1,271 @@
+"""파서 함수별 처리량(ops/sec)과 할당량을 재고 JSON 기준선과 비교한다.
+
+    make bench-parsers                  # 기준선과 비교, 임계값을 넘게 나빠지면 실패(종료 코드 1)
+    make bench-parsers-baseline         # 지금 결과로 기준선 갱신
+    python benchmarks/parser_suite.py [--corpus DIR] [--baseline PATH] [--threshold 0.25]
+                                      [--min-time 1.0] [--only pc_board_row] [--update-baseline]
+
+--corpus 폴더(기본 benchmarks/corpus)에 저장해 둔 페이지가 있으면 그것을, 없으면 대역 서버
+(scripts/dc_standin.py)의 합성 페이지를 쓴다. 파일 이름은 CORPUS 목록의 이름에 .html
+(댓글 JSON은 .json)을 붙인다. 할당은 tracemalloc이 보는 파이썬 쪽 할당의 op당 최대 증가량이고
+libxml2 내부 할당은 잡히지 않는다. ops/sec은 기계 속도와 그때그때의 부하에 따라 달라지므로, 같은 실행에서
+고정된 기준 작업(작은 HTML 파싱 + XPath)도 함께 재서 기준선을 그 비율만큼 보정한 뒤 비교한다.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import lxml.html  # noqa: E402
+
+from app.services.dc.api import API  # noqa: E402
+from app.services.dc.parsers import xpath  # noqa: E402
+from scripts import dc_standin  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "parser_baseline.json")
+BOARD_ID = "standin"
+DOCUMENT_ID = "900000"
+MEASURE_ROUNDS = 5
+CONFIRM_RUNS = 3
+
+
+def _pc_list(prefix):
+    page = dc_standin.pc_list_page(BOARD_ID, 1, 50)
+    return page.replace('href="/board/view/', 'href="%s/board/view/' % prefix) if prefix else page
+
+
+def _mobile_view_with_comments():
+    page = dc_standin.mobile_view_page(BOARD_ID, DOCUMENT_ID, with_poll=False)
+    comments = dc_standin.mobile_comment_page(DOCUMENT_ID, 1, 40)
+    comment_list = comments[comments.index("<ul"):comments.index("</ul>") + len("</ul>")]
+    return page.replace(
+        "</body>",
+        '<div class="all-comment-tit"><span class="ct">[40]</span></div>%s</body>' % comment_list,
+    )
+
+
+# 이름: (합성 페이지, 게시판 종류)
+CORPUS = {
+    "mobile_list": (lambda: dc_standin.mobile_list_page(BOARD_ID, 1, 50), "normal"),
+    "mobile_list_minor": (lambda: dc_standin.mobile_list_page(BOARD_ID, 1, 50), "minor"),
+    "mobile_list_mini": (
+        lambda: dc_standin.mobile_list_page(BOARD_ID, 1, 50).replace("m.dcinside.com/board/", "m.dcinside.com/mini/"),
+        "mini",
+    ),
+    "pc_list": (lambda: _pc_list(""), "normal"),
+    "pc_list_minor": (lambda: _pc_list("/mgallery"), "minor"),
+    "pc_list_mini": (lambda: _pc_list("/mini"), "mini"),
+    "pc_list_person": (lambda: _pc_list("/person"), "person"),
+    "mobile_view": (_mobile_view_with_comments, "normal"),
+    "pc_view": (lambda: dc_standin.pc_view_page(BOARD_ID, DOCUMENT_ID), "normal"),
+    "pc_comments": (lambda: dc_standin.pc_comment_page(DOCUMENT_ID, 1, 100), "normal"),
+}
+
+
+def load_corpus(corpus_dir):
+    pages = {}
+    for name, (build, kind) in CORPUS.items():
+        extension = "json" if name == "pc_comments" else "html"
+        path = os.path.join(corpus_dir, "%s.%s" % (name, extension))
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as file_obj:
+                pages[name] = (file_obj.read(), kind, "captured")
+        else:
+            pages[name] = (build(), kind, "synthetic")
+    return pages
+
+
+def _head_container(parsed):
+    for expr in (
+        "//div[contains(@class, 'gallview-tit-box')]",
+        "//div[@class='gall-tit-box']",
+        "//div[contains(@class, 'gallview_head')]",
+    ):
+        nodes = xpath(parsed, expr)
+        if nodes:
+            return nodes[0]
+    raise SystemExit("document header not found")
+
+
+CALIBRATION_PAGE = "<ul>%s</ul>" % "".join('<li class="r"><a href="/x/%d">t%d</a></li>' % (i, i) for i in range(20))
+
+
+def _calibration_op(page):
+    return [node.get("href") for node in xpath(lxml.html.fromstring(page), "//li[@class='r']/a")]
+
+
+def build_cases(api, pages):
+    """(측정 이름, 한 번에 돌릴 입력 목록, 입력 하나를 처리하는 함수) 목록."""
+    cases = []
+    for name, (text, kind, _source) in pages.items():
+        if name.startswith("mobile_list"):
+            rows = [
+                row
+                for row in xpath(lxml.html.fromstring(text), "//ul[contains(@class, 'gall-detail-lst')]/li")
+                if not row.get("class", "").startswith("ad")
+            ]
+            cases.append((
+                "mobile_list_item/%s" % name,
+                rows,
+                lambda row, kind=kind: api._API__parse_mobile_list_item(row, BOARD_ID, kind=kind),
+            ))
+        elif name.startswith("pc_list"):
+            rows = xpath(lxml.html.fromstring(text), "//tr[contains(@class, 'ub-content') and contains(@class, 'us-post')]")
+            cases.append((
+                "pc_board_row/%s" % name,
+                rows,
+                lambda row, kind=kind: api._API__parse_pc_board_row(row, BOARD_ID, kind=kind),
+            ))
+        elif name in {"mobile_view", "pc_view"}:
+            parsed = lxml.html.fromstring(text)
+            cases.append(("document_header/%s" % name, [_head_container(parsed)], api._API__parse_document_header))
+            if name == "mobile_view":
+                cases.append(("embedded_mobile_comments/%s" % name, [parsed], api._API__parse_embedded_mobile_comments))
+        elif name == "pc_comments":
+            cases.append(("pc_comment/%s" % name, json.loads(text)["comments"], api._API__parse_pc_comment))
+    return cases
+
+
+def measure(inputs, func, min_time):
+    if not inputs:
+        raise SystemExit("empty benchmark input")
+    for item in inputs:
+        func(item)
+
+    # 잡음을 줄이려고 여러 번 나눠 재고 중앙값을 쓴다.
+    rounds = []
+    for _ in range(MEASURE_ROUNDS):
+        ops = 0
+        started = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time / MEASURE_ROUNDS:
+            for item in inputs:
+                func(item)
+            ops += len(inputs)
+            elapsed = time.perf_counter() - started
+        rounds.append(ops / elapsed)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        results = [func(item) for item in inputs]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return {
+        "ops_per_sec": round(statistics.median(rounds), 1),
+        "alloc_bytes_per_op": round(max(peak - before, 0) / len(inputs), 1),
+        "inputs": len(inputs),
+    }
+
+
+def _slower(result, base, threshold, speed):
+    return result["ops_per_sec"] < base["ops_per_sec"] * speed * (1 - threshold)
+
+
+def compare(results, baseline, threshold, speed=1.0):
+    """speed는 이번 실행의 기준 작업 처리량 / 기준선의 기준 작업 처리량."""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if _slower(result, base, threshold, speed):
+            failures.append(
+                "%s: ops/sec %.0f < baseline %.0f (adjusted)"
+                % (name, result["ops_per_sec"], base["ops_per_sec"] * speed)
+            )
+        if result["alloc_bytes_per_op"] > base["alloc_bytes_per_op"] * (1 + threshold) + 64:
+            failures.append(
+                "%s: alloc %.0fB/op > baseline %.0fB/op"
+                % (name, result["alloc_bytes_per_op"], base["alloc_bytes_per_op"])
+            )
+    return failures
+
+
+def _machine():
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="허용하는 악화 비율")
+    parser.add_argument("--min-time", type=float, default=1.0, help="측정 하나당 최소 시간(초)")
+    parser.add_argument("--only", help="이 문자열이 이름에 들어간 측정만 실행")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    api = API.__new__(API)
+    pages = load_corpus(args.corpus)
+    results = {}
+    calibration = []
+    cases = {}
+    for name, inputs, func in build_cases(api, pages):
+        if args.only and args.only not in name:
+            continue
+        cases[name] = (inputs, func)
+        # 부하 변화가 양쪽에 같이 걸리도록 측정마다 기준 작업을 바로 앞에서 잰다.
+        calibration.append(measure([CALIBRATION_PAGE], _calibration_op, args.min_time / 2)["ops_per_sec"])
+        results[name] = measure(inputs, func, args.min_time)
+        source = pages[name.split("/", 1)[1]][2]
+        print(
+            "%-42s %-9s ops/sec=%10.0f alloc=%8.0fB/op"
+            % (name, source, results[name]["ops_per_sec"], results[name]["alloc_bytes_per_op"])
+        )
+
+    calibration_ops = round(statistics.median(calibration), 1) if calibration else 0.0
+    print("%-42s %-9s ops/sec=%10.0f" % ("calibration", "fixed", calibration_ops))
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file_obj:
+            json.dump(
+                {"machine": _machine(), "calibration_ops_per_sec": calibration_ops, "results": results},
+                file_obj,
+                indent=2,
+                sort_keys=True,
+            )
+            file_obj.write("\n")
+        print("baseline written: %s" % os.path.relpath(args.baseline, ROOT))
+        return
+
+    if not os.path.isfile(args.baseline):
+        print("no baseline at %s; run with --update-baseline first" % args.baseline)
+        return
+    with open(args.baseline, "r", encoding="utf-8") as file_obj:
+        baseline = json.load(file_obj)
+    if baseline.get("machine") != _machine():
+        print("warning: baseline was recorded on %s" % baseline.get("machine"))
+    base_calibration = baseline.get("calibration_ops_per_sec") or 0.0
+    speed = calibration_ops / base_calibration if base_calibration and calibration_ops else 1.0
+    print("machine speed vs baseline: x%.2f" % speed)
+    # 잠깐 다른 부하가 겹친 것일 수 있으니 느려 보이는 측정은 몇 번 더 재서 가장 좋은 값으로 판단한다.
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        for _ in range(CONFIRM_RUNS):
+            if not base or not _slower(result, base, args.threshold, speed):
+                break
+            retry = measure(*cases[name], args.min_time)
+            result["ops_per_sec"] = max(result["ops_per_sec"], retry["ops_per_sec"])
+            print("%-42s %-9s ops/sec=%10.0f (re-measured)" % (name, "", result["ops_per_sec"]))
+    failures = compare(results, baseline.get("results", {}), args.threshold, speed)
+    for failure in failures:
+        print("REGRESSION %s" % failure)
+    if failures:
+        raise SystemExit(1)
+    print("no regressions beyond %.0f%%" % (args.threshold * 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""같은 부하에서 gunicorn 스레드 워커(wsgi:app)와 비동기 워커(async_app:app)의 처리량·지연 비교.
+
+    python benchmarks/serving_load.py [--concurrency 32] [--requests 400] [--latency-ms 150]
+                                      [--workers 1] [--threads 4] [--only wsgi]
+
+대역 서버(scripts/dc_standin.py)를 --latency-ms 응답 지연으로 띄우고, 서버 설정마다 gunicorn을
+따로 띄워 --concurrency개 연결로 모두 --requests번 /read를 부른다. 글 번호는 매번 달라서 캐시에
+맞지 않으므로 요청마다 upstream 왕복이 생긴다. 스레드 워커는 워커당 --threads개 요청만 동시에
+upstream을 기다릴 수 있고, 비동기 워커는 그 제한이 없다. 속도 제한은 끄고 잰다.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_DOCUMENT_ID = 900000
+SERVERS = {
+    "wsgi": ["wsgi:app"],
+    "async": ["-k", "aiohttp.GunicornWebWorker", "async_app:app"],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(url, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise SystemExit("%s exited with %s" % (process.args[0], process.returncode))
+            try:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit("server did not start: %s" % url)
+
+
+def _stop(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def _client(session, base_url, pids, latencies, errors):
+    while pids:
+        pid = pids.pop()
+        started = time.perf_counter()
+        try:
+            async with session.get("%s/read" % base_url, params={"pid": str(pid), "board": "standin"}) as response:
+                await response.read()
+                ok = response.status == 200
+        except aiohttp.ClientError:
+            ok = False
+        latencies.append(time.perf_counter() - started)
+        if not ok:
+            errors.append(pid)
+
+
+async def drive(label, base_url, args, first_pid):
+    pids = list(range(first_pid, first_pid + args.requests))
+    latencies = []
+    errors = []
+    timeout = aiohttp.ClientTimeout(total=120)
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(_client(session, base_url, pids, latencies, errors) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(
+        "%-6s req/sec=%7.1f latency p50=%7.1fms p99=%7.1fms errors=%d"
+        % (
+            label,
+            len(latencies) / elapsed,
+            statistics.median(latencies) * 1000,
+            latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000,
+            len(errors),
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--latency-ms", type=int, default=150)
+    parser.add_argument("--workers", type=int, default=1, help="MIRROR_WORKERS")
+    parser.add_argument("--threads", type=int, default=4, help="MIRROR_THREADS")
+    parser.add_argument("--only", choices=sorted(SERVERS))
+    args = parser.parse_args()
+
+    standin_port = _free_port()
+    standin = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ROOT, "scripts", "dc_standin.py"),
+            "--port",
+            str(standin_port),
+            "--latency-ms",
+            str(args.latency_ms),
+            "--seed",
+            "1",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        standin_url = "http://127.0.0.1:%d" % standin_port
+        asyncio.run(_wait_ready("%s/_standin/stats" % standin_url, standin))
+        first_pid = FIRST_DOCUMENT_ID
+        for label, target in SERVERS.items():
+            if args.only and label != args.only:
+                continue
+            port = _free_port()
+            env = dict(
+                os.environ,
+                MIRROR_ENV="development",
+                MIRROR_DC_STANDIN_URL=standin_url,
+                MIRROR_DC_HOST_RATE="0",
+                MIRROR_BOARD_KIND_STORE_PATH="",
+                MIRROR_BIND="127.0.0.1:%d" % port,
+                MIRROR_WORKERS=str(args.workers),
+                MIRROR_THREADS=str(args.threads),
+                MIRROR_LOG_LEVEL="warning",
+            )
+            server = subprocess.Popen(
+                ["gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", "/dev/null", *target],
+                cwd=ROOT,
+                env=env,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                base_url = "http://127.0.0.1:%d" % port
+                asyncio.run(_wait_ready("%s/healthz" % base_url, server))
+                asyncio.run(drive(label, base_url, args, first_pid))
+            finally:
+                _stop(server)
+            first_pid += args.requests
+    finally:
+        _stop(standin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""게시판 행 파싱 처리량 비교: 부를 때마다 컴파일하는 node.xpath(이전) vs 미리 컴파일한 XPath 저장소(현재).
+
+    python benchmarks/xpath_registry.py [--rows 30] [--repeat 300]
+    python benchmarks/xpath_registry.py --mobile captured_mobile.html --pc captured_pc.html
+
+트리는 한 번만 만들고 행 추출(__parse_board_rows)만 반복해 XPath 비용만 잰다.
+이전 방식은 parsers.xpath를 node.xpath(expr)로 바꿔 끼워 재현하고, 두 방식의 행이
+같은지 먼저 확인한다. --mobile/--pc를 주지 않으면 list_parse.py의 합성 페이지를 쓴다.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import lxml.html  # noqa: E402
+
+from app.services.dc import api as dc_api  # noqa: E402
+from app.services.dc import parsers  # noqa: E402
+from list_parse import MOBILE_URL, PC_URL, _read, _row_fields, synthetic_mobile_page, synthetic_pc_page  # noqa: E402
+
+
+def _uncompiled_xpath(node, expr):
+    return node.xpath(expr)
+
+
+def _use_xpath(func):
+    parsers.xpath = func
+    dc_api.xpath = func
+
+
+def _rows(api, parsed, url):
+    return api._API__parse_board_rows(parsed, "test", is_mobile_source=api._API__is_mobile_request(url))
+
+
+def compare(label, api, text, url, repeat):
+    parsed = lxml.html.fromstring(text)
+    registry_xpath = parsers.xpath
+    try:
+        _use_xpath(_uncompiled_xpath)
+        before = [_row_fields(item) for item in _rows(api, parsed, url)]
+        _use_xpath(registry_xpath)
+        after = [_row_fields(item) for item in _rows(api, parsed, url)]
+        if before != after:
+            raise SystemExit("%s: rows differ between node.xpath and the registry" % label)
+
+        print("%s: %d rows" % (label, len(after)))
+        for name, func in (("node.xpath", _uncompiled_xpath), ("registry", registry_xpath)):
+            _use_xpath(func)
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                _rows(api, parsed, url)
+                samples.append(time.perf_counter() - started)
+            samples.sort()
+            print(
+                "  %-10s rows/sec=%9.0f p50=%.3fms p99=%.3fms"
+                % (
+                    name,
+                    len(after) / statistics.fmean(samples),
+                    samples[len(samples) // 2] * 1000,
+                    samples[int(len(samples) * 0.99) - 1] * 1000,
+                )
+            )
+    finally:
+        _use_xpath(registry_xpath)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--mobile", help="저장해 둔 모바일 목록 HTML")
+    parser.add_argument("--pc", help="저장해 둔 PC 목록 HTML")
+    args = parser.parse_args()
+
+    api = dc_api.API.__new__(dc_api.API)
+    mobile = _read(args.mobile) if args.mobile else synthetic_mobile_page(args.rows, 0)
+    pc = _read(args.pc) if args.pc else synthetic_pc_page(args.rows, 0)
+    compare("mobile", api, mobile, MOBILE_URL, args.repeat)
+    compare("pc", api, pc, PC_URL, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""DCInside 오프라인 대역 서버.
+
+    python scripts/dc_standin.py [--port 8765] [--latency-ms 80] [--jitter-ms 40]
+                                 [--error-rate 0.02] [--rate-limit-rate 0.01] [--fixtures DIR]
+    MIRROR_DC_STANDIN_URL=http://127.0.0.1:8765 make run
+
+앱은 MIRROR_DC_STANDIN_URL이 설정되면 https://<host><path>를 <대역 서버>/<host><path>로 보낸다.
+모바일·PC 목록, 본문, 댓글 AJAX(/ajax/response-comment, /board/comment/), 투표, 미디어를 흉내 내고,
+--fixtures 폴더에 <종류>.html(댓글은 mobile_comments_<page>.html, pc_comments_<page>.json,
+미디어는 media.bin)이 있으면 저장해 둔 응답을 그대로 돌려준다. 없으면 합성 페이지를 만든다.
+지연, 5xx, 429는 종류별로 따로 줄 수 있고 /_standin/stats에서 요청 수를 볼 수 있다.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from html import escape
+
+from aiohttp import web
+
+MOBILE_HOST = "m.dcinside.com"
+PC_HOST = "gall.dcinside.com"
+FIRST_DOCUMENT_ID = 900000
+MOBILE_COMMENT_PAGE_SIZE = 50
+PC_COMMENT_PAGE_SIZE = 100
+# 1x1 투명 GIF
+MEDIA_BODY = (
+    b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00"
+    b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+)
+KINDS = (
+    "mobile_list",
+    "pc_list",
+    "mobile_view",
+    "pc_view",
+    "mobile_comments",
+    "pc_comments",
+    "poll",
+    "media",
+)
+
+
+@dataclass
+class StandinConfig:
+    latency_ms: int = 0
+    jitter_ms: int = 0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    list_rows: int = 30
+    comment_count: int = 120
+    with_poll: bool = True
+    fixtures_dir: str = None
+    seed: int = None
+    # 종류별로 위 값(latency_ms, jitter_ms, error_rate, rate_limit_rate)을 덮어쓴다.
+    overrides: dict = field(default_factory=dict)
+
+    def value(self, kind, name):
+        return self.overrides.get(kind, {}).get(name, getattr(self, name))
+
+
+def classify(host, path, method):
+    """요청을 대역 서버가 흉내 내는 응답 종류로 나눈다. 모르는 요청이면 None."""
+    parts = [part for part in path.split("/") if part]
+    if host == MOBILE_HOST:
+        if method == "POST" and path.rstrip("/") == "/ajax/response-comment":
+            return "mobile_comments"
+        if parts[:1] == ["poll"]:
+            return "poll"
+        if len(parts) == 2 and parts[0] in {"board", "mini"}:
+            return "mobile_list"
+        if len(parts) == 3 and parts[0] in {"board", "mini"} and parts[2].isdigit():
+            return "mobile_view"
+        return None
+    if host == PC_HOST:
+        if method == "POST" and path.rstrip("/") == "/board/comment":
+            return "pc_comments"
+        if path.rstrip("/").endswith("/board/lists"):
+            return "pc_list"
+        if path.rstrip("/").endswith("/board/view"):
+            return "pc_view"
+        return None
+    if host.endswith((".dcinside.com", ".dcinside.co.kr")):
+        return "media"
+    return None
+
+
+def _page(value, default=1):
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return default
+
+
+def _document_ids(page, rows):
+    first = FIRST_DOCUMENT_ID - (page - 1) * rows
+    return [first - index for index in range(rows)]
+
+
+def mobile_list_page(board_id, page, rows):
+    items = "".join(
+        '<li><div class="gall-detail-lnktb"><a class="lt" href="https://m.dcinside.com/board/%s/%d?page=%d">'
+        '<span class="subject-add"><span class="sp-lst sp-lst-img"></span><span class="subjectin">title %d</span></span>'
+        '<ul class="ginfo"><li>일반</li><li>ㅇㅇ<span class="blockInfo" data-info="1.%d"></span></li>'
+        "<li>12:%02d</li><li>조회 %d</li><li>추천 %d</li></ul></a>"
+        '<a class="rt" href="https://m.dcinside.com/board/%s/%d#comment_box"><span class="ct">%d</span></a></div></li>'
+        % (board_id, doc_id, page, doc_id, doc_id % 255, doc_id % 60, doc_id % 97, doc_id % 7, board_id, doc_id, doc_id % 11)
+        for doc_id in _document_ids(page, rows)
+    )
+    pagination = (
+        '<div id="pagination_div"><div class="paging-inner">'
+        '<strong>%d</strong><a href="https://m.dcinside.com/board/%s?page=%d">%d</a></div></div>'
+        % (page, board_id, page + 1, page + 1)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>%s</title></head><body>'
+        '<ul class="mal-lst"><li class="on"><a href="javascript:headText_change(0)">전체</a></li></ul>'
+        '<ul class="gall-detail-lst">%s</ul>%s'
+        '<div class="adv-groupin"><script>var tail = 1;</script></div></body></html>'
+        % (escape(board_id), items, pagination)
+    )
+
+
+def pc_list_page(board_id, page, rows):
+    items = "".join(
+        '<tr class="ub-content us-post" data-no="%d" data-type="icon_pic">'
+        '<td class="gall_num">%d</td><td class="gall_subject">일반</td>'
+        '<td class="gall_tit ub-word"><a href="/board/view/?id=%s&no=%d&page=%d"><em class="icon_img icon_pic"></em>title %d</a>'
+        '<a class="reply_numbox" href="#"><span class="reply_num">[%d]</span></a></td>'
+        '<td class="gall_writer ub-writer" data-nick="ㅇㅇ" data-ip="1.%d"></td>'
+        '<td class="gall_date" title="2026.04.16 12:%02d:00">12:%02d</td>'
+        '<td class="gall_count">%d</td><td class="gall_recommend">%d</td></tr>'
+        % (doc_id, doc_id, board_id, doc_id, page, doc_id, doc_id % 11, doc_id % 255, doc_id % 60, doc_id % 60, doc_id % 97, doc_id % 7)
+        for doc_id in _document_ids(page, rows)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>%s</title></head><body>'
+        '<div class="gall_listwrap"><table class="gall_list"><tbody>%s</tbody></table></div>'
+        '<div class="bottom_paging_wrap"><div class="bottom_paging_box"><em>%d</em>'
+        '<a href="/board/lists/?id=%s&page=%d">%d</a></div></div></body></html>'
+        % (escape(board_id), items, page, board_id, page + 1, page + 1)
+    )
+
+
+def _media_url(document_id):
+    return "https://dcimg7.dcinside.co.kr/viewimage.php?id=standin&no=%s" % document_id
+
+
+def mobile_view_page(board_id, document_id, with_poll):
+    poll = '<iframe src="https://m.dcinside.com/poll?vote_id=%s"></iframe>' % document_id if with_poll else ""
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>'
+        '<div class="gall-tit-box"><span class="tit">title %s</span>'
+        '<ul class="ginfo2"><li>ㅇㅇ(1.2)</li><li>2026.04.16 12:00</li></ul></div>'
+        '<div class="thum-txtin"><p>body %s</p><img src="%s">%s</div></body></html>'
+        % (document_id, document_id, _media_url(document_id), poll)
+    )
+
+
+def pc_view_page(board_id, document_id):
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>'
+        '<input type="hidden" id="e_s_n_o" value="standin"><input type="hidden" id="_GALLTYPE_" value="G">'
+        '<div class="gallview_head"><span class="title_subject">title %s</span>'
+        '<span class="nickname">ㅇㅇ</span><span class="ip">(1.2)</span>'
+        '<span class="gall_date">2026.04.16 12:00:00</span></div>'
+        '<div class="writing_view_box"><p>body %s</p><img src="%s"></div></body></html>'
+        % (document_id, document_id, _media_url(document_id))
+    )
+
+
+def mobile_comment_page(document_id, page, total):
+    last_page = max(math.ceil(total / MOBILE_COMMENT_PAGE_SIZE), 1)
+    start = (page - 1) * MOBILE_COMMENT_PAGE_SIZE
+    rows = "".join(
+        '<li class="comment" no="%d" m_no="0"><div class="ginfo-area"><button class="nick">댓글%d</button></div>'
+        '<p class="txt">comment %d</p><span class="date">04.16 12:%02d</span></li>'
+        % (index + 1, index + 1, index + 1, index % 60)
+        for index in range(start, min(start + MOBILE_COMMENT_PAGE_SIZE, total))
+    )
+    return (
+        '<html><body><ul class="all-comment-lst">%s</ul><span class="pgnum">%d/%d</span></body></html>'
+        % (rows, min(page, last_page), last_page)
+    )
+
+
+def pc_comment_page(document_id, page, total):
+    last_page = max(math.ceil(total / PC_COMMENT_PAGE_SIZE), 1)
+    start = (page - 1) * PC_COMMENT_PAGE_SIZE
+    comments = [
+        {
+            "no": str(index + 1),
+            "parent": str(document_id),
+            "user_id": "",
+            "name": "댓글%d" % (index + 1),
+            "ip": "1.2",
+            "reg_date": "04.16 12:%02d:00" % (index % 60),
+            "memo": "comment %d" % (index + 1),
+            "depth": 0,
+        }
+        for index in range(start, min(start + PC_COMMENT_PAGE_SIZE, total))
+    ]
+    pagination = "".join("<a>%d</a>" % number for number in range(1, last_page + 1))
+    return json.dumps({"comments": comments, "pagination": pagination}, ensure_ascii=False)
+
+
+def poll_page(vote_id):
+    return (
+        '<html><body><div class="vote-tit-inner">standin poll %s</div>'
+        '<ul class="vote-date-lst"><li>2026.04.16</li></ul><div class="vote-join">3명 참여</div>'
+        '<ul class="vote-gp-lst"><li><span class="vote-txt">yes</span><span class="percent">100%%</span>'
+        '<span class="vote-ct">3</span></li></ul></body></html>'
+        % escape(str(vote_id))
+    )
+
+
+class Standin:
+    def __init__(self, config=None):
+        self.config = config or StandinConfig()
+        self.random = random.Random(self.config.seed)
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "unknown": 0, "by_kind": {}}
+
+    def _fixture(self, name):
+        if not self.config.fixtures_dir:
+            return None
+        path = os.path.join(self.config.fixtures_dir, name)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as file_obj:
+            return file_obj.read()
+
+    def _fixture_for(self, kind, page=None):
+        names = []
+        extension = {"pc_comments": "json", "media": "bin"}.get(kind, "html")
+        if page is not None:
+            names.append("%s_%d.%s" % (kind, page, extension))
+        names.append("%s.%s" % (kind, extension))
+        for name in names:
+            body = self._fixture(name)
+            if body is not None:
+                return body
+        return None
+
+    async def _inject(self, kind):
+        latency = self.config.value(kind, "latency_ms")
+        jitter = self.config.value(kind, "jitter_ms")
+        if latency or jitter:
+            await asyncio.sleep((latency + self.random.uniform(0, jitter)) / 1000)
+        if self.random.random() < self.config.value(kind, "rate_limit_rate"):
+            self.stats["rate_limited"] += 1
+            return web.Response(status=429, text="Too Many Requests")
+        if self.random.random() < self.config.value(kind, "error_rate"):
+            self.stats["errors"] += 1
+            return web.Response(status=503, text="standin error")
+        return None
+
+    async def handle(self, request):
+        host = request.match_info["host"].lower()
+        path = "/" + request.match_info["tail"]
+        kind = classify(host, path, request.method)
+        self.stats["requests"] += 1
+        if kind is None:
+            self.stats["unknown"] += 1
+            return web.Response(status=404, text="unknown standin route")
+        self.stats["by_kind"][kind] = self.stats["by_kind"].get(kind, 0) + 1
+
+        injected = await self._inject(kind)
+        if injected is not None:
+            return injected
+        form = await request.post() if request.method == "POST" else {}
+        return self._respond(kind, path, request.query, form)
+
+    def _respond(self, kind, path, query, form):
+        parts = [part for part in path.split("/") if part]
+        if kind == "media":
+            body = self._fixture_for(kind) or MEDIA_BODY
+            return web.Response(body=body, content_type="image/gif")
+        if kind == "mobile_comments":
+            page = _page(form.get("cpage"))
+            body = self._fixture_for(kind, page)
+            text = body.decode("utf-8") if body is not None else mobile_comment_page(
+                form.get("no"), page, self.config.comment_count
+            )
+            return web.Response(text=text, content_type="text/html")
+        if kind == "pc_comments":
+            page = _page(form.get("comment_page"))
+            body = self._fixture_for(kind, page)
+            text = body.decode("utf-8") if body is not None else pc_comment_page(
+                form.get("no"), page, self.config.comment_count
+            )
+            return web.Response(text=text, content_type="application/json")
+
+        body = self._fixture_for(kind)
+        if body is not None:
+            return web.Response(body=body, content_type="text/html", charset="utf-8")
+        page = _page(query.get("page"))
+        if kind == "mobile_list":
+            text = mobile_list_page(parts[1], page, self.config.list_rows)
+        elif kind == "pc_list":
+            text = pc_list_page(query.get("id", "standin"), page, self.config.list_rows)
+        elif kind == "mobile_view":
+            text = mobile_view_page(parts[1], parts[2], self.config.with_poll)
+        elif kind == "pc_view":
+            text = pc_view_page(query.get("id", "standin"), query.get("no", "0"))
+        else:
+            text = poll_page(query.get("vote_id", ""))
+        return web.Response(text=text, content_type="text/html")
+
+    async def handle_stats(self, request):
+        return web.json_response(self.stats)
+
+
+STANDIN_KEY = web.AppKey("standin", Standin)
+
+
+def create_app(config=None):
+    standin = Standin(config)
+    app = web.Application()
+    app[STANDIN_KEY] = standin
+    app.router.add_get("/_standin/stats", standin.handle_stats)
+    app.router.add_route("*", "/{host}/{tail:.*}", standin.handle)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--jitter-ms", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--list-rows", type=int, default=30)
+    parser.add_argument("--comment-count", type=int, default=120)
+    parser.add_argument("--no-poll", action="store_true")
+    parser.add_argument("--fixtures", help="저장해 둔 응답 폴더")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--override",
+        action="append",
+        default=[],
+        metavar="KIND:NAME=VALUE",
+        help="종류별 값 덮어쓰기. 예: mobile_comments:rate_limit_rate=1 (종류: %s)" % ", ".join(KINDS),
+    )
+    args = parser.parse_args()
+
+    overrides = {}
+    for item in args.override:
+        kind, _, assignment = item.partition(":")
+        name, _, value = assignment.partition("=")
+        if kind not in KINDS or name not in {"latency_ms", "jitter_ms", "error_rate", "rate_limit_rate"}:
+            parser.error("bad --override: %s" % item)
+        overrides.setdefault(kind, {})[name] = float(value) if "rate" in name else int(value)
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        list_rows=args.list_rows,
+        comment_count=args.comment_count,
+        with_poll=not args.no_poll,
+        fixtures_dir=args.fixtures,
+        seed=args.seed,
+        overrides=overrides,
+    )
+    web.run_app(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,16 @@
 import os
 
+import pytest
+
 
 os.environ.setdefault("MIRROR_ENV", "development")
+os.environ.setdefault("MIRROR_BOARD_KIND_STORE_PATH", "")
+
+from app.services.dc import limiter  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_upstream_limiters():
+    limiter.reset_limiters()
+    yield
+    limiter.reset_limiters()
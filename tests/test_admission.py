@@ -0,0 +1,177 @@
+import asyncio
+import threading
+
+import pytest
+
+from app import create_app, routes
+from app.services import admission
+from app.services.admission import AdmissionController, AdmissionRejected, upstream_allowed
+from app.services.async_bridge import dc_api_context, single_flight
+from app.services.dc import deadline, limiter
+
+
+def _board_row():
+    return {
+        "id": "123",
+        "title": "cached row",
+        "subject": None,
+        "author": "익명",
+        "author_code": None,
+        "author_role": None,
+        "time": "-",
+        "time_display": "-",
+        "needs_time_hydrate": False,
+        "comment_count": 0,
+        "voteup_count": 0,
+        "has_image": False,
+        "has_video": False,
+        "isimage": False,
+        "isvideo": False,
+        "isrecommend": False,
+    }
+
+
+def test_admission_queues_one_request_and_sheds_the_rest_to_cache_only():
+    controller = AdmissionController(limit=1, queue=1, total=0, wait_ms=2000)
+    first = controller.admit("read")
+    assert first.__enter__() is True
+    queued = {}
+
+    def waiter():
+        with controller.admit("read") as admitted:
+            queued["admitted"] = admitted
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    while controller.snapshot()["classes"]["read"]["waiting"] == 0:
+        pass
+
+    with controller.admit("read") as admitted:
+        assert admitted is False
+        assert upstream_allowed() is False
+    assert upstream_allowed() is True
+
+    first.__exit__(None, None, None)
+    thread.join(timeout=5)
+
+    stats = controller.snapshot()
+    assert queued == {"admitted": True}
+    assert stats["used"] == 0
+    assert stats["classes"]["read"] == {
+        "inflight": 0,
+        "waiting": 0,
+        "admitted": 2,
+        "queued": 1,
+        "shed": 1,
+        "timed_out": 0,
+    }
+
+
+def test_admission_total_keeps_a_thread_for_cheap_routes():
+    controller = AdmissionController(limit=2, queue=0, total=2, wait_ms=0)
+
+    with controller.admit("read") as read_admitted, controller.admit("board") as board_admitted:
+        with controller.admit("times") as times_admitted:
+            assert (read_admitted, board_admitted, times_admitted) == (True, True, False)
+
+    assert controller.snapshot()["used"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_admission_times_out_without_blocking_the_loop():
+    controller = AdmissionController(limit=1, queue=1, total=0, wait_ms=100)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    async with controller.admit_async("board") as admitted:
+        assert admitted is True
+        ticking = asyncio.ensure_future(ticker())
+        async with controller.admit_async("board") as queued_admitted:
+            assert queued_admitted is False
+        await ticking
+
+    assert len(ticks) == 5
+    assert controller.snapshot()["classes"]["board"]["timed_out"] == 1
+
+
+def test_overflowing_board_request_serves_cache_or_fast_503(monkeypatch):
+    monkeypatch.setattr(routes, "route_admission", AdmissionController(limit=1, queue=0, total=0))
+    cached = {"rows": None}
+    upstream_calls = []
+
+    async def fake_index(page, board, recommend, **kwargs):
+        if cached["rows"] is not None:
+            return cached["rows"], []
+        async with dc_api_context():
+            upstream_calls.append(board)
+        return [], []
+
+    monkeypatch.setattr(routes, "async_index_with_head_categories", fake_index)
+    client = create_app().test_client()
+
+    with routes.route_admission.admit("board"):
+        rejected = client.get("/board?board=test")
+        cached["rows"] = [_board_row()]
+        stale = client.get("/board?board=test")
+
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == str(admission.ADMISSION_RETRY_AFTER)
+    assert stale.status_code == 200
+    assert "cached row" in stale.get_data(as_text=True)
+    assert upstream_calls == []
+    assert client.get("/healthz").get_json() == {"ok": True}
+
+
+def test_overflowing_related_request_returns_json_503(monkeypatch):
+    monkeypatch.setattr(routes, "route_admission", AdmissionController(limit=1, queue=0, total=0))
+
+    async def fake_related(*args, **kwargs):
+        async with dc_api_context():
+            raise AssertionError("must not reach upstream")
+
+    monkeypatch.setattr(routes, "async_related_after_position", fake_related)
+    client = create_app().test_client()
+
+    with routes.route_admission.admit("related"):
+        response = client.get("/read/related?pid=10&board=test")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(admission.ADMISSION_RETRY_AFTER)
+    assert response.get_json() == {"ok": False, "items": [], "error": "overloaded"}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_does_not_leak_cache_only_into_shared_flight():
+    release = asyncio.Event()
+    calls = []
+
+    async def load():
+        admission.ensure_upstream_allowed()
+        calls.append((limiter._REQUEST_PRIORITY.get(), deadline.remaining_time()))
+        await release.wait()
+        return "loaded"
+
+    # 넘친 요청이 먼저 와도 공유 작업을 시작하지 않고 자기만 거절된다.
+    with admission.cache_only():
+        with pytest.raises(AdmissionRejected):
+            await single_flight("flight-key", load)
+    assert calls == []
+
+    with limiter.request_priority(limiter.PRIORITY_BACKGROUND), deadline.request_deadline(0.5):
+        normal = asyncio.ensure_future(single_flight("flight-key", load))
+    await asyncio.sleep(0)
+    with admission.cache_only():
+        shed = asyncio.ensure_future(single_flight("flight-key", load))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await normal == await shed == "loaded"
+    assert len(calls) == 1
+    # 우선순위와 마감은 시작한 호출자의 것을 그대로 쓴다.
+    priority, remaining = calls[0]
+    assert priority == limiter.PRIORITY_BACKGROUND
+    assert 0 < remaining <= 0.5
@@ -1,9 +1,11 @@
 import asyncio
+import time
 from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 from app.services import async_bridge
+from app.services.dc import deadline
 
 
 async def _value(value):
@@ -43,3 +45,113 @@ def test_run_async_starts_one_background_loop_for_concurrent_first_calls():
         assert len(set(loop_ids)) == 1
     finally:
         async_bridge.shutdown_async_bridge()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call_and_survives_waiter_cancel():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "loaded"
+
+    cancelled = asyncio.ensure_future(async_bridge.single_flight("key", load))
+    waiter = asyncio.ensure_future(async_bridge.single_flight("key", load))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await waiter == "loaded"
+    assert calls == [1]
+    assert await async_bridge.single_flight("key", load) == "loaded"
+    assert calls == [1, 1]
+
+
+def test_schedule_single_flight_runs_one_background_refresh_per_key():
+    calls = []
+
+    async def refresh():
+        calls.append(asyncio.get_running_loop())
+        await asyncio.sleep(0.02)
+        return "fresh"
+
+    try:
+        first = async_bridge.schedule_single_flight("refresh-key", refresh)
+        second = async_bridge.schedule_single_flight("refresh-key", refresh)
+
+        assert first.result(timeout=1) == "fresh"
+        assert second.result(timeout=1) == "fresh"
+        assert len(calls) == 1
+        assert calls[0] is async_bridge.get_background_loop()
+    finally:
+        async_bridge.shutdown_async_bridge()
+
+
+async def _remaining():
+    return deadline.remaining_time()
+
+
+def test_run_async_sets_request_deadline_and_background_refresh_drops_it():
+    async def refresh_remaining():
+        return await async_bridge.schedule_single_flight("deadline-refresh", _remaining)
+
+    try:
+        remaining = async_bridge.run_async(_remaining(), deadline=5)
+        refreshed = async_bridge.run_async(refresh_remaining(), deadline=5)
+
+        assert 0 < remaining <= 5
+        assert refreshed is None
+        assert async_bridge.run_async(_remaining(), deadline=0) is None
+    finally:
+        async_bridge.shutdown_async_bridge()
+
+
+async def _fail():
+    raise ValueError("boom")
+
+
+def test_run_async_counts_submissions_and_records_wall_time():
+    async_bridge.reset_loop_stats()
+    try:
+        async_bridge.run_async(_value("ok"))
+        with pytest.raises(ValueError):
+            async_bridge.run_async(_fail())
+        stats = async_bridge.loop_stats()
+
+        assert stats["submitted"] == stats["started"] == stats["completed"] == 2
+        assert stats["failed"] == 1
+        assert stats["queued"] == stats["inflight"] == 0
+        assert stats["running"] is True
+        assert stats["wall_times"]["_value"]["count"] == 1
+        assert sum(stats["wall_times"]["_fail"]["buckets"]) == 1
+    finally:
+        async_bridge.shutdown_async_bridge()
+        async_bridge.reset_loop_stats()
+
+
+@pytest.mark.asyncio
+async def test_run_async_counts_fallback_runs_inside_running_loop():
+    async_bridge.reset_loop_stats()
+
+    assert async_bridge.run_async(_value("inside-loop")) == "inside-loop"
+    assert async_bridge.loop_stats()["fallback_runs"] == 1
+    async_bridge.reset_loop_stats()
+
+
+@pytest.mark.asyncio
+async def test_lag_probe_records_lag_and_warns_over_threshold(monkeypatch, caplog):
+    async_bridge.reset_loop_stats()
+    monkeypatch.setattr(async_bridge, "LOOP_LAG_WARN_MS", 20)
+    caplog.set_level("WARNING", logger="app.services.async_bridge")
+
+    probe = asyncio.ensure_future(async_bridge._lag_probe(0.01))
+    await asyncio.sleep(0)
+    time.sleep(0.05)
+    await asyncio.sleep(0.03)
+    probe.cancel()
+    stats = async_bridge.loop_stats()
+    async_bridge.reset_loop_stats()
+
+    assert stats["lag_max_ms"] >= 30
+    assert stats["lag_warnings"] >= 1
+    assert any("async bridge loop lag" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp.test_utils import TestClient, TestServer
+
+from app import create_app, routes
+from app.async_server import create_async_app
+from app.services import async_bridge
+
+
+async def _read_payload():
+    return (
+        {
+            "title": "async read",
+            "author": "익명",
+            "author_code": None,
+            "author_role": None,
+            "time": "-",
+            "voteup_count": 0,
+            "contents": "fixture",
+            "html": "<p>fixture</p>",
+            "related_posts": [],
+        },
+        [],
+        [],
+    )
+
+
+def _no_bridge(coro):
+    coro.close()
+    raise AssertionError("async server must not go through run_async")
+
+
+@pytest.fixture
+def isolated_bridge(monkeypatch):
+    # 다른 테스트가 띄운 백그라운드 루프 대신 테스트 루프를 빌려 쓰고, 끝나면 원래 상태로 돌린다.
+    ready = async_bridge._BACKGROUND_READY.is_set()
+    monkeypatch.setattr(async_bridge, "_BACKGROUND_LOOP", None)
+    monkeypatch.setattr(async_bridge, "_BACKGROUND_THREAD", None)
+    monkeypatch.setattr(async_bridge, "_BACKGROUND_STARTING", False)
+    monkeypatch.setattr(async_bridge, "_SHARED_DC_API", None)
+    monkeypatch.setattr(routes, "run_async", _no_bridge)
+    yield
+    if ready:
+        async_bridge._BACKGROUND_READY.set()
+
+
+@pytest_asyncio.fixture
+async def client(isolated_bridge):
+    client = TestClient(TestServer(create_async_app(create_app())))
+    await client.start_server()
+    yield client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_server_awaits_read_fetch_on_its_own_loop(client, monkeypatch):
+    calls = []
+
+    async def fake_read(pid, board, kind=None, recommend=0, head_id=None, **kwargs):
+        calls.append((pid, board, asyncio.get_running_loop()))
+        return await _read_payload()
+
+    monkeypatch.setattr(routes, "async_read", fake_read)
+
+    response = await client.get("/read", params={"pid": "123", "board": "test", "kind": "minor"})
+    body = await response.text()
+
+    assert response.status == 200
+    assert "async read" in body
+    assert calls == [(123, "test", asyncio.get_running_loop())]
+    assert async_bridge.get_loop_if_running() is asyncio.get_running_loop()
+    assert any(name.endswith("fake_read") for name in async_bridge.loop_stats()["wall_times"])
+
+
+@pytest.mark.asyncio
+async def test_async_server_keeps_flask_errors_and_plain_routes(client, monkeypatch):
+    async def failing_times(*args, **kwargs):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(routes, "async_board_precise_times", failing_times)
+
+    healthz = await client.get("/healthz")
+    missing = await client.get("/read", params={"pid": "0"})
+    times = await client.get("/board/times", params={"board": "test", "ids": "1"})
+
+    assert healthz.status == 200
+    assert await healthz.json() == {"ok": True}
+    assert missing.status == 404
+    assert times.status == 502
+    assert await times.json() == {"ok": False, "times": {}, "error": "board_time_fetch_failed"}
+
+
+@pytest.mark.asyncio
+async def test_release_loop_hands_bridge_back(isolated_bridge):
+    loop = asyncio.get_running_loop()
+    async_bridge.adopt_loop(loop)
+    assert async_bridge.get_loop_if_running() is loop
+
+    await async_bridge.release_loop()
+
+    assert async_bridge.get_loop_if_running() is None
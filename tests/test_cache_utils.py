@@ -5,7 +5,8 @@ from app.services import core
 
 
 def test_cache_entry_expires_exactly_at_deadline(monkeypatch):
-    cache = {"key": {"value": "cached", "expires_at": 100.0}}
+    cache = cache_utils.TTLCache()
+    cache.set("key", "cached", 100.0, now=0.0)
     lock = threading.Lock()
     monkeypatch.setattr(cache_utils.time, "time", lambda: 100.0)
 
@@ -13,27 +14,118 @@ def test_cache_entry_expires_exactly_at_deadline(monkeypatch):
     assert "key" not in cache
 
 
-def test_cache_prune_expires_exact_deadline():
-    cache = {
-        "expired": {"value": "old", "expires_at": 100.0},
-        "fresh": {"value": "new", "expires_at": 101.0},
-    }
+def test_ttl_cache_lazily_expires_lru_head_on_set():
+    cache = cache_utils.TTLCache()
+    cache.set("expired", "old", 100.0, now=0.0)
+    cache.set("fresh", "new", 101.0, now=0.0)
 
-    cache_utils.cache_prune(cache, 100.0, 10)
+    cache.set("newest", "newest", 200.0, now=100.0)
 
     assert "expired" not in cache
-    assert "fresh" in cache
+    assert list(cache) == ["fresh", "newest"]
+
+
+def test_ttl_cache_evicts_least_recently_used_entry():
+    cache = cache_utils.TTLCache(max_items=2)
+    cache.set("a", "a", 100.0, now=0.0)
+    cache.set("b", "b", 100.0, now=0.0)
+
+    assert cache.get("a", now=1.0) == "a"
+    cache.set("c", "c", 100.0, now=1.0)
+
+    assert list(cache) == ["a", "c"]
 
 
 def test_core_cache_set_never_exceeds_max_items(monkeypatch):
-    cache = {}
+    cache = cache_utils.TTLCache()
     lock = threading.Lock()
-    core._CACHE_PRUNE_STATE.clear()
-    monkeypatch.setattr(core, "CACHE_PRUNE_EVERY", 1000)
-    monkeypatch.setattr(core, "CACHE_PRUNE_MIN_INTERVAL", 1000)
-    monkeypatch.setattr(core.time, "time", lambda: 100.0)
+    monkeypatch.setattr(cache_utils.time, "time", lambda: 100.0)
 
     for key in ("oldest", "middle", "newest"):
         core._cache_set(cache, lock, key, key, ttl=60, max_items=2)
 
     assert list(cache) == ["middle", "newest"]
+
+
+def test_sqlite_backend_shares_registered_cache_entries_between_workers(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    first_worker = cache_utils.SQLiteCacheBackend(path=path)
+    second_worker = cache_utils.SQLiteCacheBackend(path=path)
+    cache = cache_utils.register_shared_cache(cache_utils.TTLCache(), "test_shared")
+    lock = threading.Lock()
+
+    first_worker.set(cache, lock, ("board", 1), [{"id": "1"}], ttl=60, max_items=10)
+
+    assert second_worker.get(cache, lock, ("board", 1)) == [{"id": "1"}]
+    assert second_worker.get(cache, lock, ("board", 2)) is None
+    assert len(cache) == 0
+    stats = second_worker.stats.snapshot()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["namespaces"]["test_shared"]["hits"] == 1
+
+
+def test_sqlite_backend_expires_and_bounds_entries(tmp_path, monkeypatch):
+    backend = cache_utils.SQLiteCacheBackend(path=str(tmp_path / "shared.sqlite3"), prune_every=1)
+    cache = cache_utils.register_shared_cache(cache_utils.TTLCache(), "test_bounded")
+    lock = threading.Lock()
+    now = [100.0]
+    monkeypatch.setattr(cache_utils.time, "time", lambda: now[0])
+
+    backend.set(cache, lock, "short", "old", ttl=1, max_items=2)
+    now[0] = 101.0
+    assert backend.get(cache, lock, "short") is None
+
+    for key in ("oldest", "middle", "newest"):
+        now[0] += 1
+        backend.set(cache, lock, key, key, ttl=60, max_items=2)
+
+    assert backend.get(cache, lock, "oldest") is None
+    assert backend.get(cache, lock, "middle") == "middle"
+    assert backend.get(cache, lock, "newest") == "newest"
+
+
+def test_unregistered_caches_stay_in_process_with_shared_backend(tmp_path):
+    backend = cache_utils.SQLiteCacheBackend(path=str(tmp_path / "shared.sqlite3"))
+    previous = cache_utils.set_cache_backend(backend)
+    cache = cache_utils.TTLCache()
+    lock = threading.Lock()
+    try:
+        cache_utils.cache_set_after_insert(cache, lock, "key", "value", 60, 10)
+
+        assert "key" in cache
+        assert cache_utils.cache_get(cache, lock, "key") == "value"
+        assert backend.stats.snapshot()["sets"] == 0
+    finally:
+        cache_utils.set_cache_backend(previous)
+
+
+def test_sqlite_backend_round_trips_frozen_rows(tmp_path):
+    backend = cache_utils.SQLiteCacheBackend(path=str(tmp_path / "shared.sqlite3"))
+    cache = cache_utils.register_shared_cache(cache_utils.TTLCache(), "test_frozen")
+    lock = threading.Lock()
+    row = core.FrozenRow({"id": "1", "title": "title"})
+
+    backend.set(cache, lock, "rows", [row], ttl=60, max_items=10)
+    cached_rows = backend.get(cache, lock, "rows")
+
+    assert cached_rows == [{"id": "1", "title": "title"}]
+    assert isinstance(cached_rows[0], core.FrozenRow)
+    assert cached_rows[0].replace(title="changed") == {"id": "1", "title": "changed"}
+    assert row["title"] == "title"
+
+
+def test_pinned_cache_uses_its_own_backend_regardless_of_default(tmp_path):
+    backend = cache_utils.SQLiteCacheBackend(path=str(tmp_path / "pinned.sqlite3"), name="pinned_store")
+    cache = cache_utils.register_shared_cache(cache_utils.TTLCache(), "test_pinned", backend=backend)
+    lock = threading.Lock()
+
+    try:
+        cache_utils.cache_set_after_insert(cache, lock, "key", "value", 60, 10)
+
+        assert "key" not in cache
+        assert cache_utils.cache_get(cache, lock, "key") == "value"
+        assert cache_utils.cache_stats()["pinned_store"]["sets"] == 1
+    finally:
+        cache_utils._SHARED_CACHE_NAMESPACES.pop(id(cache), None)
+        cache_utils._PINNED_CACHE_BACKENDS.pop(id(cache), None)
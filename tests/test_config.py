@@ -250,3 +250,17 @@ def test_healthz_rejects_non_loopback_and_invalid_addresses(monkeypatch):
 
     assert mapped_external.status_code == 404
     assert invalid_addr.status_code == 404
+
+
+def test_healthz_loop_reports_bridge_stats_to_loopback_only(monkeypatch):
+    monkeypatch.setenv("MIRROR_ENV", "development")
+    app = create_app()
+    client = app.test_client()
+
+    response = client.get("/healthz/loop")
+    external_response = client.get("/healthz/loop", environ_base={"REMOTE_ADDR": "203.0.113.10"})
+
+    assert response.status_code == 200
+    assert set(response.get_json()) == {"loop", "caches", "prefetch", "limiter", "admission", "media_cache"}
+    assert {"lag_ms", "queued", "inflight", "fallback_runs", "wall_times"} <= set(response.get_json()["loop"])
+    assert external_response.status_code == 404
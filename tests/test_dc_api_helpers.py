@@ -1,8 +1,10 @@
+import threading
 from datetime import datetime
 
 import lxml.html
 import pytest
 
+from app.services.dc import api as dc_api
 from app.services.dc import parsers
 from app.services.dc.api import API, GET_HEADERS, MOBILE_USER_AGENT, XML_HTTP_REQ_HEADERS, to_int
 from app.services.dc.models import Document
@@ -624,3 +626,106 @@ async def test_comments_pc_fetch_expands_limit_to_cover_mobile_duplicates():
 
     assert comments == ["1", "2", "3", "4"]
     assert pc_calls == [4]
+
+
+def _list_page_rows(parsed, url):
+    api = API.__new__(API)
+    rows = api._API__parse_board_rows(parsed, "test", is_mobile_source="m.dcinside.com" in url)
+    return (
+        [(row.id, row.title, row.author_id, str(row.time), row.comment_count) for row in rows],
+        api._API__parse_board_pagination(parsed, url),
+        api._API__parse_mobile_headtext_tabs(parsed),
+    )
+
+
+def test_parse_list_page_stops_after_mobile_pagination_and_matches_full_parse():
+    text = """<!DOCTYPE html><html><head><title>t</title></head><body>
+      <ul class="mal-lst"><li class="on"><a href="javascript:headText_change(0)">전체</a></li></ul>
+      <ul class="gall-detail-lst">
+        <li><a class="lt" href="https://m.dcinside.com/board/test/123">
+          <span class="subjectin">mobile title</span>
+          <ul class="ginfo"><li>일반</li><li>ㅇㅇ</li><li>00:01</li><li>조회 1</li><li>추천 0</li></ul>
+        </a></li>
+      </ul>
+      <div id="pagination_div"><div class="paging-inner"><strong>1</strong>
+        <a href="https://m.dcinside.com/board/test?page=2">2</a></div></div>
+      <div id="tail-ad">ad</div><script>var tail = 1;</script>
+    </body></html>"""
+    url = "https://m.dcinside.com/board/test?page=1"
+
+    streamed = parsers.parse_list_page(text, chunk_size=64)
+
+    assert streamed.xpath("//*[@id='tail-ad']") == []
+    assert _list_page_rows(streamed, url) == _list_page_rows(lxml.html.fromstring(text), url)
+    assert _list_page_rows(streamed, url)[1]["has_next"] is True
+
+
+def test_parse_list_page_ignores_pc_paging_widgets_before_the_list():
+    text = """<!DOCTYPE html><html><body>
+      <div class="bottom_paging_box"><a href="javascript:ajax_list_search(2)">2</a></div>
+      <table><tbody>
+        <tr class="ub-content us-post" data-no="123">
+          <td class="gall_tit"><a href="/board/view/?id=test&no=123">pc title</a></td>
+          <td class="gall_writer" data-nick="pc author" data-ip="1.2"></td>
+          <td class="gall_date" title="2026.04.16 12:00:00"></td>
+        </tr>
+      </tbody></table>
+      <div class="bottom_paging_box"><em>1</em><a href="/board/lists/?id=test&page=2">2</a></div>
+      <div id="tail-ad">ad</div>
+    </body></html>"""
+    url = "https://gall.dcinside.com/board/lists/?id=test&page=1"
+
+    streamed = parsers.parse_list_page(text, chunk_size=32)
+
+    assert streamed.xpath("//*[@id='tail-ad']") == []
+    assert _list_page_rows(streamed, url) == _list_page_rows(lxml.html.fromstring(text), url)
+    assert [row[0] for row in _list_page_rows(streamed, url)[0]] == ["123"]
+
+
+def test_parser_xpath_registry_compiles_each_expression_once(monkeypatch):
+    monkeypatch.setattr(parsers, "_COMPILED_XPATHS", {})
+    parsed = lxml.html.fromstring(
+        """<html><body><ul class="gall-detail-lst">
+          <li><a class="lt" href="https://m.dcinside.com/board/test/1"><span class="subjectin">one</span>
+            <ul class="ginfo"><li>ㅇㅇ</li><li>00:01</li></ul></a></li>
+          <li><a class="lt" href="https://m.dcinside.com/board/test/2"><span class="subjectin">two</span>
+            <ul class="ginfo"><li>ㅇㅇ</li><li>00:02</li></ul></a></li>
+        </ul></body></html>"""
+    )
+    url = "https://m.dcinside.com/board/test?page=1"
+
+    first = _list_page_rows(parsed, url)
+    compiled = dict(parsers._COMPILED_XPATHS)
+    second = _list_page_rows(parsed, url)
+
+    assert first == second
+    assert [row[0] for row in first[0]] == ["1", "2"]
+    assert compiled and parsers._COMPILED_XPATHS == compiled
+    expr = "//ul[contains(@class, 'gall-detail-lst')]/li//span[contains(@class, 'subjectin')]/text()"
+    assert parsers.xpath(parsed, expr) == parsed.xpath(expr)
+    assert parsers.compiled_xpath(expr) is parsers.compiled_xpath(expr)
+
+
+@pytest.mark.asyncio
+async def test_fetch_candidate_parses_off_the_event_loop_thread(monkeypatch):
+    parse_threads = []
+    api = API.__new__(API)
+    original_parse = api._API__parse_candidate
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        return 200, {}, "<html><body><p>ok</p></body></html>"
+
+    def tracking_parse(url, text, validator=None):
+        parse_threads.append(threading.current_thread().name)
+        return original_parse(url, text, validator)
+
+    api._API__request_text = fake_request_text
+    api._API__parse_candidate = tracking_parse
+
+    parsed, _text, _redirect = await api._API__fetch_candidate("https://m.dcinside.com/board/test/1")
+    monkeypatch.setattr(dc_api, "_PARSE_EXECUTOR", None)
+    await api._API__fetch_candidate("https://m.dcinside.com/board/test/1")
+
+    assert parsed.xpath("string(//p)") == "ok"
+    assert parse_threads[0].startswith("mirror-dc-parse")
+    assert parse_threads[1] == threading.current_thread().name
@@ -1,3 +1,5 @@
+import asyncio
+import json
 import threading
 
 from aiohttp import CookieJar
@@ -5,8 +7,19 @@ import lxml.html
 import pytest
 from yarl import URL
 
+from app.services import cache_utils
 from app.services.dc import api as dc_api
 from app.services.dc.api import API
+from app.services.dc.deadline import DeadlineExceeded, request_deadline
+
+
+@pytest.fixture(autouse=True)
+def clear_list_caches():
+    dc_api._PC_LIST_CACHE.clear()
+    dc_api._BOARD_KIND_CACHE.clear()
+    yield
+    dc_api._PC_LIST_CACHE.clear()
+    dc_api._BOARD_KIND_CACHE.clear()
 
 
 def _pc_board_html(doc_id="123", title="pc title"):
@@ -67,25 +80,15 @@ def test_dc_session_connector_defaults():
     assert dc_api.DC_DNS_CACHE_TTL == 60
 
 
-def test_cache_set_defers_prune_until_cache_exceeds_limit(monkeypatch):
-    prune_calls = []
-
-    def fake_prune(cache, now, max_items):
-        prune_calls.append((dict(cache), max_items))
-
-    monkeypatch.setattr(dc_api, "cache_prune", fake_prune)
-    cache = {}
+def test_cache_set_bounds_board_kind_cache_without_full_prune():
+    cache = dc_api.TTLCache()
     lock = threading.Lock()
 
     dc_api.cache_set(cache, lock, "a", "value", ttl=30, max_items=2)
     dc_api.cache_set(cache, lock, "b", "value", ttl=30, max_items=2)
-
-    assert prune_calls == []
-
     dc_api.cache_set(cache, lock, "c", "value", ttl=30, max_items=2)
 
-    assert len(prune_calls) == 1
-    assert set(prune_calls[0][0]) == {"a", "b", "c"}
+    assert list(cache) == ["b", "c"]
 
 
 @pytest.mark.asyncio
@@ -164,6 +167,73 @@ async def test_request_text_prunes_shared_session_cookies():
     assert cookies["ci_c"].value == "ci-value"
 
 
+@pytest.mark.asyncio
+async def test_request_text_shrinks_timeout_to_request_deadline():
+    calls = []
+
+    class FakeResponse:
+        status = 200
+        headers = {}
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return None
+
+        async def text(self):
+            return "ok"
+
+    class FakeSession:
+        def request(self, *args, **kwargs):
+            calls.append(kwargs)
+            return FakeResponse()
+
+    api = API.__new__(API)
+    api.session = FakeSession()
+
+    await api._API__request_text("GET", "https://m.dcinside.com/board/test")
+    with request_deadline(2):
+        await api._API__request_text("GET", "https://m.dcinside.com/board/test")
+    with request_deadline(0.01):
+        await asyncio.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            await api._API__request_text("GET", "https://m.dcinside.com/board/test")
+
+    assert "timeout" not in calls[0]
+    assert 0 < calls[1]["timeout"].total <= 2
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_comments_stop_at_deadline_without_falling_back_to_pc():
+    api = API.__new__(API)
+    pc_calls = []
+
+    class DummyComment:
+        def __init__(self, cid):
+            self.id = cid
+
+    async def fake_mobile(board_id, document_id, num=-1, start_page=1, fail_fast=False):
+        yield DummyComment("1")
+        raise DeadlineExceeded("request deadline exceeded")
+
+    async def fake_pc(*args, **kwargs):
+        pc_calls.append(args)
+        yield None
+
+    api._API__comments_from_mobile = fake_mobile
+    api._API__comments_from_pc = fake_pc
+
+    seen = []
+    with pytest.raises(DeadlineExceeded):
+        async for comment in api.comments("test", "1"):
+            seen.append(comment.id)
+
+    assert seen == ["1"]
+    assert pc_calls == []
+
+
 def test_list_urls_prefer_mobile_before_pc():
     api = API.__new__(API)
     urls = api._API__build_list_urls("aoegame", 1, recommend=False, kind=None)
@@ -1103,6 +1173,67 @@ async def test_fetch_parsed_from_urls_follows_top_level_redirect_after_large_pre
     assert parsed.xpath("string(//*[@id='ok'])") == "late-meta-ready"
 
 
+@pytest.mark.asyncio
+async def test_fetch_parsed_from_urls_hedges_slow_candidate_and_cancels_it(monkeypatch):
+    monkeypatch.setattr(dc_api, "FETCH_HEDGE_DELAY_MS", 10)
+    monkeypatch.setattr(dc_api, "FETCH_HEDGE_MAX_INFLIGHT", 2)
+    api = API.__new__(API)
+    started = []
+    cancelled = []
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        started.append(url)
+        if url.endswith("/slow"):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+        return 200, {}, "<html><body><div id='ok'>%s</div></body></html>" % url
+
+    api._API__request_text = fake_request_text
+
+    parsed, _, used_url = await api._API__fetch_parsed_from_urls(
+        ["https://example.com/slow", "https://example.com/fast", "https://example.com/unused"]
+    )
+
+    assert used_url == "https://example.com/fast"
+    assert parsed.xpath("string(//*[@id='ok'])") == "https://example.com/fast"
+    assert started == ["https://example.com/slow", "https://example.com/fast"]
+    assert cancelled == ["https://example.com/slow"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_parsed_from_urls_hedge_caps_inflight_and_replaces_failures(monkeypatch):
+    monkeypatch.setattr(dc_api, "FETCH_HEDGE_DELAY_MS", 10)
+    monkeypatch.setattr(dc_api, "FETCH_HEDGE_MAX_INFLIGHT", 2)
+    api = API.__new__(API)
+    state = {"active": 0, "max_active": 0}
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            if url.endswith("/hang"):
+                await asyncio.sleep(5)
+            if url.endswith("/broken"):
+                raise RuntimeError("upstream failure")
+            await asyncio.sleep(0.05)
+            return 200, {}, "<html><body><div id='ok'>%s</div></body></html>" % url
+        finally:
+            state["active"] -= 1
+
+    api._API__request_text = fake_request_text
+
+    _, _, used_url = await api._API__fetch_parsed_from_urls(
+        ["https://example.com/hang", "https://example.com/broken", "https://example.com/ok", "https://example.com/late"]
+    )
+
+    assert used_url == "https://example.com/ok"
+    assert state["max_active"] == 2
+    assert state["active"] == 0
+
+
 @pytest.mark.asyncio
 async def test_fetch_parsed_from_urls_preserves_recommend_on_top_level_redirect():
     api = API.__new__(API)
@@ -1189,6 +1320,48 @@ async def test_board_falls_back_to_pc_when_mobile_page_is_not_parseable():
     assert rows[0].time_is_precise is True
 
 
+def _pin_board_kind_store(backend):
+    cache_utils.register_shared_cache(dc_api._BOARD_KIND_CACHE, "board_kind", backend=backend)
+    cache_utils.register_shared_cache(dc_api._GALLERY_KIND_CACHE, "gallery_kind", backend=backend)
+
+
+@pytest.mark.asyncio
+async def test_board_kind_store_survives_restart_and_orders_view_urls(tmp_path):
+    path = str(tmp_path / "board_kind_cache.sqlite3")
+    seen_batches = []
+
+    async def fake_fetch(urls, validator=None):
+        seen_batches.append(list(urls))
+        for url in urls:
+            if "/mgallery/" in url:
+                return _pc_board_html(), "ok", url
+        return None, "", None
+
+    try:
+        _pin_board_kind_store(cache_utils.SQLiteCacheBackend(path=path))
+        first_worker = API.__new__(API)
+        first_worker._API__fetch_parsed_from_urls = fake_fetch
+        rows = [item async for item in first_worker.board("test", num=1, max_scan_pages=1)]
+        assert [row.id for row in rows] == ["123"]
+
+        # 재시작한 워커는 새 커넥션으로 같은 파일을 읽는다.
+        _pin_board_kind_store(cache_utils.SQLiteCacheBackend(path=path))
+        seen_batches.clear()
+        second_worker = API.__new__(API)
+        second_worker._API__fetch_parsed_from_urls = fake_fetch
+        rows = [item async for item in second_worker.board("test", num=1, max_scan_pages=1)]
+        view_urls = second_worker._API__build_view_urls("test", "123")
+    finally:
+        _pin_board_kind_store(dc_api._BOARD_KIND_STORE)
+
+    assert [row.id for row in rows] == ["123"]
+    assert len(seen_batches) == 1
+    assert len(seen_batches[0]) == 1
+    assert "/mgallery/board/lists/" in seen_batches[0][0]
+    assert "m.dcinside.com/board/test/123" in view_urls[0]
+    assert "/mgallery/board/view/" in view_urls[1]
+
+
 @pytest.mark.asyncio
 async def test_board_precise_times_fetches_pc_list_only():
     api = API.__new__(API)
@@ -1293,6 +1466,48 @@ async def test_board_precise_times_looks_ahead_for_rendered_overflow_row():
     assert any("page=3" in url for url in seen_urls)
 
 
+@pytest.mark.asyncio
+async def test_board_precise_times_reuses_pc_list_fetched_for_board_rows():
+    api = API.__new__(API)
+    seen_urls = []
+
+    async def fake_fetch(urls, validator=None):
+        seen_urls.append(urls[0])
+        return _pc_board_html(), "ok", urls[0]
+
+    api._API__fetch_parsed_from_urls = fake_fetch
+
+    rows = [item async for item in api.board("test", num=5, kind="normal", max_scan_pages=1, prefer_pc=True)]
+    times = await api.board_precise_times("test", page=1, kind="normal", target_ids=["123"])
+
+    assert [row.id for row in rows] == ["123"]
+    assert rows[0].time_is_precise is True
+    assert str(times["123"]) == "2026-04-16 12:00:00"
+    assert len(seen_urls) == 1
+    assert "m.dcinside.com" not in seen_urls[0]
+
+
+@pytest.mark.asyncio
+async def test_board_prefer_pc_falls_back_to_mobile_list_when_pc_fails():
+    api = API.__new__(API)
+    seen_urls = []
+
+    async def fake_fetch(urls, validator=None):
+        seen_urls.append(list(urls))
+        if all("m.dcinside.com" not in url for url in urls):
+            return None, "", None
+        mobile_url = next(url for url in urls if "m.dcinside.com" in url)
+        return lxml.html.fromstring(_mobile_board_html()), "ok", mobile_url
+
+    api._API__fetch_parsed_from_urls = fake_fetch
+
+    rows = [item async for item in api.board("test", num=5, kind="normal", max_scan_pages=1, prefer_pc=True)]
+
+    assert [row.title for row in rows] == ["mobile title"]
+    assert len(seen_urls) == 2
+    assert not dc_api._PC_LIST_CACHE
+
+
 @pytest.mark.asyncio
 async def test_board_falls_back_to_pc_when_mobile_list_has_only_ads():
     api = API.__new__(API)
@@ -1403,6 +1618,88 @@ async def test_document_falls_back_to_pc_when_mobile_page_is_not_parseable():
     assert doc.is_mobile_source is False
 
 
+@pytest.mark.asyncio
+async def test_document_fetches_pc_media_polls_and_first_comment_page_together():
+    api = API.__new__(API)
+    api.session = None
+    mobile_url = "https://m.dcinside.com/board/test/123"
+    state = {"inflight": 0, "peak": 0}
+    requests = []
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        if url == mobile_url:
+            return 200, {}, """
+            <html><body>
+              <div class="gall-tit-box">
+                <span class="tit">mobile title</span>
+                <ul class="ginfo2"><li>익명(1.2)</li><li>2026.04.16 12:00</li></ul>
+              </div>
+              <div class="thum-txtin">
+                <img src="https://nstatic.dcinside.com/dc/m/img/gallview_loading_ori.gif">
+                <iframe src="https://m.dcinside.com/poll?vote_id=7"></iframe>
+              </div>
+            </body></html>
+            """
+        requests.append(url)
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        await asyncio.sleep(0.01)
+        state["inflight"] -= 1
+        if "poll" in url:
+            return 200, {}, '<html><body><div class="vote-tit-inner">poll title</div></body></html>'
+        if "response-comment" in url:
+            return 200, {}, _mobile_comment_page(data["cpage"], 1)
+        return 200, {}, """
+        <html><body><div class="writing_view_box">
+          <img src="https://dcimg7.dcinside.co.kr/viewimage.php?id=test&amp;no=real">
+        </div></body></html>
+        """
+
+    api._API__request_text = fake_request_text
+
+    doc = await api.document("test", "123", kind="normal", prefetch_comments=True)
+
+    assert state["peak"] == 3
+    assert doc.first_comment_page.done()
+    assert [image.src for image in doc.images] == ["https://dcimg7.dcinside.co.kr/viewimage.php?id=test&no=real"]
+    assert "poll title" in doc.html
+    assert [item.id async for item in doc.comments()] == ["1"]
+    pagination = {}
+    assert [
+        item.id
+        async for item in api.mobile_comments(
+            "test", "123", pagination_collector=pagination, first_page=doc.first_comment_page
+        )
+    ] == ["1"]
+    assert pagination == {"last_page": 1}
+    assert sum("response-comment" in url for url in requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_document_without_prefetch_leaves_comments_lazy():
+    api = API.__new__(API)
+    requests = []
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        requests.append(url)
+        return 200, {}, """
+        <html><body>
+          <div class="gall-tit-box">
+            <span class="tit">mobile title</span>
+            <ul class="ginfo2"><li>익명(1.2)</li><li>2026.04.16 12:00</li></ul>
+          </div>
+          <div class="thum-txtin"><p>mobile body</p></div>
+        </body></html>
+        """
+
+    api._API__request_text = fake_request_text
+
+    doc = await api.document("test", "123", kind="normal")
+
+    assert doc.first_comment_page is None
+    assert requests == ["https://m.dcinside.com/board/test/123"]
+
+
 @pytest.mark.asyncio
 async def test_document_reuses_embedded_mobile_post_list():
     api = API.__new__(API)
@@ -1779,3 +2076,169 @@ async def test_comments_zero_limit_skips_mobile_and_pc_fetches():
     comments = [item async for item in api.comments("aoegame", "30150503", num=0)]
 
     assert comments == []
+
+
+@pytest.mark.asyncio
+async def test_mobile_comments_starts_at_page_and_records_last_page():
+    api = API.__new__(API)
+    requested_pages = []
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        page = data["cpage"]
+        requested_pages.append(page)
+        return 200, {}, f"""
+        <html><head></head><body>
+          <li no="{page}" m_no="0">
+            <div><span>mobile author</span></div>
+            <p>mobile {page}</p>
+            <span>04.16 12:00:00</span>
+          </li>
+          <span class="pgnum">{page}/3</span>
+        </body></html>
+        """
+
+    api._API__request_text = fake_request_text
+    pagination = {}
+
+    comments = [
+        item.id
+        async for item in api.mobile_comments("aoegame", "30150503", start_page=2, pagination_collector=pagination)
+    ]
+
+    assert requested_pages == [2, 3]
+    assert comments == ["2", "3"]
+    assert pagination == {"last_page": 3}
+
+
+def _mobile_comment_page(page, last_page):
+    return f"""
+    <html><head></head><body>
+      <li no="{page}" m_no="0">
+        <div><span>mobile author</span></div>
+        <p>mobile {page}</p>
+        <span>04.16 12:00:00</span>
+      </li>
+      <span class="pgnum">{page}/{last_page}</span>
+    </body></html>
+    """
+
+
+@pytest.mark.asyncio
+async def test_mobile_comments_fetch_remaining_pages_concurrently_in_order(monkeypatch):
+    monkeypatch.setattr(dc_api, "COMMENT_PAGE_CONCURRENCY", 2)
+    api = API.__new__(API)
+    state = {"inflight": 0, "peak": 0}
+    requested_pages = []
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        page = data["cpage"]
+        requested_pages.append(page)
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        # 뒤 페이지가 먼저 끝나도 결과 순서는 페이지 순서여야 한다.
+        await asyncio.sleep(0.001 * (6 - page))
+        state["inflight"] -= 1
+        return 200, {}, _mobile_comment_page(page, 5)
+
+    api._API__request_text = fake_request_text
+    pagination = {}
+
+    comments = [
+        item.id
+        async for item in api.mobile_comments("aoegame", "30150503", pagination_collector=pagination)
+    ]
+
+    assert comments == ["1", "2", "3", "4", "5"]
+    assert requested_pages[0] == 1
+    assert sorted(requested_pages) == [1, 2, 3, 4, 5]
+    assert state["peak"] == 2
+    assert pagination == {"last_page": 5}
+
+
+@pytest.mark.asyncio
+async def test_mobile_comments_fail_fast_raises_at_failed_page_and_cancels_rest(monkeypatch):
+    monkeypatch.setattr(dc_api, "COMMENT_PAGE_CONCURRENCY", 4)
+    api = API.__new__(API)
+    cancelled = []
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        page = data["cpage"]
+        if page == 3:
+            return 429, {}, "Too Many Requests"
+        if page > 3:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(page)
+                raise
+        return 200, {}, _mobile_comment_page(page, 5)
+
+    api._API__request_text = fake_request_text
+    comments = []
+
+    with pytest.raises(RuntimeError, match="mobile comment fetch failed: 429"):
+        async for item in api._API__comments_from_mobile("aoegame", "30150503", fail_fast=True):
+            comments.append(item.id)
+
+    assert comments == ["1", "2"]
+    assert sorted(cancelled) == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_pc_comments_fetch_remaining_pages_concurrently_and_dedupe(monkeypatch):
+    monkeypatch.setattr(dc_api, "COMMENT_PAGE_CONCURRENCY", 3)
+    api = API.__new__(API)
+    requested_pages = []
+
+    async def fake_context(board_id, document_id, kind=None):
+        return {
+            "referer": "https://gall.dcinside.com/mgallery/board/view/?id=aoegame&no=30150503",
+            "e_s_n_o": "token",
+            "board_type": "",
+            "_GALLTYPE_": "M",
+            "secret_article_key": "",
+        }
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        page = int(data["comment_page"])
+        requested_pages.append(page)
+        await asyncio.sleep(0.001 * (4 - page))
+        # 페이지 경계에서 댓글이 밀려 앞 페이지의 마지막 댓글이 다시 나오는 경우
+        ids = [str(page * 10), str(page * 10 + 1)] + ([str((page - 1) * 10 + 1)] if page > 1 else [])
+        body = json.dumps(
+            {
+                "comments": [
+                    {"no": cid, "parent": "30150503", "user_id": "", "name": "a", "ip": "",
+                     "reg_date": "02.11 17:42:17", "memo": cid, "depth": 0}
+                    for cid in ids
+                ],
+                "pagination": "<a>1</a><a>2</a><a>3</a>",
+            }
+        )
+        return 200, {}, body
+
+    api._API__get_pc_comment_context = fake_context
+    api._API__request_text = fake_request_text
+
+    comments = [item.id async for item in api._API__comments_from_pc("aoegame", "30150503", kind="minor")]
+
+    assert comments == ["10", "11", "20", "21", "30", "31"]
+    assert sorted(requested_pages) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_mobile_comments_with_limit_fetch_pages_one_at_a_time(monkeypatch):
+    monkeypatch.setattr(dc_api, "COMMENT_PAGE_CONCURRENCY", 4)
+    api = API.__new__(API)
+    requested_pages = []
+
+    async def fake_request_text(method, url, headers=None, data=None, cookies=None):
+        requested_pages.append(data["cpage"])
+        return 200, {}, _mobile_comment_page(data["cpage"], 5)
+
+    api._API__request_text = fake_request_text
+
+    comments = [item.id async for item in api._API__comments_from_mobile("aoegame", "30150503", num=2)]
+
+    assert comments == ["1", "2"]
+    assert requested_pages == [1, 2]
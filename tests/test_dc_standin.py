@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from app.services import media_proxy, standin
+from app.services.dc import api as dc_api
+from app.services.dc.api import API
+from scripts.dc_standin import STANDIN_KEY, StandinConfig, classify, create_app
+
+
+@pytest_asyncio.fixture
+async def standin_server(monkeypatch):
+    servers = []
+
+    async def start(config=None):
+        app = create_app(config or StandinConfig(seed=1))
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        monkeypatch.setattr(standin, "STANDIN_URL", f"http://127.0.0.1:{port}")
+        servers.append(runner)
+        return app[STANDIN_KEY]
+
+    yield start
+    for runner in servers:
+        await runner.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def isolated_api_caches(monkeypatch):
+    monkeypatch.setattr(dc_api, "_RATE_LIMIT_STATE", {"last_at": 0.0, "count": 0})
+    dc_api._PC_LIST_CACHE.clear()
+    dc_api._BOARD_KIND_CACHE.clear()
+    dc_api._GALLERY_KIND_CACHE.clear()
+    yield
+    dc_api._PC_LIST_CACHE.clear()
+    dc_api._BOARD_KIND_CACHE.clear()
+    dc_api._GALLERY_KIND_CACHE.clear()
+
+
+def test_standin_url_rewrites_only_dcinside_hosts(monkeypatch):
+    monkeypatch.setattr(standin, "STANDIN_URL", "http://127.0.0.1:8765")
+
+    assert standin.standin_url("https://m.dcinside.com/board/test?page=2") == (
+        "http://127.0.0.1:8765/m.dcinside.com/board/test?page=2"
+    )
+    assert standin.standin_url("https://dcimg7.dcinside.co.kr/viewimage.php?id=a&no=b") == (
+        "http://127.0.0.1:8765/dcimg7.dcinside.co.kr/viewimage.php?id=a&no=b"
+    )
+    assert standin.standin_url("https://example.com/x") == "https://example.com/x"
+
+    monkeypatch.setattr(standin, "STANDIN_URL", "")
+    assert standin.standin_url("https://m.dcinside.com/board/test") == "https://m.dcinside.com/board/test"
+
+
+def test_standin_is_enabled_only_in_explicit_development(monkeypatch):
+    monkeypatch.setenv("MIRROR_DC_STANDIN_URL", "http://127.0.0.1:8765/")
+
+    monkeypatch.delenv("MIRROR_ENV", raising=False)
+    assert standin._configured_standin_url() == ""
+    monkeypatch.setenv("MIRROR_ENV", "staging")
+    assert standin._configured_standin_url() == ""
+    monkeypatch.setenv("MIRROR_ENV", "development")
+    assert standin._configured_standin_url() == "http://127.0.0.1:8765"
+
+
+def test_media_proxy_keeps_address_pinning_for_non_standin_hosts(monkeypatch):
+    monkeypatch.setattr(standin, "STANDIN_URL", "http://127.0.0.1:8765")
+    monkeypatch.setattr(media_proxy, "resolve_media_target", lambda url: None)
+
+    with pytest.raises(media_proxy.UnsafeMediaAddress):
+        media_proxy._http_get("https://example.com/x.png", timeout=1)
+    with pytest.raises(media_proxy.UnsafeMediaAddress):
+        media_proxy._http_head("https://example.com/x.png", timeout=1)
+
+
+def test_standin_classifies_upstream_routes():
+    assert classify("m.dcinside.com", "/board/test", "GET") == "mobile_list"
+    assert classify("m.dcinside.com", "/board/test/123", "GET") == "mobile_view"
+    assert classify("m.dcinside.com", "/ajax/response-comment", "POST") == "mobile_comments"
+    assert classify("m.dcinside.com", "/poll", "GET") == "poll"
+    assert classify("gall.dcinside.com", "/mgallery/board/lists/", "GET") == "pc_list"
+    assert classify("gall.dcinside.com", "/board/view/", "GET") == "pc_view"
+    assert classify("gall.dcinside.com", "/board/comment/", "POST") == "pc_comments"
+    assert classify("dcimg7.dcinside.co.kr", "/viewimage.php", "GET") == "media"
+    assert classify("gall.dcinside.com", "/unknown", "GET") is None
+
+
+@pytest.mark.asyncio
+async def test_api_reads_board_document_and_comments_from_standin(standin_server):
+    server = await standin_server(StandinConfig(comment_count=120, seed=1))
+
+    async with API() as api:
+        rows = [row async for row in api.board("standin", num=30, kind="normal")]
+        doc = await api.document("standin", str(rows[0].id), kind="normal", prefetch_comments=True)
+        comments = [comment async for comment in doc.comments()]
+
+    assert len(rows) == 30
+    assert rows[0].id == "900000"
+    assert doc.title == "title 900000"
+    assert "standin poll 900000" in doc.html
+    assert [comment.id for comment in comments] == [str(index) for index in range(1, 121)]
+    assert server.stats["by_kind"]["mobile_comments"] == 3
+    assert server.stats["unknown"] == 0
+
+
+@pytest.mark.asyncio
+async def test_injected_rate_limit_on_mobile_comments_falls_back_to_pc(standin_server):
+    server = await standin_server(
+        StandinConfig(comment_count=30, seed=1, overrides={"mobile_comments": {"rate_limit_rate": 1.0}})
+    )
+
+    async with API() as api:
+        comments = [comment.id async for comment in api.comments("standin", "900000", kind="normal")]
+
+    assert comments == [str(index) for index in range(1, 31)]
+    assert server.stats["rate_limited"] == 1
+    assert server.stats["by_kind"]["pc_comments"] == 1
+
+
+@pytest.mark.asyncio
+async def test_media_proxy_fetches_media_from_standin(standin_server):
+    await standin_server()
+
+    upstream, error = await asyncio.to_thread(
+        media_proxy.fetch_media_response,
+        "https://dcimg7.dcinside.co.kr/viewimage.php?id=standin&no=1",
+        {},
+        {},
+    )
+
+    assert error is None
+    assert upstream.status_code == 200
+    assert upstream.headers["Content-Type"] == "image/gif"
+    assert upstream.content.startswith(b"GIF89a")
+    upstream.close()
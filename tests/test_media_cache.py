@@ -0,0 +1,223 @@
+import os
+
+import pytest
+
+from app import create_app
+from app.services import media_cache, media_proxy
+
+SRC = "https://dcimg7.dcinside.co.kr/viewimage.php?id=test&no=1"
+
+
+class DummyUpstream:
+    def __init__(self, chunks, headers=None, status_code=200):
+        self.chunks = chunks
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        yield from self.chunks
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def disk_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(media_cache, "MEDIA_DISK_CACHE_MAX_BYTES", 1024)
+    monkeypatch.setattr(media_cache, "MEDIA_DISK_CACHE_DIR", str(tmp_path))
+    media_cache.reset_media_cache_stats()
+    yield tmp_path
+    _wait_for_eviction()
+    media_cache.reset_media_cache_stats()
+
+
+def _wait_for_eviction():
+    # 정리 스레드는 도는 동안 _EVICT_LOCK을 쥐고 있다.
+    with media_cache._EVICT_LOCK:
+        pass
+
+
+def _install_upstream(monkeypatch, body=b"GIF89a-body", content_type="image/gif", with_length=False):
+    calls = []
+
+    def fake_fetch(src, headers, cookies, method="GET"):
+        calls.append((src, method, headers.get("Range")))
+        upstream_headers = {"Content-Type": content_type}
+        if with_length:
+            upstream_headers["Content-Length"] = str(len(body))
+        return DummyUpstream([body[:4], body[4:]], headers=upstream_headers), None
+
+    monkeypatch.setattr(media_proxy, "fetch_media_response", fake_fetch)
+    return calls
+
+
+def test_media_disk_cache_serves_repeat_requests_from_file(monkeypatch, disk_cache):
+    calls = _install_upstream(monkeypatch)
+    client = create_app().test_client()
+
+    first = client.get("/media", query_string={"src": SRC})
+    second = client.get("/media", query_string={"src": SRC, "board": "other", "pid": "2"})
+
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data == b"GIF89a-body"
+    assert second.headers["Content-Type"] == "image/gif"
+    assert second.headers["Content-Length"] == "11"
+    assert second.headers["Cache-Control"] == f"public, max-age={media_proxy.MEDIA_CACHE_MAX_AGE}"
+    assert second.headers["X-Content-Type-Options"] == "nosniff"
+    assert len(calls) == 1
+    stats = media_cache.media_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+    assert stats["saved_upstream_bytes"] == 11
+    assert [name for name in os.listdir(disk_cache / media_cache.cache_key(SRC)[:2]) if name.startswith(".tmp-")] == []
+
+
+def test_media_disk_cache_answers_range_and_head_from_file(monkeypatch, disk_cache):
+    calls = _install_upstream(monkeypatch)
+    client = create_app().test_client()
+    client.get("/media", query_string={"src": SRC})
+
+    partial = client.get("/media", query_string={"src": SRC}, headers={"Range": "bytes=2-5"})
+    head = client.head("/media", query_string={"src": SRC})
+
+    assert partial.status_code == 206
+    assert partial.data == b"F89a"
+    assert partial.headers["Content-Range"] == "bytes 2-5/11"
+    assert head.status_code == 200
+    assert head.headers["Content-Length"] == "11"
+    assert len(calls) == 1
+
+
+def test_media_disk_cache_streams_first_response_while_storing(monkeypatch, disk_cache):
+    calls = _install_upstream(monkeypatch, with_length=True)
+    client = create_app().test_client()
+
+    first = client.get("/media", query_string={"src": SRC}, buffered=False)
+    chunks = iter(first.response)
+    assert next(chunks) == b"GIF8"
+    # 받는 중인 키는 다른 요청이 저장 없이 upstream을 중계한다.
+    relayed = client.get("/media", query_string={"src": SRC})
+    assert relayed.data == b"GIF89a-body"
+    assert media_cache.media_cache_stats()["filling"] == 1
+    assert media_cache.media_cache_stats()["stores"] == 0
+
+    assert b"".join(chunks) == b"9a-body"
+    first.close()
+    hit = client.get("/media", query_string={"src": SRC})
+
+    assert first.headers["Content-Length"] == "11"
+    assert hit.data == b"GIF89a-body"
+    assert len(calls) == 2
+    stats = media_cache.media_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["filling"]) == (1, 2, 1, 0)
+
+
+def test_media_disk_cache_discards_partial_file_when_client_disconnects(monkeypatch, disk_cache):
+    _install_upstream(monkeypatch, with_length=True)
+    client = create_app().test_client()
+
+    response = client.get("/media", query_string={"src": SRC}, buffered=False)
+    assert next(iter(response.response)) == b"GIF8"
+    response.close()
+
+    assert media_cache.lookup(media_cache.cache_key(SRC)) is None
+    assert os.listdir(disk_cache / media_cache.cache_key(SRC)[:2]) == []
+    assert media_cache.media_cache_stats()["filling"] == 0
+
+
+def test_media_disk_cache_skips_entries_over_the_per_entry_cap(monkeypatch, disk_cache):
+    monkeypatch.setattr(media_cache, "MEDIA_DISK_CACHE_MAX_ENTRY_BYTES", 8)
+    calls = _install_upstream(monkeypatch, with_length=True)
+    client = create_app().test_client()
+
+    first = client.get("/media", query_string={"src": SRC})
+    second = client.get("/media", query_string={"src": SRC})
+
+    assert first.data == second.data == b"GIF89a-body"
+    assert len(calls) == 2
+    stats = media_cache.media_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (0, 2, 0)
+    assert stats["hit_ratio"] == 0
+
+
+def test_media_disk_cache_rejects_oversized_bodies_without_leaving_files(monkeypatch, disk_cache):
+    monkeypatch.setattr(media_proxy, "MEDIA_MAX_BYTES", 8)
+    _install_upstream(monkeypatch)
+    client = create_app().test_client()
+
+    oversized = client.get("/media", query_string={"src": SRC})
+
+    assert oversized.status_code == 413
+    assert media_cache.lookup(media_cache.cache_key(SRC)) is None
+    stats = media_cache.media_cache_stats()
+    assert (stats["misses"], stats["stores"]) == (1, 0)
+
+
+def test_media_disk_cache_counts_range_and_head_misses(monkeypatch, disk_cache):
+    calls = _install_upstream(monkeypatch)
+    client = create_app().test_client()
+
+    client.get("/media", query_string={"src": SRC}, headers={"Range": "bytes=0-3"})
+    client.head("/media", query_string={"src": SRC})
+
+    assert [method for _src, method, _range in calls] == ["GET", "HEAD"]
+    stats = media_cache.media_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (0, 2, 0)
+
+
+def test_media_disk_cache_counts_miss_when_store_fails(monkeypatch, disk_cache):
+    def failing_commit(self, fetch_ms=None):
+        self.abort()
+        raise OSError("disk full")
+
+    monkeypatch.setattr(media_cache.MediaCacheWriter, "commit", failing_commit)
+    _install_upstream(monkeypatch, with_length=True)
+    client = create_app().test_client()
+
+    response = client.get("/media", query_string={"src": SRC})
+
+    assert response.status_code == 200
+    assert response.data == b"GIF89a-body"
+    stats = media_cache.media_cache_stats()
+    assert (stats["misses"], stats["stores"], stats["errors"], stats["filling"]) == (1, 0, 1, 0)
+
+
+def test_media_disk_cache_evicts_least_recently_used_entries(disk_cache, monkeypatch):
+    monkeypatch.setattr(media_cache, "MEDIA_DISK_CACHE_MAX_BYTES", 10)
+    keys = [media_cache.cache_key("%s&n=%d" % (SRC, index)) for index in range(3)]
+    for index, key in enumerate(keys[:2]):
+        entry = media_cache.store(key, [b"1234"], "image/png", 100)
+        _wait_for_eviction()
+        os.utime(entry.path + media_cache.META_SUFFIX, (1000 + index, 1000 + index))
+    # 오래된 쪽을 다시 읽으면 최근 사용으로 올라간다.
+    assert media_cache.lookup(keys[0]) is not None
+
+    media_cache.store(keys[2], [b"5678"], "image/png", 100)
+    _wait_for_eviction()
+
+    assert media_cache.lookup(keys[1]) is None
+    assert media_cache.lookup(keys[0]) is not None
+    assert media_cache.lookup(keys[2]) is not None
+    stats = media_cache.media_cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 8
+
+
+def test_media_disk_cache_store_leaves_eviction_to_one_background_thread(disk_cache, monkeypatch):
+    monkeypatch.setattr(media_cache, "MEDIA_DISK_CACHE_MAX_BYTES", 10)
+    keys = [media_cache.cache_key("%s&n=%d" % (SRC, index)) for index in range(3)]
+    media_cache.store(keys[0], [b"1234"], "image/png", 100)
+    _wait_for_eviction()
+
+    # 정리가 이미 도는 중이면 저장은 디렉터리를 훑지 않고 바로 돌아온다.
+    with media_cache._EVICT_LOCK:
+        media_cache.store(keys[1], [b"1234"], "image/png", 100)
+        media_cache.store(keys[2], [b"1234"], "image/png", 100)
+        assert media_cache.media_cache_stats()["evictions"] == 0
+
+    media_cache.store(keys[0], [b"1234"], "image/png", 100)
+    _wait_for_eviction()
+
+    stats = media_cache.media_cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 8
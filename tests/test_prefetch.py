@@ -0,0 +1,114 @@
+import asyncio
+import threading
+
+import pytest
+
+from app import create_app, routes
+from app.services import async_bridge, prefetch
+from app.services.dc import api as dc_api
+
+
+@pytest.fixture(autouse=True)
+def enabled_prefetch(monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_ENABLED", True)
+    monkeypatch.setattr(dc_api, "_RATE_LIMIT_STATE", {"last_at": 0.0, "count": 0})
+    prefetch.reset_prefetch_state()
+    yield
+    async_bridge.shutdown_async_bridge()
+    prefetch.reset_prefetch_state()
+
+
+def _wait_for(predicate, timeout=1.0):
+    done = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return True
+        done.wait(0.01)
+    return predicate()
+
+
+def test_prefetch_runs_once_per_dedupe_window_and_reports_hits():
+    calls = []
+
+    async def warm():
+        calls.append(1)
+        return "warm"
+
+    assert prefetch.schedule_prefetch(("board", "test", 2), warm) is True
+    assert prefetch.schedule_prefetch(("board", "test", 2), warm) is False
+    assert _wait_for(lambda: prefetch.prefetch_stats()["completed"] == 1)
+
+    assert prefetch.record_prefetch_use(("board", "test", 2)) is True
+    assert prefetch.record_prefetch_use(("board", "test", 2)) is False
+    assert prefetch.record_prefetch_use(("board", "test", 3)) is False
+    stats = prefetch.prefetch_stats()
+    assert calls == [1]
+    assert stats["scheduled"] == 1
+    assert stats["skipped_duplicate"] == 1
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 1.0
+    assert stats["inflight"] == 0
+
+
+def test_prefetch_respects_concurrency_cap(monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_MAX_CONCURRENCY", 1)
+    release = threading.Event()
+
+    async def slow():
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+
+    assert prefetch.schedule_prefetch(("board", "test", 2), slow) is True
+    assert prefetch.schedule_prefetch(("board", "test", 3), slow) is False
+    release.set()
+    assert _wait_for(lambda: prefetch.prefetch_stats()["inflight"] == 0)
+    assert prefetch.schedule_prefetch(("board", "test", 3), slow) is True
+    assert prefetch.prefetch_stats()["skipped_busy"] == 1
+
+
+def test_prefetch_stops_after_upstream_rate_limit():
+    async def warm():
+        raise AssertionError("prefetch must not run while rate limited")
+
+    dc_api._mark_rate_limited()
+
+    assert prefetch.schedule_prefetch(("board", "test", 2), warm) is False
+    assert prefetch.prefetch_stats()["skipped_rate_limited"] == 1
+
+
+def test_prefetch_disabled_skips_without_scheduling(monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_ENABLED", False)
+
+    async def warm():
+        raise AssertionError("disabled prefetch must not run")
+
+    assert prefetch.schedule_prefetch(("board", "test", 2), warm) is False
+    assert prefetch.prefetch_stats()["skipped_disabled"] == 1
+
+
+def test_board_route_prefetches_next_page_unless_last(monkeypatch):
+    scheduled = []
+
+    async def board_payload(page, board, recommend, pagination_collector=None, **kwargs):
+        pagination_collector["has_next"] = page < 2
+        return [
+            {
+                "id": "1",
+                "title": "title",
+                "comment_count": 0,
+                "subject": None,
+                "author": "익명",
+                "author_code": None,
+                "time": "-",
+                "voteup_count": 0,
+            }
+        ], []
+
+    monkeypatch.setattr(routes, "_load_board_payload", board_payload)
+    monkeypatch.setattr(routes, "schedule_prefetch", lambda key, factory: scheduled.append(key))
+    client = create_app().test_client()
+
+    client.get("/board?board=test&page=1&kind=minor")
+    client.get("/board?board=test&page=2&kind=minor")
+
+    assert scheduled == [("board", "test", "minor", 0, "", "", "", 2)]
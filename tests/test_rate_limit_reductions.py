@@ -1,9 +1,13 @@
 import asyncio
+from contextlib import asynccontextmanager
 
 import pytest
 
 from app.services import async_bridge
 from app.services import core
+from app.services.admission import cache_only
+from app.services.dc import deadline, limiter
+from app.services.dc.deadline import DeadlineExceeded
 from app.services.dc.models import Comment, DocumentIndex
 
 
@@ -36,17 +40,21 @@ def clear_core_caches():
     core._BOARD_INDEX_CACHE.clear()
     core._BOARD_TIME_CACHE.clear()
     core._READ_CACHE.clear()
+    core._READ_BODY_CACHE.clear()
+    core._READ_COMMENTS_CACHE.clear()
     core._LATEST_ID_CACHE.clear()
     core._AUTHOR_CODE_CACHE.clear()
-    core._CACHE_PRUNE_STATE.clear()
+    core._PAGE_ID_INDEX.clear()
     yield
     core._BOARD_PAGE_CACHE.clear()
     core._BOARD_INDEX_CACHE.clear()
     core._BOARD_TIME_CACHE.clear()
     core._READ_CACHE.clear()
+    core._READ_BODY_CACHE.clear()
+    core._READ_COMMENTS_CACHE.clear()
     core._LATEST_ID_CACHE.clear()
     core._AUTHOR_CODE_CACHE.clear()
-    core._CACHE_PRUNE_STATE.clear()
+    core._PAGE_ID_INDEX.clear()
 
 
 def test_core_caches_use_separate_locks():
@@ -161,8 +169,12 @@ async def test_async_index_with_head_categories_reuses_short_cache(monkeypatch):
         max_scan_pages=1,
         pagination_collector=first_pagination,
     )
-    first_rows[0]["title"] = "mutated"
-    first_categories[0]["label"] = "mutated"
+    with pytest.raises(TypeError):
+        first_rows[0]["title"] = "mutated"
+    with pytest.raises(TypeError):
+        first_categories[0]["label"] = "mutated"
+    first_rows.clear()
+    first_categories.clear()
     first_pagination["current_page"] = 99
     second_pagination = {}
     second_rows, second_categories = await core.async_index_with_head_categories(
@@ -182,6 +194,178 @@ async def test_async_index_with_head_categories_reuses_short_cache(monkeypatch):
     assert second_pagination == {"requested_page": 1, "current_page": 1, "has_next": False}
 
 
+@pytest.mark.asyncio
+async def test_async_index_serves_stale_rows_and_schedules_one_refresh(monkeypatch):
+    monkeypatch.setattr(core, "BOARD_PAGE_CACHE_TTL", 20)
+    monkeypatch.setattr(core, "BOARD_STALE_TTL", 60)
+    scheduled = []
+    monkeypatch.setattr(core, "schedule_single_flight", lambda key, factory: scheduled.append((key, factory)))
+
+    class FakeAPI:
+        board_calls = 0
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def board(self, **kwargs):
+            self.__class__.board_calls += 1
+            yield _index_item(200, is_mobile_source=True)
+
+    monkeypatch.setattr(core.dc_api, "API", FakeAPI)
+    cache_key = core._board_index_cache_key(1, "test", 0, fetch_num=1)
+    core._cache_set(
+        core._BOARD_INDEX_CACHE,
+        core._BOARD_INDEX_CACHE_LOCK,
+        cache_key,
+        ([{"id": "100"}], [], {"has_next": True}, core.time.time() - 30),
+        core._board_cache_ttl(),
+        core.BOARD_INDEX_CACHE_MAX_ITEMS,
+    )
+    pagination = {}
+
+    rows, _categories = await core.async_index_with_head_categories(
+        1,
+        "test",
+        0,
+        limit=1,
+        pagination_collector=pagination,
+    )
+
+    assert rows == [{"id": "100"}]
+    assert pagination["has_next"] is True
+    assert 30 <= pagination["cache_age"] < 40
+    assert FakeAPI.board_calls == 0
+    assert [key for key, _factory in scheduled] == [("board_index",) + cache_key]
+
+    await scheduled[0][1]()
+    fresh_pagination = {}
+    refreshed_rows, _ = await core.async_index_with_head_categories(
+        1,
+        "test",
+        0,
+        limit=1,
+        pagination_collector=fresh_pagination,
+    )
+
+    assert [row["id"] for row in refreshed_rows] == ["200"]
+    assert fresh_pagination["cache_age"] < 20
+    assert FakeAPI.board_calls == 1
+    assert len(scheduled) == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetched_board_index_flight_keeps_background_priority(monkeypatch):
+    priorities = []
+
+    class FakeAPI:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def board(self, **kwargs):
+            priorities.append(limiter._REQUEST_PRIORITY.get())
+            yield _index_item(200, is_mobile_source=True)
+
+    monkeypatch.setattr(core.dc_api, "API", FakeAPI)
+
+    # schedule_prefetch가 미리 가져오기를 돌리는 방식 그대로 감싼다.
+    await limiter.run_with_priority(
+        limiter.PRIORITY_BACKGROUND,
+        lambda: core.async_index_with_head_categories(2, "priority-test", 0, limit=1),
+    )
+
+    assert priorities == [limiter.PRIORITY_BACKGROUND]
+
+
+@pytest.mark.asyncio
+async def test_stale_board_rows_skip_refresh_while_upstream_circuit_is_open(monkeypatch):
+    monkeypatch.setattr(core, "BOARD_PAGE_CACHE_TTL", 20)
+    monkeypatch.setattr(core, "BOARD_STALE_TTL", 60)
+    monkeypatch.setattr(core, "circuit_open", lambda: True)
+    scheduled = []
+    monkeypatch.setattr(core, "schedule_single_flight", lambda key, factory: scheduled.append(key))
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(core.time, "time", lambda: clock["now"])
+
+    class FakeAPI:
+        calls = 0
+
+        async def board(self, **kwargs):
+            self.calls += 1
+            yield _index_item(300 + self.calls, is_mobile_source=True)
+
+    api = FakeAPI()
+    await core._fetch_board_page(api, 1, "test", 0, page_size=1)
+    clock["now"] += 30
+    stale = await core._fetch_board_page(api, 1, "test", 0, page_size=1)
+
+    assert [row["id"] for row in stale] == ["301"]
+    assert api.calls == 1
+    assert scheduled == []
+
+
+@pytest.mark.asyncio
+async def test_stale_board_rows_skip_refresh_while_request_is_shed(monkeypatch):
+    monkeypatch.setattr(core, "BOARD_PAGE_CACHE_TTL", 20)
+    monkeypatch.setattr(core, "BOARD_STALE_TTL", 60)
+    scheduled = []
+    monkeypatch.setattr(core, "schedule_single_flight", lambda key, factory: scheduled.append(key))
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(core.time, "time", lambda: clock["now"])
+
+    class FakeAPI:
+        calls = 0
+
+        async def board(self, **kwargs):
+            self.calls += 1
+            yield _index_item(300 + self.calls, is_mobile_source=True)
+
+    api = FakeAPI()
+    await core._fetch_board_page(api, 1, "test", 0, page_size=1)
+    clock["now"] += 30
+    with cache_only():
+        stale = await core._fetch_board_page(api, 1, "test", 0, page_size=1)
+
+    assert [row["id"] for row in stale] == ["301"]
+    assert api.calls == 1
+    assert scheduled == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_board_page_blocks_after_stale_window(monkeypatch):
+    monkeypatch.setattr(core, "BOARD_PAGE_CACHE_TTL", 20)
+    monkeypatch.setattr(core, "BOARD_STALE_TTL", 60)
+    scheduled = []
+    monkeypatch.setattr(core, "schedule_single_flight", lambda key, factory: scheduled.append(key))
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(core.time, "time", lambda: clock["now"])
+
+    class FakeAPI:
+        calls = 0
+
+        async def board(self, **kwargs):
+            self.calls += 1
+            yield _index_item(300 + self.calls, is_mobile_source=True)
+
+    api = FakeAPI()
+    first = await core._fetch_board_page(api, 1, "test", 0, page_size=1)
+    clock["now"] += 30
+    stale = await core._fetch_board_page(api, 1, "test", 0, page_size=1)
+    clock["now"] += 60
+    blocked = await core._fetch_board_page(api, 1, "test", 0, page_size=1)
+
+    assert [row["id"] for row in first] == ["301"]
+    assert [row["id"] for row in stale] == ["301"]
+    assert [row["id"] for row in blocked] == ["302"]
+    assert api.calls == 2
+    assert len(scheduled) == 1
+
+
 @pytest.mark.asyncio
 async def test_async_index_force_refresh_replaces_cached_board_rows(monkeypatch):
     class FakeAPI:
@@ -419,6 +603,117 @@ async def test_fill_missing_author_codes_enabled_uses_cache_only(monkeypatch):
     assert api.document_calls == 0
 
 
+class _AuthorDocument:
+    def __init__(self, document_id):
+        self.author = "작성자"
+        self.author_id = "1.%s" % document_id
+        self.author_role = None
+
+
+def _use_flight_api(monkeypatch, api):
+    @asynccontextmanager
+    async def fake_dc_api_context():
+        yield api
+
+    monkeypatch.setattr(core, "dc_api_context", fake_dc_api_context)
+
+
+def _author_rows(*document_ids):
+    return [
+        {"id": document_id, "author": "익명", "author_code": None, "is_mobile_source": False}
+        for document_id in document_ids
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fill_missing_author_codes_fetches_concurrently_under_limit(monkeypatch):
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES", True)
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES_CONCURRENCY", 2)
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES_DEADLINE_MS", 1000)
+
+    class SlowAPI:
+        def __init__(self):
+            self.active = 0
+            self.max_active = 0
+            self.calls = []
+
+        async def document(self, board_id, document_id, **kwargs):
+            self.calls.append(document_id)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.02)
+            self.active -= 1
+            return _AuthorDocument(document_id)
+
+    api = SlowAPI()
+    _use_flight_api(monkeypatch, api)
+    rows = _author_rows("1", "2", "3", "4", "5")
+
+    await core._fill_missing_author_codes(api, "test", None, rows)
+
+    assert [row["author_code"] for row in rows] == ["1.1", "1.2", "1.3", "1.4", "1.5"]
+    assert sorted(api.calls) == ["1", "2", "3", "4", "5"]
+    assert api.max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_fill_missing_author_codes_leaves_late_rows_for_next_request(monkeypatch):
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES", True)
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES_CONCURRENCY", 2)
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES_DEADLINE_MS", 50)
+    release = asyncio.Event()
+
+    class MixedAPI:
+        def __init__(self):
+            self.calls = []
+
+        async def document(self, board_id, document_id, **kwargs):
+            self.calls.append(document_id)
+            if document_id == "2":
+                await release.wait()
+            return _AuthorDocument(document_id)
+
+    api = MixedAPI()
+    _use_flight_api(monkeypatch, api)
+    rows = _author_rows("1", "2")
+
+    await core._fill_missing_author_codes(api, "test", None, rows)
+
+    assert rows[0]["author_code"] == "1.1"
+    assert rows[1]["author_code"] is None
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    next_rows = _author_rows("2")
+    await core._fill_missing_author_codes(api, "test", None, next_rows)
+
+    assert next_rows[0]["author_code"] == "1.2"
+    assert api.calls == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_missing_author_code_flight_uses_its_own_api_session(monkeypatch):
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES", True)
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES_CONCURRENCY", 1)
+    monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES_DEADLINE_MS", 1000)
+
+    class ClosedAPI:
+        async def document(self, board_id, document_id, **kwargs):
+            raise RuntimeError("Session is closed")
+
+    class FlightAPI:
+        async def document(self, board_id, document_id, **kwargs):
+            return _AuthorDocument(document_id)
+
+    _use_flight_api(monkeypatch, FlightAPI())
+    rows = _author_rows("7")
+
+    await core._fill_missing_author_codes(ClosedAPI(), "test", None, rows)
+
+    assert rows[0]["author_code"] == "1.7"
+
+
 @pytest.mark.asyncio
 async def test_async_index_does_not_fetch_documents_for_missing_author_codes_by_default(monkeypatch):
     monkeypatch.setattr(core, "BOARD_FILL_AUTHOR_CODES", False)
@@ -518,6 +813,83 @@ async def test_read_document_fetches_comments_without_trusting_zero_hint():
     assert images == []
 
 
+@pytest.mark.asyncio
+async def test_read_document_keeps_comments_read_before_deadline():
+    class FakeComment:
+        author = "익명"
+        author_id = None
+        time = "-"
+        contents = "early comment"
+        parent_id = None
+        dccon = None
+        is_reply = False
+
+    class FakeDocument:
+        title = "title"
+        author = "익명"
+        author_id = None
+        time = "-"
+        voteup_count = 0
+        html = "<p>body</p>"
+        images = []
+
+        async def comments(self):
+            yield FakeComment()
+            raise DeadlineExceeded("request deadline exceeded")
+
+    class FakeAPI:
+        async def document(self, **kwargs):
+            return FakeDocument()
+
+    payload = await core._read_document_with_api(FakeAPI(), "123", "test")
+    data, comments, _images = payload
+
+    assert data["comments_truncated"] is True
+    assert [comment["contents"] for comment in comments] == ["early comment"]
+    assert not core._is_read_payload_cacheable(payload)
+
+
+def test_async_read_through_bridge_returns_comments_read_before_deadline(monkeypatch):
+    monkeypatch.setattr(core, "READ_BODY_CACHE_TTL", 0)
+
+    class FakeComment:
+        author = "익명"
+        author_id = None
+        time = "-"
+        contents = "early comment"
+        parent_id = None
+        dccon = None
+        is_reply = False
+
+    class FakeDocument:
+        title = "title"
+        author = "익명"
+        author_id = None
+        time = "-"
+        voteup_count = 0
+        html = "<p>body</p>"
+        images = []
+
+        async def comments(self):
+            yield FakeComment()
+            # 느린 upstream: 마감이 지날 때까지 다음 댓글 페이지가 오지 않는다.
+            await asyncio.sleep(deadline.remaining_time() + 0.05)
+            deadline.deadline_timeout(1)
+
+    class FakeAPI:
+        async def document(self, **kwargs):
+            return FakeDocument()
+
+    _use_flight_api(monkeypatch, FakeAPI())
+    try:
+        data, comments, _images = async_bridge.run_async(core.async_read("777", "deadline-test"), deadline=0.2)
+    finally:
+        async_bridge.shutdown_async_bridge()
+
+    assert data["comments_truncated"] is True
+    assert [comment["contents"] for comment in comments] == ["early comment"]
+
+
 @pytest.mark.asyncio
 async def test_read_document_passes_head_id_to_document_fetch():
     class FakeDocument:
@@ -596,6 +968,201 @@ async def test_async_read_cache_is_disabled_by_default(monkeypatch):
     assert FakeAPI.calls == 2
 
 
+@pytest.mark.asyncio
+async def test_async_read_coalesces_concurrent_misses_without_read_cache(monkeypatch):
+    monkeypatch.setattr(core, "READ_CACHE_TTL", 0)
+
+    class FakeDocument:
+        title = "title"
+        author = "익명"
+        author_id = None
+        time = "-"
+        voteup_count = 0
+        html = "<p>body</p>"
+        images = []
+        related_posts = [_index_item(456)]
+        embedded_comments = []
+        embedded_comment_total = 0
+
+        async def comments(self):
+            if False:
+                yield None
+
+    class FakeAPI:
+        calls = 0
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def document(self, **kwargs):
+            self.__class__.calls += 1
+            await asyncio.sleep(0.01)
+            return FakeDocument()
+
+    monkeypatch.setattr(core.dc_api, "API", FakeAPI)
+
+    results = await asyncio.gather(*(core.async_read("123", "test") for _ in range(5)))
+    await core.async_read("123", "test")
+
+    assert FakeAPI.calls == 2
+    assert len({id(data) for data, _comments, _images in results}) == 5
+    assert len({id(data["related_posts"]) for data, _comments, _images in results}) == 5
+    assert len({id(data["related_posts"][0]) for data, _comments, _images in results}) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_index_coalesces_concurrent_board_misses(monkeypatch):
+    class FakeAPI:
+        board_calls = 0
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def board(self, pagination_collector=None, **kwargs):
+            self.__class__.board_calls += 1
+            await asyncio.sleep(0.01)
+            if pagination_collector is not None:
+                pagination_collector.update({"requested_page": 1, "current_page": 1, "has_next": True})
+            yield _index_item(123, is_mobile_source=True)
+
+    monkeypatch.setattr(core.dc_api, "API", FakeAPI)
+    collectors = [{} for _ in range(3)]
+
+    results = await asyncio.gather(
+        *(
+            core.async_index_with_head_categories(1, "test", 0, limit=1, pagination_collector=collector)
+            for collector in collectors
+        )
+    )
+
+    assert FakeAPI.board_calls == 1
+    assert len({id(rows) for rows, _categories in results}) == 3
+    assert len({id(rows[0]) for rows, _categories in results}) == 1
+    assert all(collector["has_next"] is True for collector in collectors)
+
+
+def _comment(comment_id, contents=None):
+    return Comment(
+        id=str(comment_id),
+        parent_id=str(comment_id),
+        author="댓글작성자",
+        author_id=None,
+        contents=contents or f"comment {comment_id}",
+        dccon=None,
+        voice=None,
+        time="-",
+    )
+
+
+def _body_cache_api(comment_pages):
+    class FakeDocument:
+        title = "title"
+        author = "익명"
+        author_id = None
+        time = "-"
+        voteup_count = 0
+        html = "<p>body</p>"
+        images = []
+        related_posts = [_index_item(456)]
+        embedded_comments = [_comment(1)]
+        embedded_comment_total = 3
+        is_mobile_source = True
+
+        async def comments(self):
+            raise AssertionError("mobile comment pages should be used first")
+            if False:
+                yield None
+
+    class FakeAPI:
+        document_calls = 0
+        comment_calls = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def document(self, **kwargs):
+            self.__class__.document_calls += 1
+            return FakeDocument()
+
+        async def mobile_comments(self, board_id, document_id, start_page=1, pagination_collector=None):
+            self.__class__.comment_calls.append(start_page)
+            pages = comment_pages()
+            for page in sorted(pages):
+                if page < start_page:
+                    continue
+                pagination_collector["last_page"] = page
+                for comment in pages[page]:
+                    yield comment
+
+    return FakeAPI
+
+
+@pytest.mark.asyncio
+async def test_async_read_body_cache_refreshes_comments_from_last_page(monkeypatch):
+    monkeypatch.setattr(core, "READ_BODY_CACHE_TTL", 600)
+    pages = {1: [_comment(1), _comment(2)], 2: [_comment(3)]}
+    FakeAPI = _body_cache_api(lambda: pages)
+    monkeypatch.setattr(core.dc_api, "API", FakeAPI)
+
+    data, comments, _images = await core.async_read("123", "test")
+    pages[2] = [_comment(3, "edited"), _comment(4)]
+    pages[3] = [_comment(5)]
+    cached_data, refreshed_comments, _images = await core.async_read("123", "test")
+
+    assert FakeAPI.document_calls == 1
+    assert FakeAPI.comment_calls == [1, 2]
+    assert [row["contents"] for row in comments] == ["comment 1", "comment 2", "comment 3"]
+    assert [row["contents"] for row in refreshed_comments] == [
+        "comment 1",
+        "comment 2",
+        "edited",
+        "comment 4",
+        "comment 5",
+    ]
+    assert cached_data["html"] == data["html"] == "<p>body</p>"
+    assert [row["id"] for row in cached_data["related_posts"]] == ["456"]
+    assert core._cache_get(core._READ_COMMENTS_CACHE, core._READ_COMMENTS_CACHE_LOCK, core._read_cache_key("123", "test"))["last_page"] == 3
+
+
+@pytest.mark.asyncio
+async def test_async_read_body_cache_falls_back_to_full_comment_fetch(monkeypatch):
+    monkeypatch.setattr(core, "READ_BODY_CACHE_TTL", 600)
+    state = {"fail_from": None}
+
+    def comment_pages():
+        return {1: [_comment(1), _comment(2)], 2: [_comment(3)]}
+
+    FakeAPI = _body_cache_api(comment_pages)
+    original_mobile_comments = FakeAPI.mobile_comments
+
+    async def flaky_mobile_comments(self, board_id, document_id, start_page=1, pagination_collector=None):
+        if state["fail_from"] is not None and start_page >= state["fail_from"]:
+            self.__class__.comment_calls.append(start_page)
+            raise RuntimeError("mobile comments blocked")
+        async for comment in original_mobile_comments(self, board_id, document_id, start_page, pagination_collector):
+            yield comment
+
+    FakeAPI.mobile_comments = flaky_mobile_comments
+    monkeypatch.setattr(core.dc_api, "API", FakeAPI)
+
+    await core.async_read("123", "test")
+    state["fail_from"] = 2
+    _data, comments, _images = await core.async_read("123", "test")
+
+    assert FakeAPI.document_calls == 1
+    assert FakeAPI.comment_calls == [1, 2, 1]
+    assert [row["contents"] for row in comments] == ["comment 1", "comment 2", "comment 3"]
+
+
 @pytest.mark.asyncio
 async def test_async_read_cache_returns_mutation_safe_copies(monkeypatch):
     monkeypatch.setattr(core, "READ_CACHE_TTL", 30)
@@ -647,10 +1214,14 @@ async def test_async_read_cache_returns_mutation_safe_copies(monkeypatch):
     monkeypatch.setattr(core.dc_api, "API", FakeAPI)
 
     data, comments, images = await core.async_read("123", "test")
-    data["related_posts"][0]["title"] = "mutated"
+    with pytest.raises(TypeError):
+        data["related_posts"][0]["title"] = "mutated"
+    with pytest.raises(TypeError):
+        comments[0]["dccon"] = "/media?src=mutated"
+    data["related_posts"].append({"id": "999"})
     data.pop("related_posts")
     data["html"] = "<p>mutated</p>"
-    comments[0]["dccon"] = "/media?src=mutated"
+    comments[0] = {"dccon": "/media?src=mutated"}
     images.append("mutated")
 
     cached_data, cached_comments, cached_images = await core.async_read("123", "test")
@@ -833,6 +1404,53 @@ async def test_related_after_position_uses_source_page_before_latest_lookup_with
     assert api.calls == [(2, core.RELATED_PAGE_FETCH_SIZE)]
 
 
+def test_page_id_index_picks_exact_interpolated_and_extrapolated_pages():
+    index_key = core._page_id_index_key(core._board_page_cache_key(1, "test", 0))
+    core._record_page_id_range(index_key, 10, [{"id": "9000"}, {"id": "8801"}])
+    core._record_page_id_range(index_key, 20, [{"id": "7000"}, {"id": "6801"}])
+
+    assert core._estimate_page_from_index(index_key, 8900) == 10
+    assert core._estimate_page_from_index(index_key, 8000) == 14
+    assert core._estimate_page_from_index(index_key, 6500) == 22
+    assert core._estimate_page_from_index(index_key, 9100) == 9
+    assert core._estimate_page_from_index(index_key, 99999) == 1
+    assert core._estimate_page_from_index(("other",), 8900) is None
+
+
+@pytest.mark.asyncio
+async def test_related_after_position_uses_page_id_index_for_single_fetch():
+    index_key = core._page_id_index_key(core._board_page_cache_key(1, "test", 0))
+    core._record_page_id_range(index_key, 10, [{"id": "9000"}, {"id": "8801"}])
+    core._record_page_id_range(index_key, 20, [{"id": "7000"}, {"id": "6801"}])
+
+    class FakeAPI:
+        def __init__(self):
+            self.calls = []
+
+        async def board(self, **kwargs):
+            self.calls.append((kwargs["start_page"], kwargs["num"]))
+            if kwargs["start_page"] == 14:
+                yield _index_item(8001)
+                yield _index_item(8000)
+                yield _index_item(7999)
+                yield _index_item(7998)
+
+    api = FakeAPI()
+
+    related, has_more = await core._related_after_position_with_api(
+        api,
+        "8000",
+        "8000",
+        "test",
+        limit=1,
+    )
+
+    assert [row["id"] for row in related] == ["7999"]
+    assert has_more is True
+    assert api.calls == [(14, core.RELATED_PAGE_FETCH_SIZE)]
+    assert core._estimate_page_from_index(index_key, 8000) == 14
+
+
 @pytest.mark.asyncio
 async def test_related_after_position_skips_shifted_page_overlap_before_cursor():
     class FakeAPI:
@@ -86,6 +86,7 @@ def test_screen_and_service_route_map_contract():
         "/embed/youtube-size": "main.youtube_size",
         "/favicon.ico": "main.favicon",
         "/healthz": "main.healthz",
+        "/healthz/loop": "main.healthz_loop",
         "/legacy/": "main.index_compat_redirect",
         "/legacy/board": "main.board_compat_redirect",
         "/legacy/read": "main.read_compat_redirect",
@@ -196,6 +197,22 @@ def test_board_refresh_query_bypasses_service_cache(monkeypatch):
     assert calls == [False, True]
 
 
+def test_board_exposes_stale_cache_age_header(monkeypatch):
+    async def board_payload(*args, pagination_collector=None, **kwargs):
+        if kwargs.get("head_id") == "1":
+            pagination_collector["cache_age"] = 42
+        return await _board_payload()
+
+    monkeypatch.setattr(routes, "_load_board_payload", board_payload)
+    client = create_app().test_client()
+
+    cached_response = client.get("/board?board=test&page=1&headid=1")
+    fresh_response = client.get("/board?board=test&page=1")
+
+    assert cached_response.headers["X-Mirror-Cache-Age"] == "42"
+    assert "X-Mirror-Cache-Age" not in fresh_response.headers
+
+
 def test_board_history_refresh_script_is_loaded_and_refreshes_at_most_once(monkeypatch):
     monkeypatch.setattr(routes, "_load_board_payload", _board_payload)
     response = create_app().test_client().get("/board?board=test&page=1")
@@ -21,6 +21,8 @@ def isolate_state(monkeypatch):
         core._BOARD_PAGE_CACHE.clear()
     with core._LATEST_ID_CACHE_LOCK:
         core._LATEST_ID_CACHE.clear()
+    with core._PAGE_ID_INDEX_LOCK:
+        core._PAGE_ID_INDEX.clear()
     with recent.RECENT_SERVER_CACHE_LOCK:
         recent.RECENT_SERVER_CACHE.clear()
     yield
@@ -28,6 +30,8 @@ def isolate_state(monkeypatch):
         core._BOARD_PAGE_CACHE.clear()
     with core._LATEST_ID_CACHE_LOCK:
         core._LATEST_ID_CACHE.clear()
+    with core._PAGE_ID_INDEX_LOCK:
+        core._PAGE_ID_INDEX.clear()
     with recent.RECENT_SERVER_CACHE_LOCK:
         recent.RECENT_SERVER_CACHE.clear()
 
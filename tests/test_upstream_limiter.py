@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from app.services.dc import limiter
+from app.services.dc.api import API
+
+
+class _FakeResponse:
+    def __init__(self, status, text):
+        self.status = status
+        self.headers = {}
+        self._text = text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def text(self):
+        return self._text
+
+
+class _FakeSession:
+    def __init__(self, status=200, text="<html>ok</html>"):
+        self.status = status
+        self.text = text
+        self.calls = 0
+
+    def request(self, *args, **kwargs):
+        self.calls += 1
+        return _FakeResponse(self.status, self.text)
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_halves_rate_on_rate_limit_and_recovers_additively():
+    host = limiter.HostLimiter("m.dcinside.com", rate=8, burst=4)
+
+    probe = await host.acquire()
+    host.finish(probe=probe, rate_limited=True)
+    assert host.snapshot()["rate"] == 4.0
+
+    host.finish(rate_limited=False)
+    host.finish(rate_limited=False)
+    stats = host.snapshot()
+    assert stats["rate"] == pytest.approx(4.2)
+    assert stats["rate_limited"] == 1
+    assert stats["consecutive_rate_limited"] == 0
+
+
+@pytest.mark.asyncio
+async def test_host_limiter_trips_breaker_and_probes_after_cooldown(monkeypatch):
+    monkeypatch.setattr(limiter, "BREAKER_THRESHOLD", 2)
+    monkeypatch.setattr(limiter, "BREAKER_COOLDOWN", 30)
+    now = [1000.0]
+    monkeypatch.setattr(limiter.time, "time", lambda: now[0])
+    host = limiter.HostLimiter("gall.dcinside.com", rate=0)
+
+    for _ in range(2):
+        host.finish(probe=await host.acquire(), rate_limited=True)
+
+    assert host.is_open()
+    with pytest.raises(limiter.UpstreamUnavailable, match="circuit open"):
+        await host.acquire()
+
+    now[0] += 31
+    assert await host.acquire() is True
+    with pytest.raises(limiter.UpstreamUnavailable):
+        await host.acquire()
+    host.finish(probe=True, rate_limited=False)
+
+    stats = host.snapshot()
+    assert stats["state"] == "closed"
+    assert stats["trips"] == 1
+    assert stats["rejected"] == 2
+    assert stats["last_trip_at"] == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_background_requests_leave_reserve_for_interactive(monkeypatch):
+    monkeypatch.setattr(limiter, "LIMIT_MAX_WAIT_MS", 0)
+    host = limiter.HostLimiter("m.dcinside.com", rate=1, burst=4)
+    host._tokens = 1.5
+
+    with limiter.request_priority(limiter.PRIORITY_BACKGROUND):
+        with pytest.raises(limiter.UpstreamUnavailable, match="wait exceeded"):
+            await host.acquire()
+    assert await host.acquire() is False
+
+
+@pytest.mark.asyncio
+async def test_background_waits_while_interactive_request_is_queued(monkeypatch):
+    host = limiter.HostLimiter("m.dcinside.com", rate=50, burst=4)
+    host._tokens = 0.0
+    order = []
+
+    async def take(name, priority):
+        await host.acquire(priority)
+        order.append(name)
+
+    interactive = asyncio.ensure_future(take("interactive", limiter.PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0)
+    await asyncio.gather(take("background", limiter.PRIORITY_BACKGROUND), interactive)
+
+    assert order == ["interactive", "background"]
+
+
+@pytest.mark.asyncio
+async def test_request_text_stops_calling_upstream_once_breaker_opens(monkeypatch):
+    monkeypatch.setattr(limiter, "BREAKER_THRESHOLD", 2)
+    api = API.__new__(API)
+    api.session = _FakeSession(status=429, text="Too Many Requests")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="rate limited: 429"):
+            await api._API__request_text("GET", "https://m.dcinside.com/board/test")
+    with pytest.raises(limiter.UpstreamUnavailable):
+        await api._API__request_text("GET", "https://m.dcinside.com/board/test")
+
+    assert api.session.calls == 2
+    assert limiter.circuit_open() is True
+    stats = limiter.limiter_stats()["m.dcinside.com"]
+    assert stats["state"] == "open"
+    assert stats["trips"] == 1